@@ -1,10 +1,20 @@
 from django.urls import path
 
+from core.routers import use_replicas
+
 from . import views
 
 app_name = 'about'
 
 urlpatterns = [
-    path('author/', views.AboutAuthorView.as_view(), name='author'),
-    path('tech/', views.AboutTechView.as_view(), name='tech'),
+    path(
+        'author/',
+        use_replicas(views.AboutAuthorView.as_view()),
+        name='author'
+    ),
+    path(
+        'tech/',
+        use_replicas(views.AboutTechView.as_view()),
+        name='tech'
+    ),
 ]
@@ -0,0 +1,24 @@
+from functools import wraps
+
+from django.http import Http404, JsonResponse
+
+
+class BadRequest(Exception):
+    pass
+
+
+def error(status, detail):
+    return JsonResponse({'detail': detail}, status=status)
+
+
+def json_errors(view):
+    """Отдаёт ошибки запроса в JSON вместо HTML-страниц."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return view(request, *args, **kwargs)
+        except BadRequest as exception:
+            return error(400, str(exception))
+        except Http404:
+            return error(404, 'Не найдено.')
+    return wrapper
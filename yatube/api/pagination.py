@@ -0,0 +1,60 @@
+from django.conf import settings
+
+from core import cursors
+
+from .errors import BadRequest
+
+MAX_LIMIT = 100
+
+
+def get_limit(request):
+    try:
+        limit = int(request.GET.get('limit', settings.POSTS_PER_PAGE))
+    except ValueError:
+        raise BadRequest('limit должен быть числом.')
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def cursor_page(request, queryset, date_field, paths):
+    """Строки values() по выбранным полям после курсора из запроса.
+
+    Возвращает строки и курсор следующей страницы или None.
+    """
+    paths = list(dict.fromkeys([*paths, date_field, 'id']))
+    try:
+        return cursors.cursor_page(
+            queryset.values(*paths),
+            date_field,
+            request.GET.get('cursor'),
+            get_limit(request),
+        )
+    except cursors.InvalidCursor:
+        raise BadRequest('Некорректный cursor.')
+
+
+def newer_ids(request, queryset, date_field):
+    """id записей новее курсора since из запроса, не больше MAX_LIMIT.
+
+    Возвращает id от новых к старым, общее число новых записей и курсор
+    самой новой из них или None, если новых записей нет.
+    """
+    since = request.GET.get('since')
+    if not since:
+        raise BadRequest('Нужен параметр since.')
+    try:
+        queryset = cursors.newer(queryset, date_field, since)
+    except cursors.InvalidCursor:
+        raise BadRequest('Некорректный since.')
+    rows = list(
+        queryset.order_by(*cursors.ordering(date_field))
+        .values_list('id', date_field)[:MAX_LIMIT + 1]
+    )
+    if not rows:
+        return [], 0, None
+    count = len(rows) if len(rows) <= MAX_LIMIT else queryset.count()
+    pk, date = rows[0]
+    return (
+        [pk for pk, _ in rows[:MAX_LIMIT]],
+        count,
+        cursors.encode_cursor(date, pk),
+    )
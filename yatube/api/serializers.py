@@ -0,0 +1,81 @@
+from django.core.files.storage import default_storage
+
+from .errors import BadRequest
+
+
+def file_url(name):
+    return default_storage.url(name) if name else None
+
+
+class Fields:
+    """Поля ответа: имя в JSON и путь для values().
+
+    Записи читаются через values() только по выбранным полям, без
+    создания экземпляров моделей.
+    """
+
+    def __init__(self, paths, default, converters=None):
+        self.paths = paths
+        self.default = default
+        self.converters = converters or {}
+
+    def select(self, request):
+        """Поля из ?fields=a,b или поля по умолчанию."""
+        requested = request.GET.get('fields')
+        if not requested:
+            return self.default
+        names = [name.strip() for name in requested.split(',')]
+        names = list(dict.fromkeys(name for name in names if name))
+        if not names:
+            return self.default
+        unknown = [name for name in names if name not in self.paths]
+        if unknown:
+            raise BadRequest(f'Неизвестные поля: {", ".join(unknown)}.')
+        return names
+
+    def values_paths(self, names):
+        return [self.paths[name] for name in names]
+
+    def serialize(self, rows, names):
+        converters = [
+            (name, self.paths[name], self.converters.get(name))
+            for name in names
+        ]
+        return [
+            {
+                name: convert(row[path]) if convert else row[path]
+                for name, path, convert in converters
+            }
+            for row in rows
+        ]
+
+
+POST_FIELDS = Fields(
+    {
+        'id': 'id',
+        'text': 'text',
+        'pub_date': 'pub_date',
+        'updated': 'updated',
+        'author': 'author__username',
+        'group': 'group__slug',
+        'image': 'image',
+        'image_width': 'image_width',
+        'image_height': 'image_height',
+        'image_color': 'image_color',
+        'image_placeholder': 'image_placeholder',
+        'views': 'views',
+    },
+    default=['id', 'text', 'pub_date', 'author', 'group', 'image'],
+    converters={'image': file_url},
+)
+
+COMMENT_FIELDS = Fields(
+    {
+        'id': 'id',
+        'post': 'post_id',
+        'text': 'text',
+        'created': 'created',
+        'author': 'author__username',
+    },
+    default=['id', 'text', 'created', 'author'],
+)
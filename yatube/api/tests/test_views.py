@@ -0,0 +1,214 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+
+@override_settings(POSTS_PER_PAGE=2)
+class ApiViewsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        # Одинаковая дата у всех публикаций: порядок задаёт id, как на
+        # HTML-страницах.
+        Post.objects.bulk_create(
+            Post(author=cls.author, group=cls.group, text=f'Публикация {i}')
+            for i in range(5)
+        )
+        Post.objects.update(pub_date=Post.objects.first().pub_date)
+        cls.posts = list(Post.objects.all())
+        cls.post = cls.posts[0]
+        Comment.objects.create(
+            post=cls.post, author=cls.reader, text='Комментарий'
+        )
+        Follow.objects.create(user=cls.reader, author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+
+    def get_all(self, url, **params):
+        """Все записи ленты, пройденной по ссылкам next."""
+        results = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            results += data['results']
+            if not data['next']:
+                return results
+            response = self.client.get(data['next'])
+
+    def test_feeds(self):
+        """Ленты отдают все публикации от новых к старым без повторов."""
+        urls = (
+            reverse('api:v1:index'),
+            reverse('api:v1:group_posts', args=[self.group.slug]),
+            reverse('api:v1:profile', args=[self.author.username]),
+        )
+        expected = [post.pk for post in self.posts]
+        for url in urls:
+            with self.subTest(url=url):
+                ids = [row['id'] for row in self.get_all(url)]
+                self.assertEqual(ids, expected)
+
+    def test_new_posts_do_not_shift_cursor(self):
+        """Новая публикация не сдвигает следующую страницу."""
+        url = reverse('api:v1:index')
+        data = self.client.get(url).json()
+        Post.objects.create(author=self.author, text='Новая публикация')
+        next_page = self.client.get(data['next']).json()['results']
+        self.assertEqual(next_page[0]['id'], self.posts[2].pk)
+
+    def test_default_fields(self):
+        """Публикация сериализуется полями по умолчанию."""
+        data = self.client.get(
+            reverse('api:v1:post_detail', args=[self.post.pk])
+        ).json()
+        self.assertEqual(data, {
+            'id': self.post.pk,
+            'text': self.post.text,
+            'pub_date': data['pub_date'],
+            'author': self.author.username,
+            'group': self.group.slug,
+            'image': None,
+        })
+
+    def test_sparse_fields(self):
+        """?fields= ограничивает поля и число запросов."""
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                reverse('api:v1:index'), {'fields': 'id,text', 'limit': 1}
+            )
+        self.assertEqual(
+            response.json()['results'],
+            [{'id': self.post.pk, 'text': self.post.text}],
+        )
+        response = self.client.get(
+            reverse('api:v1:index'), {'fields': 'id,password'}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_comments(self):
+        """Комментарии публикации."""
+        response = self.client.get(
+            reverse('api:v1:comments', args=[self.post.pk])
+        )
+        self.assertEqual(response.json()['results'][0]['author'], 'reader')
+
+    def test_follow_feed(self):
+        """Лента подписок доступна только авторизованному пользователю."""
+        url = reverse('api:v1:follow_index')
+        self.assertEqual(self.client.get(url).status_code, 401)
+        self.client.force_login(self.reader)
+        self.assertEqual(len(self.get_all(url)), len(self.posts))
+
+    def test_errors(self):
+        """Ошибки отдаются в JSON."""
+        urls_statuses = {
+            reverse('api:v1:post_detail', args=[0]): 404,
+            reverse('api:v1:comments', args=[0]): 404,
+            reverse('api:v1:group_posts', args=['missing']): 404,
+            reverse('api:v1:index') + '?cursor=broken': 400,
+            reverse('api:v1:index') + '?limit=many': 400,
+        }
+        for url, status in urls_statuses.items():
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, status)
+                self.assertIn('detail', response.json())
+
+    def test_errors_without_etag(self):
+        """Ошибку нельзя подтвердить через If-None-Match: в ней нет ETag."""
+        urls_statuses = {
+            reverse('api:v1:follow_index'): 401,
+            reverse('api:v1:post_detail', args=[0]): 404,
+            reverse('api:v1:index') + '?limit=many': 400,
+        }
+        for url, status in urls_statuses.items():
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, status)
+                self.assertFalse(response.has_header('ETag'))
+                self.assertFalse(response.has_header('Last-Modified'))
+
+    def test_etag(self):
+        """Повторный запрос с ETag получает 304, пока лента не изменилась."""
+        url = reverse('api:v1:index')
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        Post.objects.create(author=self.author, text='Новая публикация')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_etag_follows_names(self):
+        """ETag публикации и комментариев меняется с именами авторов."""
+        author = User.objects.create_user(username='writer')
+        commenter = User.objects.create_user(username='commenter')
+        post = Post.objects.create(author=author, text='Публикация')
+        Comment.objects.create(post=post, author=commenter, text='Текст')
+        urls_users = (
+            (reverse('api:v1:post_detail', args=[post.pk]), author),
+            (reverse('api:v1:comments', args=[post.pk]), commenter),
+        )
+        for url, user in urls_users:
+            with self.subTest(url=url):
+                etag = self.client.get(url)['ETag']
+                user.username = f'{user.username}-renamed'
+                user.save()
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+                self.assertIn(user.username, response.content.decode())
+
+    def test_new_posts(self):
+        """Опрос новых публикаций отдаёт их число и id или 304."""
+        url = reverse('api:v1:index_new')
+        since = self.client.get(reverse('api:v1:index')).json()['since']
+        response = self.client.get(url, {'since': since})
+        self.assertEqual(response.status_code, 304)
+        first = Post.objects.create(author=self.author, text='Новая 1')
+        second = Post.objects.create(author=self.author, text='Новая 2')
+        response = self.client.get(url, {'since': since})
+        data = response.json()
+        self.assertEqual(data['count'], 2)
+        self.assertEqual(data['ids'], [second.pk, first.pk])
+        with self.assertNumQueries(0):
+            not_modified = self.client.get(
+                url, {'since': since}, HTTP_IF_NONE_MATCH=response['ETag']
+            )
+        self.assertEqual(not_modified.status_code, 304)
+        response = self.client.get(url, {'since': data['cursor']})
+        self.assertEqual(response.status_code, 304)
+
+    def test_follow_new_posts(self):
+        """Опрос новых публикаций в подписках."""
+        url = reverse('api:v1:follow_new')
+        since = self.client.get(reverse('api:v1:index')).json()['since']
+        response = self.client.get(url, {'since': since})
+        self.assertEqual(response.status_code, 401)
+        self.client.force_login(self.reader)
+        Post.objects.create(author=self.reader, text='Своя публикация')
+        response = self.client.get(url, {'since': since})
+        self.assertEqual(response.status_code, 304)
+        post = Post.objects.create(author=self.author, text='Новая')
+        response = self.client.get(url, {'since': since})
+        self.assertEqual(response.json()['ids'], [post.pk])
+
+    def test_new_posts_errors(self):
+        """Опрос без since или с некорректным since - 400."""
+        url = reverse('api:v1:index_new')
+        for params in ({}, {'since': 'broken'}):
+            with self.subTest(params=params):
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code, 400)
@@ -0,0 +1,32 @@
+from django.urls import include, path
+
+from . import views
+
+app_name = 'api'
+
+v1_patterns = [
+    path('posts/', views.index, name='index'),
+    path('posts/new/', views.index_new, name='index_new'),
+    path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
+    path(
+        'posts/<int:post_id>/comments/',
+        views.comments,
+        name='comments'
+    ),
+    path(
+        'groups/<slug:slug>/posts/',
+        views.group_posts,
+        name='group_posts'
+    ),
+    path(
+        'profiles/<str:username>/posts/',
+        views.profile,
+        name='profile'
+    ),
+    path('follow/posts/', views.follow_index, name='follow_index'),
+    path('follow/posts/new/', views.follow_new, name='follow_new'),
+]
+
+urlpatterns = [
+    path('v1/', include((v1_patterns, 'v1'))),
+]
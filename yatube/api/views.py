@@ -0,0 +1,186 @@
+from django.contrib.auth import get_user_model
+from django.http import Http404, HttpResponseNotModified, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_safe
+
+from core.cursors import encode_cursor
+from core.routers import use_replicas
+from posts.models import Comment, Group, Post
+from posts.utils import conditional_page
+from posts.views import post_detail_scopes
+from posts.versions import (follow_scope, group_scope, index_scope,
+                            popular_scope, post_scope, profile_scope)
+
+from .errors import error, json_errors
+from .pagination import cursor_page, newer_ids
+from .serializers import COMMENT_FIELDS, POST_FIELDS
+
+User = get_user_model()
+
+JSON_PARAMS = {'ensure_ascii': False, 'separators': (',', ':')}
+
+
+def json_response(data):
+    return JsonResponse(data, json_dumps_params=JSON_PARAMS)
+
+
+def next_url(request, cursor):
+    if cursor is None:
+        return None
+    query = request.GET.copy()
+    query['cursor'] = cursor
+    return f'{request.path}?{query.urlencode()}'
+
+
+def post_scopes(request, *scopes):
+    """Области страницы публикаций; с полем views - и версия popular.
+
+    Запись просмотров меняет только версию popular: смена версий
+    публикаций и лент сбрасывала бы кэш HTML-страниц на каждой записи.
+    """
+    requested = request.GET.get('fields', '').split(',')
+    if 'views' in (name.strip() for name in requested):
+        scopes += (popular_scope(),)
+    return list(scopes)
+
+
+def feed(request, queryset, fields, date_field):
+    """Страница ленты: выбранные поля и ссылка на следующую страницу."""
+    names = fields.select(request)
+    rows, cursor = cursor_page(
+        request, queryset, date_field, fields.values_paths(names)
+    )
+    # Курсор первой записи - отправная точка для опроса новых записей.
+    since = None
+    if rows and not request.GET.get('cursor'):
+        since = encode_cursor(rows[0][date_field], rows[0]['id'])
+    return json_response({
+        'results': fields.serialize(rows, names),
+        'next': next_url(request, cursor),
+        'since': since,
+    })
+
+
+def new_posts(request, queryset):
+    """Сколько публикаций новее курсора since и их id.
+
+    Если новых публикаций нет, отвечает 304 без тела.
+    """
+    ids, count, cursor = newer_ids(request, queryset, 'pub_date')
+    if not count:
+        return HttpResponseNotModified()
+    return json_response({'count': count, 'ids': ids, 'cursor': cursor})
+
+
+@use_replicas
+@require_safe
+@conditional_page(lambda request: post_scopes(request, index_scope()))
+@json_errors
+def index(request):
+    """Лента всех публикаций."""
+    return feed(request, Post.objects.all(), POST_FIELDS, 'pub_date')
+
+
+@use_replicas
+@require_safe
+@conditional_page(
+    lambda request, slug: post_scopes(request, group_scope(slug))
+)
+@json_errors
+def group_posts(request, slug):
+    """Лента публикаций сообщества."""
+    group = get_object_or_404(Group, slug=slug)
+    return feed(request, group.posts.all(), POST_FIELDS, 'pub_date')
+
+
+@use_replicas
+@require_safe
+@conditional_page(
+    lambda request, username: post_scopes(
+        request, profile_scope(username)
+    )
+)
+@json_errors
+def profile(request, username):
+    """Лента публикаций пользователя."""
+    author = get_object_or_404(User, username=username)
+    return feed(request, author.posts.all(), POST_FIELDS, 'pub_date')
+
+
+@use_replicas
+@require_safe
+@conditional_page(
+    lambda request: post_scopes(
+        request, index_scope(), follow_scope(request.user.pk)
+    )
+)
+@json_errors
+def follow_index(request):
+    """Лента публикаций авторов, на которых подписан пользователь."""
+    if not request.user.is_authenticated:
+        return error(401, 'Требуется авторизация.')
+    posts = Post.objects.filter(author__following__user=request.user)
+    return feed(request, posts, POST_FIELDS, 'pub_date')
+
+
+@use_replicas
+@require_safe
+@conditional_page(lambda request: [index_scope()])
+@json_errors
+def index_new(request):
+    """Новые публикации в ленте всех публикаций."""
+    return new_posts(request, Post.objects.all())
+
+
+@use_replicas
+@require_safe
+@conditional_page(
+    lambda request: [index_scope(), follow_scope(request.user.pk)]
+)
+@json_errors
+def follow_new(request):
+    """Новые публикации в ленте подписок."""
+    if not request.user.is_authenticated:
+        return error(401, 'Требуется авторизация.')
+    return new_posts(
+        request, Post.objects.filter(author__following__user=request.user)
+    )
+
+
+@use_replicas
+@require_safe
+@conditional_page(
+    lambda request, post_id: post_scopes(
+        request, *post_detail_scopes(request, post_id)
+    )
+)
+@json_errors
+def post_detail(request, post_id):
+    """Публикация."""
+    names = POST_FIELDS.select(request)
+    rows = Post.objects.filter(pk=post_id).values(
+        *POST_FIELDS.values_paths(names)
+    )
+    if not rows:
+        raise Http404
+    return json_response(POST_FIELDS.serialize(rows, names)[0])
+
+
+@use_replicas
+@require_safe
+@conditional_page(lambda request, post_id: [post_scope(post_id)])
+@json_errors
+def comments(request, post_id):
+    """Комментарии к публикации, от новых к старым.
+
+    Переименование комментатора меняет версию публикации (user_scopes
+    в posts.signals), поэтому другие области не нужны.
+    """
+    if not Post.objects.filter(pk=post_id).exists():
+        raise Http404
+    return feed(
+        request,
+        Comment.objects.filter(post_id=post_id),
+        COMMENT_FIELDS,
+        'created',
+    )
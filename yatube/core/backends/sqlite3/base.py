@@ -0,0 +1,17 @@
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """SQLite, умеющий начинать транзакцию с BEGIN IMMEDIATE.
+
+    Такая транзакция берёт блокировку записи сразу, а не при первом
+    изменении, поэтому занятая база обнаруживается до начала работы.
+    """
+
+    begin_immediate = False
+
+    def _start_transaction_under_autocommit(self):
+        if self.begin_immediate:
+            self.cursor().execute('BEGIN IMMEDIATE')
+        else:
+            super()._start_transaction_under_autocommit()
@@ -0,0 +1,106 @@
+import gzip
+import hashlib
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def connect(name):
+    """Открывает SQLite по имени из настроек базы, в том числе URI."""
+    return sqlite3.connect(name, uri=name.startswith('file:'), timeout=30)
+
+
+def copy_database(source, target, pages=-1, pause=0):
+    """Копирует базу через online backup API шагами по pages страниц.
+
+    Между шагами делается пауза pause секунд, чтобы не мешать
+    читателям и писателям исходной базы.
+    """
+    def progress(status, remaining, total):
+        if remaining and pause:
+            time.sleep(pause)
+
+    source.backup(target, pages=pages, progress=progress)
+
+
+def integrity_check(path):
+    """Возвращает результат PRAGMA integrity_check для файла базы."""
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute('PRAGMA integrity_check').fetchone()[0]
+    finally:
+        connection.close()
+
+
+def checksum(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_compressed(path):
+    return path.endswith('.gz')
+
+
+def snapshot(name, output, pages, pause):
+    """Снимает копию базы name в файл output, сжимая его для .gz.
+
+    Копия проверяется integrity_check, рядом пишется файл .sha256.
+    """
+    directory = os.path.dirname(os.path.abspath(output))
+    with tempfile.TemporaryDirectory(dir=directory) as temp_dir:
+        copy_path = os.path.join(temp_dir, 'snapshot.sqlite3')
+        source = connect(name)
+        target = sqlite3.connect(copy_path)
+        try:
+            copy_database(source, target, pages, pause)
+            target.execute('PRAGMA journal_mode = DELETE')
+        finally:
+            target.close()
+            source.close()
+        result = integrity_check(copy_path)
+        if result != 'ok':
+            raise sqlite3.DatabaseError(result)
+        if is_compressed(output):
+            with open(copy_path, 'rb') as src, gzip.open(output, 'wb') as dst:
+                shutil.copyfileobj(src, dst, CHUNK_SIZE)
+        else:
+            shutil.move(copy_path, output)
+    with open(output + '.sha256', 'w') as file:
+        file.write(checksum(output))
+
+
+def restore(name, source_path):
+    """Заменяет содержимое базы name копией из source_path.
+
+    Контрольная сумма проверяется, если есть файл .sha256.
+    """
+    checksum_path = source_path + '.sha256'
+    if os.path.exists(checksum_path):
+        with open(checksum_path) as file:
+            if file.read().strip() != checksum(source_path):
+                raise sqlite3.DatabaseError('Контрольная сумма не совпадает.')
+    with tempfile.TemporaryDirectory() as temp_dir:
+        copy_path = source_path
+        if is_compressed(source_path):
+            copy_path = os.path.join(temp_dir, 'restore.sqlite3')
+            with gzip.open(source_path, 'rb') as src, open(
+                copy_path, 'wb'
+            ) as dst:
+                shutil.copyfileobj(src, dst, CHUNK_SIZE)
+        result = integrity_check(copy_path)
+        if result != 'ok':
+            raise sqlite3.DatabaseError(result)
+        source = sqlite3.connect(copy_path)
+        target = connect(name)
+        try:
+            copy_database(source, target)
+        finally:
+            target.close()
+            source.close()
@@ -0,0 +1,117 @@
+"""Журнал изменений (transactional outbox) и его обработчики.
+
+record() добавляет запись в журнал в той же транзакции, что и само
+изменение: во вьюхах записи идут через run_write, поэтому журнал не
+расходится с данными. Обработчики из CHANGELOG_CONSUMERS читают журнал
+порциями в фоне, каждый со своим смещением в ConsumerOffset. SQLite
+допускает одного писателя, поэтому записи фиксируются в порядке id
+и смещение не перескакивает через ещё не зафиксированные записи.
+
+Порция обрабатывается и смещение сдвигается в одной транзакции, так что
+производные данные в базе обновляются ровно один раз. Внешние побочные
+эффекты (HTTP, письма) при сбое посреди порции могут повториться:
+такие обработчики должны быть идемпотентными.
+"""
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import FileField, Min
+from django.utils.module_loading import import_string
+
+from .db import immediate_atomic
+from .models import ChangeLog, ConsumerOffset
+
+
+def label(model):
+    return model._meta.label_lower
+
+
+def snapshot(instance):
+    """Значения полей объекта для записи в журнал."""
+    data = {}
+    for field in instance._meta.concrete_fields:
+        value = field.value_from_object(instance)
+        if isinstance(field, FileField):
+            value = value.name or None
+        data[field.attname] = value
+    return data
+
+
+def record(instance, action):
+    """Добавляет изменение instance в журнал."""
+    return ChangeLog.objects.create(
+        model=label(type(instance)),
+        object_id=instance.pk,
+        action=action,
+        data=json.dumps(snapshot(instance), cls=DjangoJSONEncoder),
+    )
+
+
+class Consumer:
+    """Обработчик журнала изменений.
+
+    Наследник задаёт уникальное name, при необходимости models - метки
+    моделей, которые ему нужны, - и реализует handle(entries).
+    """
+
+    name = None
+    models = None
+
+    def handle(self, entries):
+        raise NotImplementedError
+
+    def wants(self, entry):
+        return self.models is None or entry.model in self.models
+
+    def run_once(self, batch_size=None):
+        """Обрабатывает одну порцию журнала.
+
+        Возвращает число прочитанных записей; 0 - журнал дочитан.
+        """
+        batch_size = batch_size or settings.CHANGELOG_BATCH_SIZE
+        with immediate_atomic():
+            offset, _ = (
+                ConsumerOffset.objects.select_for_update()
+                .get_or_create(consumer=self.name)
+            )
+            entries = list(
+                ChangeLog.objects.filter(id__gt=offset.position)[:batch_size]
+            )
+            if not entries:
+                return 0
+            wanted = [entry for entry in entries if self.wants(entry)]
+            if wanted:
+                self.handle(wanted)
+            offset.position = entries[-1].pk
+            offset.save(update_fields=['position', 'updated'])
+        return len(entries)
+
+    def run(self, batch_size=None):
+        """Обрабатывает журнал до конца; возвращает число записей."""
+        total = 0
+        while True:
+            count = self.run_once(batch_size)
+            if not count:
+                return total
+            total += count
+
+
+def get_consumers():
+    return [import_string(path)() for path in settings.CHANGELOG_CONSUMERS]
+
+
+def prune(consumers=None):
+    """Удаляет записи, которые прочитали все обработчики.
+
+    Возвращает число удалённых записей.
+    """
+    names = [consumer.name for consumer in consumers or get_consumers()]
+    if not names:
+        return 0
+    offsets = ConsumerOffset.objects.filter(consumer__in=names)
+    if offsets.count() < len(names):
+        return 0
+    position = offsets.aggregate(position=Min('position'))['position']
+    deleted, _ = ChangeLog.objects.filter(id__lte=position).delete()
+    return deleted
@@ -0,0 +1,39 @@
+"""Проверки настроек для manage.py check --deploy."""
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+# Кэш в памяти процесса: запись и удаление не видны другим процессам
+# сервера.
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+)
+
+
+def shared_cache_users():
+    """Включённые части сайта, которым нужен общий для процессов кэш."""
+    # Версии областей дают ETag страниц: процесс, не видящий смены
+    # версии, отвечает 304 на устаревшую страницу.
+    users = ['posts.versions']
+    middleware = 'posts.middleware.AnonymousPageCacheMiddleware'
+    if middleware in settings.MIDDLEWARE:
+        users.append(middleware)
+    backend = 'users.backends.CachedModelBackend'
+    if backend in settings.AUTHENTICATION_BACKENDS:
+        users.append(backend)
+    return users
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    backend = settings.CACHES['default']['BACKEND']
+    users = shared_cache_users()
+    if backend not in PROCESS_LOCAL_CACHES or not users:
+        return []
+    return [
+        Error(
+            f'{backend} не общий для процессов сервера, а общий кэш '
+            f'нужен для: {", ".join(users)}.',
+            hint='Укажите в CACHES["default"] общий кэш, например memcached.',
+            id='core.E001',
+        )
+    ]
@@ -0,0 +1,76 @@
+"""Постраничный вывод по курсору (дата, id) от новых записей к старым.
+
+Курсор указывает на последнюю отданную запись, поэтому новые записи не
+сдвигают следующие порции, а запрос идёт по индексу без OFFSET.
+Записи с одинаковой датой идут по возрастанию id, как в Meta.ordering
+публикаций и комментариев: порции продолжают обычные страницы.
+"""
+import base64
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def ordering(date_field):
+    """Порядок записей: от новых к старым, при равной дате - по id."""
+    return (f'-{date_field}', 'id')
+
+
+def encode_cursor(date, pk):
+    value = f'{date.isoformat()}|{pk}'.encode()
+    return base64.urlsafe_b64encode(value).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Дата и id последней записи предыдущей порции."""
+    try:
+        value = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        date, pk = value.decode().split('|')
+        date = parse_datetime(date)
+        pk = int(pk)
+    except ValueError:
+        raise InvalidCursor(cursor)
+    if date is None:
+        raise InvalidCursor(cursor)
+    return date, pk
+
+
+def older(queryset, date_field, cursor):
+    """Записи старше записи, на которую указывает cursor."""
+    date, pk = decode_cursor(cursor)
+    return queryset.filter(
+        Q(**{f'{date_field}__lt': date})
+        | Q(**{date_field: date, 'id__gt': pk})
+    )
+
+
+def newer(queryset, date_field, cursor):
+    """Записи новее записи, на которую указывает cursor."""
+    date, pk = decode_cursor(cursor)
+    return queryset.filter(
+        Q(**{f'{date_field}__gt': date})
+        | Q(**{date_field: date, 'id__lt': pk})
+    )
+
+
+def cursor_page(queryset, date_field, cursor, limit):
+    """Порция записей после cursor и курсор следующей порции или None.
+
+    queryset может быть результатом values(), если в него входят
+    date_field и id.
+    """
+    queryset = queryset.order_by(*ordering(date_field))
+    if cursor:
+        queryset = older(queryset, date_field, cursor)
+    rows = list(queryset[:limit + 1])
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    if isinstance(last, dict):
+        return rows, encode_cursor(last[date_field], last['id'])
+    return rows, encode_cursor(getattr(last, date_field), last.pk)
@@ -0,0 +1,129 @@
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from contextlib import contextmanager
+from functools import partial, wraps
+
+from django.conf import settings
+from django.db import OperationalError, transaction
+
+
+def pragma_statements(pragmas):
+    """Возвращает инструкции PRAGMA для словаря настроек SQLite."""
+    return [f'PRAGMA {name} = {value}' for name, value in pragmas.items()]
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """Применяет SQLITE_PRAGMAS к каждому новому соединению с SQLite."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for statement in pragma_statements(settings.SQLITE_PRAGMAS):
+            cursor.execute(statement)
+
+
+def is_locked(error):
+    """Ошибка вызвана тем, что базу заблокировал другой писатель."""
+    return 'locked' in str(error)
+
+
+@contextmanager
+def immediate_atomic(using=None):
+    """transaction.atomic, который в SQLite начинается с BEGIN IMMEDIATE.
+
+    Работает с бэкендом core.backends.sqlite3; для вложенных блоков
+    и других бэкендов ведёт себя как обычный atomic.
+    """
+    connection = transaction.get_connection(using)
+    connection.begin_immediate = not connection.in_atomic_block
+    try:
+        with transaction.atomic(using):
+            connection.begin_immediate = False
+            yield
+    finally:
+        connection.begin_immediate = False
+
+
+def atomic_write(func):
+    """Выполняет func в короткой транзакции записи.
+
+    Если база заблокирована, транзакция повторяется до DB_WRITE_RETRIES
+    раз с экспоненциальной задержкой и случайным разбросом.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        retries = settings.DB_WRITE_RETRIES
+        for attempt in range(retries):
+            try:
+                with immediate_atomic():
+                    return func(*args, **kwargs)
+            except OperationalError as error:
+                if not is_locked(error) or attempt + 1 == retries:
+                    raise
+            delay = settings.DB_WRITE_RETRY_DELAY * 2 ** attempt
+            time.sleep(random.uniform(0, delay))
+    return wrapper
+
+
+class WriteQueue:
+    """Очередь записей процесса с единственным писателем.
+
+    Поток, захвативший блокировку, выполняет все накопившиеся записи
+    одной транзакцией; каждая запись - в своей точке сохранения, так что
+    ошибка одной не отменяет остальные. Остальные потоки ждут результат.
+    """
+
+    def __init__(self):
+        self.pending = deque()
+        self.lock = threading.Lock()
+
+    def submit(self, func, *args, **kwargs):
+        future = Future()
+        self.pending.append((future, partial(func, *args, **kwargs)))
+        while not future.done():
+            with self.lock:
+                if not future.done():
+                    self.drain()
+        return future.result()
+
+    def drain(self):
+        batch = []
+        while self.pending and len(batch) < settings.DB_WRITE_QUEUE_BATCH:
+            batch.append(self.pending.popleft())
+        try:
+            outcomes = atomic_write(self.run_batch)(batch)
+        except Exception as error:
+            for future, _ in batch:
+                future.set_exception(error)
+            return
+        for (future, _), (result, error) in zip(batch, outcomes):
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+    def run_batch(self, batch):
+        outcomes = []
+        for _, call in batch:
+            try:
+                with transaction.atomic():
+                    outcomes.append((call(), None))
+            except OperationalError as error:
+                if is_locked(error):
+                    raise
+                outcomes.append((None, error))
+            except Exception as error:
+                outcomes.append((None, error))
+        return outcomes
+
+
+write_queue = WriteQueue()
+
+
+def run_write(func, *args, **kwargs):
+    """Выполняет запись через очередь или в собственной транзакции."""
+    if settings.DB_WRITE_QUEUE:
+        return write_queue.submit(func, *args, **kwargs)
+    return atomic_write(func)(*args, **kwargs)
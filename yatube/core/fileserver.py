@@ -0,0 +1,115 @@
+"""Раздача статики и медиа на уровне WSGI, до обработки запроса Django."""
+import mimetypes
+import os
+import re
+from email.utils import formatdate
+from wsgiref.util import FileWrapper
+
+from django.utils.http import parse_http_date_safe
+
+BLOCK_SIZE = 64 * 1024
+# Имя вида logo.3c2f1a9b0d4e.png от ManifestStaticFilesStorage.
+HASHED_NAME = re.compile(r'\.[0-9a-f]{12}\.[^/.]+$')
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def accepts(accept_encoding, encoding):
+    """Разрешено ли кодирование encoding заголовком Accept-Encoding."""
+    for item in accept_encoding.split(','):
+        name, _, params = item.strip().partition(';')
+        if name.strip().lower() not in (encoding, '*'):
+            continue
+        quality = params.strip().replace(' ', '')
+        return quality not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000')
+    return False
+
+
+class PrecompressedFileServer:
+    """Отдаёт файлы каталога root по адресам, начинающимся с prefix.
+
+    Если клиент принимает br или gzip и рядом лежит сжатая копия файла,
+    отдаётся она. Файлы с хэшем содержимого в имени при immutable
+    кэшируются браузером на год, остальные - на max_age секунд.
+    Прочие запросы передаются приложению application.
+    """
+
+    def __init__(self, application, prefix, root, max_age=0,
+                 immutable=False):
+        self.application = application
+        self.prefix = prefix
+        self.root = os.path.abspath(root) if root else None
+        self.max_age = max_age
+        self.immutable = immutable
+
+    def __call__(self, environ, start_response):
+        path = self.file_path(environ)
+        if path is None:
+            return self.application(environ, start_response)
+        return self.serve(environ, start_response, path)
+
+    def file_path(self, environ):
+        if not self.root or environ['REQUEST_METHOD'] not in ('GET', 'HEAD'):
+            return None
+        url = environ.get('PATH_INFO', '').encode('iso-8859-1').decode(
+            'utf-8', 'replace'
+        )
+        if not url.startswith(self.prefix):
+            return None
+        path = os.path.normpath(
+            os.path.join(self.root, url[len(self.prefix):])
+        )
+        if not path.startswith(self.root + os.sep) or not os.path.isfile(path):
+            return None
+        return path
+
+    def cache_control(self, path):
+        if self.immutable and HASHED_NAME.search(path):
+            return f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+        return f'public, max-age={self.max_age}'
+
+    def serve(self, environ, start_response, path):
+        accept_encoding = environ.get('HTTP_ACCEPT_ENCODING', '')
+        served, encoding = path, None
+        for name, suffix in ENCODINGS:
+            candidate = path + suffix
+            if accepts(accept_encoding, name) and os.path.isfile(candidate):
+                served, encoding = candidate, name
+                break
+        stat = os.stat(served)
+        etag = '"{:x}-{:x}{}"'.format(
+            int(stat.st_mtime),
+            stat.st_size,
+            f'-{encoding}' if encoding else '',
+        )
+        headers = [
+            ('Vary', 'Accept-Encoding'),
+            ('ETag', etag),
+            ('Last-Modified', formatdate(stat.st_mtime, usegmt=True)),
+            ('Cache-Control', self.cache_control(path)),
+        ]
+        if self.not_modified(environ, etag, int(stat.st_mtime)):
+            start_response('304 Not Modified', headers)
+            return []
+        content_type, _ = mimetypes.guess_type(path)
+        headers.append(
+            ('Content-Type', content_type or 'application/octet-stream')
+        )
+        if encoding:
+            headers.append(('Content-Encoding', encoding))
+        headers.append(('Content-Length', str(stat.st_size)))
+        start_response('200 OK', headers)
+        if environ['REQUEST_METHOD'] == 'HEAD':
+            return []
+        file_wrapper = environ.get('wsgi.file_wrapper', FileWrapper)
+        return file_wrapper(open(served, 'rb'), BLOCK_SIZE)
+
+    def not_modified(self, environ, etag, mtime):
+        if_none_match = environ.get('HTTP_IF_NONE_MATCH')
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(',')]
+            return '*' in tags or etag in tags or f'W/{etag}' in tags
+        if_modified_since = parse_http_date_safe(
+            environ.get('HTTP_IF_MODIFIED_SINCE')
+        )
+        return if_modified_since is not None and mtime <= if_modified_since
@@ -0,0 +1,45 @@
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from core.backup import snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        'Снимает копию SQLite без остановки сайта через online backup API. '
+        'Файл с расширением .gz сжимается.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help='Путь к файлу копии.')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument(
+            '--pages', type=int, default=256,
+            help='Сколько страниц копировать за один шаг.',
+        )
+        parser.add_argument(
+            '--pause', type=float, default=0.01,
+            help='Пауза между шагами, секунды.',
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite':
+            raise CommandError('Поддерживается только SQLite.')
+        started = time.monotonic()
+        try:
+            snapshot(
+                connection.settings_dict['NAME'],
+                options['output'],
+                options['pages'],
+                options['pause'],
+            )
+        except sqlite3.DatabaseError as error:
+            raise CommandError(f'Копия не создана: {error}')
+        self.stdout.write(
+            f'Копия {options["output"]} создана '
+            f'за {time.monotonic() - started:.1f} с.'
+        )
@@ -0,0 +1,48 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.changelog import get_consumers, prune
+
+
+class Command(BaseCommand):
+    help = (
+        'Обрабатывает журнал изменений обработчиками из '
+        'CHANGELOG_CONSUMERS. Без --once работает постоянно, проверяя '
+        'журнал раз в CHANGELOG_POLL секунд.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'consumers', nargs='*',
+            help='Имена обработчиков; по умолчанию все.',
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Дочитать журнал и выйти.',
+        )
+        parser.add_argument(
+            '--prune', action='store_true',
+            help='Удалить записи, прочитанные всеми обработчиками.',
+        )
+
+    def handle(self, *args, **options):
+        consumers = get_consumers()
+        if options['consumers']:
+            consumers = [
+                consumer for consumer in consumers
+                if consumer.name in options['consumers']
+            ]
+            if len(consumers) < len(set(options['consumers'])):
+                raise CommandError('Неизвестный обработчик.')
+        while True:
+            for consumer in consumers:
+                count = consumer.run()
+                if count:
+                    self.stdout.write(f'{consumer.name}: {count}')
+            if options['prune']:
+                prune()
+            if options['once']:
+                return
+            time.sleep(settings.CHANGELOG_POLL)
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.prerender import prerender
+
+
+class Command(BaseCommand):
+    help = (
+        'Сохраняет страницы для анонимных посетителей в готовые файлы '
+        '.html и .html.gz. Перерисовываются только изменившиеся страницы. '
+        'У ленты, сообществ и профилей сохраняются только архивные '
+        'страницы со второй: первая меняется с каждой публикацией, '
+        'её отдаёт Django.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'output', nargs='?', default=settings.PRERENDER_ROOT,
+            help='Каталог готовых страниц.',
+        )
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Перерисовать все страницы.',
+        )
+
+    def handle(self, *args, **options):
+        stats = prerender(options['output'], options['force'])
+        self.stdout.write(
+            'Записано: {written}, без изменений: {unchanged}, '
+            'пропущено: {skipped}, удалено: {removed}.'.format(**stats)
+        )
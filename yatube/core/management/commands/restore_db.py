@@ -0,0 +1,37 @@
+import sqlite3
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from core.backup import restore
+
+
+class Command(BaseCommand):
+    help = 'Восстанавливает SQLite из копии, созданной backup_db.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', help='Путь к файлу копии.')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument(
+            '--noinput', '--no-input', action='store_false',
+            dest='interactive',
+            help='Не запрашивать подтверждение.',
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite':
+            raise CommandError('Поддерживается только SQLite.')
+        if options['interactive']:
+            confirm = input(
+                'Текущие данные будут заменены копией. '
+                'Введите "yes" для продолжения: '
+            )
+            if confirm != 'yes':
+                raise CommandError('Восстановление отменено.')
+        connection.close()
+        try:
+            restore(connection.settings_dict['NAME'], options['input'])
+        except sqlite3.DatabaseError as error:
+            raise CommandError(f'Копия не восстановлена: {error}')
+        self.stdout.write(f'База восстановлена из {options["input"]}.')
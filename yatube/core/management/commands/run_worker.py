@@ -0,0 +1,58 @@
+import multiprocessing
+import signal
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.tasks import Worker
+
+
+def work(threads, burst):
+    worker = Worker(threads)
+    signal.signal(signal.SIGTERM, lambda *args: worker.stop())
+    try:
+        worker.run(burst)
+    except KeyboardInterrupt:
+        pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Выполняет фоновые задачи из таблицы core.Task. Каждый процесс '
+        'забирает задачи по числу свободных потоков.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threads', type=int, default=1,
+            help='Потоков в каждом процессе.',
+        )
+        parser.add_argument(
+            '--processes', type=int, default=1,
+            help='Число процессов-обработчиков.',
+        )
+        parser.add_argument(
+            '--burst', action='store_true',
+            help='Выйти, когда в очереди не останется готовых задач.',
+        )
+
+    def handle(self, *args, **options):
+        threads, burst = options['threads'], options['burst']
+        if options['processes'] <= 1:
+            work(threads, burst)
+            return
+        # Дочерние процессы не должны делить соединения с родителем.
+        connections.close_all()
+        processes = [
+            multiprocessing.Process(target=work, args=(threads, burst))
+            for _ in range(options['processes'])
+        ]
+        for process in processes:
+            process.start()
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
+                process.join()
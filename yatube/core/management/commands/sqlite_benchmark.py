@@ -0,0 +1,148 @@
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.db import pragma_statements
+
+# Настройки SQLite, с которыми Django работает без SQLITE_PRAGMAS.
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'DELETE',
+    'synchronous': 'FULL',
+}
+
+
+def connect(path, pragmas):
+    connection = sqlite3.connect(path, isolation_level=None)
+    for statement in pragma_statements(pragmas):
+        connection.execute(statement)
+    return connection
+
+
+def prepare(path, pragmas, rows):
+    """Создаёт таблицу публикаций, похожую на posts_post."""
+    connection = connect(path, pragmas)
+    connection.execute(
+        'CREATE TABLE post ('
+        'id INTEGER PRIMARY KEY, author_id INTEGER, text TEXT, pub_date REAL)'
+    )
+    connection.execute('CREATE INDEX post_pub_date ON post (pub_date)')
+    connection.executemany(
+        'INSERT INTO post (author_id, text, pub_date) VALUES (?, ?, ?)',
+        (
+            (number % 50, 'Текст публикации ' * 20, time.time())
+            for number in range(rows)
+        ),
+    )
+    connection.close()
+
+
+def read(path, pragmas, stop, count):
+    """Читает страницы ленты, пока не выставлен stop."""
+    connection = connect(path, pragmas)
+    while not stop.is_set():
+        try:
+            connection.execute(
+                'SELECT id, author_id, text FROM post '
+                'ORDER BY pub_date DESC LIMIT 10 OFFSET ?',
+                (random.randrange(100),),
+            ).fetchall()
+            count('reads')
+        except sqlite3.OperationalError:
+            count('errors')
+    connection.close()
+
+
+def write(path, pragmas, stop, count):
+    """Добавляет строки короткими транзакциями, пока не выставлен stop."""
+    connection = connect(path, pragmas)
+    while not stop.is_set():
+        try:
+            connection.execute('BEGIN IMMEDIATE')
+            connection.execute(
+                'INSERT INTO post (author_id, text, pub_date) '
+                'VALUES (?, ?, ?)',
+                (1, 'Комментарий', time.time()),
+            )
+            connection.execute('COMMIT')
+            count('writes')
+        except sqlite3.OperationalError:
+            if connection.in_transaction:
+                connection.execute('ROLLBACK')
+            count('errors')
+    connection.close()
+
+
+def run_profile(path, pragmas, readers, writers, duration):
+    """Запускает читателей и писателей, возвращает число операций."""
+    stop = threading.Event()
+    lock = threading.Lock()
+    result = {'reads': 0, 'writes': 0, 'errors': 0}
+
+    def count(key):
+        with lock:
+            result[key] += 1
+
+    arguments = (path, pragmas, stop, count)
+    threads = (
+        [
+            threading.Thread(target=read, args=arguments)
+            for _ in range(readers)
+        ]
+        + [
+            threading.Thread(target=write, args=arguments)
+            for _ in range(writers)
+        ]
+    )
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return result
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает конкурентные чтение и запись в SQLite с настройками '
+        'по умолчанию и с SQLITE_PRAGMAS.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--duration', type=float, default=5.0,
+            help='Длительность прогона каждого профиля, секунды.',
+        )
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--writers', type=int, default=2)
+        parser.add_argument('--rows', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        profiles = {
+            'default': DEFAULT_PRAGMAS,
+            'tuned': settings.SQLITE_PRAGMAS,
+        }
+        duration = options['duration']
+        with tempfile.TemporaryDirectory() as directory:
+            for name, pragmas in profiles.items():
+                path = os.path.join(directory, f'{name}.sqlite3')
+                prepare(path, pragmas, options['rows'])
+                result = run_profile(
+                    path,
+                    pragmas,
+                    options['readers'],
+                    options['writers'],
+                    duration,
+                )
+                self.stdout.write(
+                    f'{name}: '
+                    f'чтений/с {result["reads"] / duration:.0f}, '
+                    f'записей/с {result["writes"] / duration:.0f}, '
+                    f'ошибок блокировки {result["errors"]}'
+                )
@@ -0,0 +1,150 @@
+"""Раздача медиафайлов: доступ проверяет Django, байты отдаёт веб-сервер."""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from posts.models import Post
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+ACCEL_REDIRECT = 'x-accel-redirect'
+SENDFILE = 'x-sendfile'
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+class FileRange:
+    """Часть файла для FileResponse: не больше length байт с позиции start."""
+
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def media_path(name):
+    """Абсолютный путь файла в MEDIA_ROOT; 404, если его нет."""
+    try:
+        path = safe_join(settings.MEDIA_ROOT, name)
+    except SuspiciousFileOperation:
+        raise Http404(name)
+    if not os.path.isfile(path):
+        raise Http404(name)
+    return path
+
+
+def is_visible(name):
+    """Изображение публикации доступно, пока существует публикация.
+
+    Миниатюры под THUMBNAIL_PREFIX не проверяются: их удаляет задача
+    posts.tasks.delete_thumbnails вместе с публикацией.
+    """
+    if name.startswith(settings.POSTS_UPLOAD_TO):
+        return Post.objects.filter(image=name).exists()
+    return True
+
+
+def parse_range(header, size):
+    """Диапазон (start, end) из заголовка Range или None.
+
+    Несколько диапазонов не поддерживаются: отдаётся весь файл.
+    """
+    match = RANGE_RE.match(header or '')
+    if not match:
+        return None
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        start, end = max(0, size - int(end)), size - 1
+    else:
+        start, end = int(start), min(int(end) if end else size - 1, size - 1)
+    if start >= size or start > end:
+        raise RangeNotSatisfiable
+    return start, end
+
+
+def range_allowed(request, etag, last_modified):
+    """Range с If-Range применяется, только если файл не менялся."""
+    if_range = request.META.get('HTTP_IF_RANGE')
+    return if_range is None or if_range in (etag, http_date(last_modified))
+
+
+def stream_file(request, path, size, etag, last_modified, content_type):
+    """FileResponse всего файла или диапазона из заголовка Range."""
+    byte_range = None
+    if range_allowed(request, etag, last_modified):
+        try:
+            byte_range = parse_range(request.META.get('HTTP_RANGE'), size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+    file = open(path, 'rb')
+    if byte_range is None:
+        return FileResponse(file, content_type=content_type)
+    start, end = byte_range
+    length = end - start + 1
+    response = FileResponse(
+        FileRange(file, start, length), status=206, content_type=content_type
+    )
+    response['Content-Length'] = length
+    response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return response
+
+
+def transfer(request, name, path, size, etag, last_modified):
+    """Передаёт файл веб-серверу по MEDIA_ACCEL_REDIRECT или отдаёт сам."""
+    content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    if settings.MEDIA_ACCEL_REDIRECT == ACCEL_REDIRECT:
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = (
+            settings.MEDIA_ACCEL_PREFIX + quote(name)
+        )
+        return response
+    if settings.MEDIA_ACCEL_REDIRECT == SENDFILE:
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = path
+        return response
+    return stream_file(
+        request, path, size, etag, last_modified, content_type
+    )
+
+
+def file_response(request, name, path):
+    stat = os.stat(path)
+    etag = '"{:x}-{:x}"'.format(int(stat.st_mtime), stat.st_size)
+    last_modified = int(stat.st_mtime)
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is None:
+        response = transfer(
+            request, name, path, stat.st_size, etag, last_modified
+        )
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(
+        response, public=True, max_age=settings.MEDIA_CACHE_MAX_AGE
+    )
+    return response
@@ -0,0 +1,43 @@
+from django.core.cache import cache
+
+# Счётчики, известные процессу: ключ кэша -> (имя, метки).
+_registry = {}
+
+
+def register(name, **labels):
+    """Регистрирует счётчик и возвращает его ключ в кэше."""
+    key = 'metrics:{}:{}'.format(
+        name, ','.join(f'{label}={value}' for label, value in labels.items())
+    )
+    _registry[key] = (name, labels)
+    return key
+
+
+def incr(name, delta=1, **labels):
+    """Увеличивает счётчик в общем кэше."""
+    key = register(name, **labels)
+    if not cache.add(key, delta, timeout=None):
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            cache.set(key, delta, timeout=None)
+
+
+def collect():
+    """Возвращает значения зарегистрированных счётчиков."""
+    values = cache.get_many(list(_registry))
+    return [
+        (name, labels, values.get(key, 0))
+        for key, (name, labels) in sorted(_registry.items())
+    ]
+
+
+def render():
+    """Счётчики в текстовом формате Prometheus."""
+    lines = []
+    for name, labels, value in collect():
+        label_text = ','.join(
+            f'{label}="{value}"' for label, value in labels.items()
+        )
+        lines.append(f'{name}{{{label_text}}} {value}')
+    return '\n'.join(lines) + '\n'
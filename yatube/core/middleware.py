@@ -0,0 +1,51 @@
+import time
+
+from django.conf import settings
+from django.urls import Resolver404, resolve
+
+from .routers import read_from_replicas, track_writes
+
+REPLICA_PIN_COOKIE = 'primary_until'
+
+
+class ReplicaRoutingMiddleware:
+    """Выполняет запросы к read-only view с чтением из реплик.
+
+    После записи клиент на REPLICA_PIN_SECONDS закрепляется за основной
+    базой, чтобы видеть собственные изменения до репликации.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with track_writes() as state:
+            if self.can_use_replicas(request):
+                with read_from_replicas():
+                    response = self.get_response(request)
+            else:
+                response = self.get_response(request)
+            if state.wrote:
+                response.set_cookie(
+                    REPLICA_PIN_COOKIE,
+                    str(time.time() + settings.REPLICA_PIN_SECONDS),
+                    max_age=settings.REPLICA_PIN_SECONDS,
+                    httponly=True,
+                )
+        return response
+
+    def can_use_replicas(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return False
+        if request.method not in ('GET', 'HEAD'):
+            return False
+        try:
+            if float(request.COOKIES.get(REPLICA_PIN_COOKIE, 0)) > time.time():
+                return False
+        except ValueError:
+            pass
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return False
+        return getattr(match.func, 'use_replicas', False)
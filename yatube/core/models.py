@@ -0,0 +1,99 @@
+from django.db import models
+from django.utils import timezone
+
+
+class ChangeLog(models.Model):
+    CREATED = 'created'
+    UPDATED = 'updated'
+    DELETED = 'deleted'
+    ACTIONS = (
+        (CREATED, 'Создание'),
+        (UPDATED, 'Изменение'),
+        (DELETED, 'Удаление'),
+    )
+
+    model = models.CharField(max_length=100, verbose_name='Модель')
+    object_id = models.BigIntegerField(verbose_name='id объекта')
+    action = models.CharField(
+        max_length=10, choices=ACTIONS, verbose_name='Действие'
+    )
+    data = models.TextField(verbose_name='Данные в JSON')
+    created = models.DateTimeField(auto_now_add=True, verbose_name='Дата')
+
+    class Meta:
+        ordering = ('id',)
+        verbose_name = 'Запись журнала изменений'
+        verbose_name_plural = 'Журнал изменений'
+
+    def __str__(self) -> str:
+        return f'{self.model}:{self.object_id} {self.action}'
+
+
+class ConsumerOffset(models.Model):
+    consumer = models.CharField(
+        max_length=100, unique=True, verbose_name='Обработчик'
+    )
+    position = models.BigIntegerField(
+        default=0, verbose_name='id последней обработанной записи'
+    )
+    updated = models.DateTimeField(auto_now=True, verbose_name='Изменено')
+
+    class Meta:
+        verbose_name = 'Смещение обработчика'
+        verbose_name_plural = 'Смещения обработчиков'
+
+    def __str__(self) -> str:
+        return f'{self.consumer}: {self.position}'
+
+
+class Task(models.Model):
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    FAILED = 'failed'
+    STATUSES = (
+        (QUEUED, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (FAILED, 'Ошибка'),
+    )
+
+    name = models.CharField(max_length=200, verbose_name='Задача')
+    arguments = models.TextField(verbose_name='Аргументы в JSON')
+    priority = models.SmallIntegerField(
+        default=0, verbose_name='Приоритет',
+        help_text='Задачи с большим приоритетом выполняются раньше',
+    )
+    run_at = models.DateTimeField(
+        default=timezone.now, verbose_name='Выполнить не раньше'
+    )
+    status = models.CharField(
+        max_length=10, choices=STATUSES, default=QUEUED,
+        verbose_name='Состояние',
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0, verbose_name='Попыток'
+    )
+    max_attempts = models.PositiveSmallIntegerField(
+        default=3, verbose_name='Попыток не больше'
+    )
+    locked_by = models.CharField(
+        max_length=100, blank=True, verbose_name='Обработчик'
+    )
+    locked_at = models.DateTimeField(
+        null=True, blank=True, verbose_name='Взята в работу'
+    )
+    error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+    created = models.DateTimeField(auto_now_add=True, verbose_name='Создана')
+
+    class Meta:
+        ordering = ('-priority', 'run_at', 'id')
+        indexes = [
+            models.Index(
+                fields=['status', '-priority', 'run_at', 'id'],
+                name='core_task_claim_idx',
+            ),
+        ]
+        verbose_name = 'Фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+
+    def __str__(self) -> str:
+        return f'{self.name} ({self.status})'
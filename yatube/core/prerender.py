@@ -0,0 +1,234 @@
+"""Готовые HTML-страницы для анонимных посетителей.
+
+Страницы пишутся в каталог в виде path/index.html, path/page-N.html
+и сжатых копий .gz, которые веб-сервер отдаёт без обращения к Django.
+У лент сохраняются только страницы со второй (см. feed_pages).
+В prerender.json хранятся подписи страниц: страница рендерится заново,
+только если её подпись изменилась, и перезаписывается, только если
+изменилось содержимое. Кэш фрагментов шаблонов при этом не
+используется, чтобы в файл не попал фрагмент, отрисованный до изменения.
+"""
+import gzip
+import hashlib
+import json
+import os
+from collections import Counter
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.db.models import Sum
+from django.http import Http404
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from django.urls import resolve, reverse
+
+from posts.models import Comment, Group, Post, ReactionCounter
+
+from . import views
+from .cursors import ordering
+
+MANIFEST_NAME = 'prerender.json'
+# Поля автора и сообщества, которые выводятся рядом с публикацией.
+NAME_FIELDS = ('author__first_name', 'author__last_name', 'group__title')
+# Поля автора комментария из posts/includes/comment.html.
+COMMENTER_FIELDS = (
+    'author__username', 'author__first_name', 'author__last_name'
+)
+
+
+def without_fragment_cache():
+    """CACHES, в которых {% cache %} шаблонов ничего не хранит."""
+    return {
+        **settings.CACHES,
+        'template_fragments': {
+            'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+        },
+    }
+
+
+def anonymous_request(path, page=1):
+    request = RequestFactory().get(path, {'page': page} if page > 1 else {})
+    request.user = AnonymousUser()
+    return request
+
+
+def render_path(path, page=1):
+    """Рендерит страницу сайта так, как её увидит анонимный посетитель."""
+    request = anonymous_request(path, page)
+    match = resolve(path)
+    request.resolver_match = match
+    view = getattr(match.func, 'uncounted', match.func)
+    response = view(request, *match.args, **match.kwargs)
+    if hasattr(response, 'render'):
+        response.render()
+    if response.status_code != 200:
+        raise Http404(path)
+    return response.content
+
+
+def filename(path, page=1):
+    name = 'index.html' if page == 1 else f'page-{page}.html'
+    return os.path.join(path.strip('/'), name)
+
+
+def signature(*parts):
+    return hashlib.md5(repr(parts).encode()).hexdigest()
+
+
+def paginated(path, rows, *extra, first_page=1):
+    """Страницы ленты path; подпись страницы - её записи и их правки."""
+    per_page = settings.POSTS_PER_PAGE
+    pages = max(1, -(-len(rows) // per_page))
+    for page in range(first_page, pages + 1):
+        chunk = rows[(page - 1) * per_page:page * per_page]
+        yield (
+            filename(path, page),
+            signature(chunk, pages, *extra),
+            lambda page=page: render_path(path, page),
+        )
+
+
+def static_pages():
+    """Страницы без подписи: рендерятся всегда, пишутся при изменении."""
+    for name in ('about:author', 'about:tech'):
+        path = reverse(name)
+        yield filename(path), None, lambda path=path: render_path(path)
+    error_views = {
+        '404.html': lambda request: views.page_not_found(request, None),
+        '403.html': lambda request: views.permission_denied(request, None),
+        '500.html': views.server_error,
+    }
+    for name, view in error_views.items():
+        yield (
+            name,
+            None,
+            lambda view=view: view(anonymous_request('')).content,
+        )
+
+
+def feed_pages():
+    """Архивные страницы ленты, сообществ и профилей, со второй.
+
+    Первая страница меняется с каждой публикацией, и файл на диске
+    отставал бы от неё до следующего запуска, поэтому её отдаёт Django
+    (с кэшем страниц для анонимных посетителей). Каждая новая публикация
+    сдвигает и архивные страницы на одну запись; между запусками они
+    отстают на эти записи.
+    """
+    rows = Post.objects.order_by(*ordering('pub_date')).values_list(
+        'pk', 'updated', 'group_id', 'author__username', *NAME_FIELDS
+    )
+    posts, groups, authors = [], {}, {}
+    for pk, updated, group_id, username, *names in rows:
+        card = (pk, updated, *names)
+        posts.append(card)
+        groups.setdefault(group_id, []).append(card)
+        authors.setdefault(username, []).append(card)
+    yield from paginated(reverse('posts:index'), posts, first_page=2)
+    for group in Group.objects.all():
+        yield from paginated(
+            reverse('posts:group_list', args=[group.slug]),
+            groups.get(group.pk, []),
+            group.title,
+            group.description,
+            first_page=2,
+        )
+    for username, posts in authors.items():
+        yield from paginated(
+            reverse('posts:profile', args=[username]),
+            posts,
+            first_page=2,
+        )
+
+
+def post_pages():
+    """Страницы публикаций.
+
+    В подписи - комментарии с именами их авторов, правка публикации,
+    имя автора, число его публикаций, название сообщества и числа
+    реакций.
+    """
+    comments = {}
+    for post_id, *comment in Comment.objects.order_by(
+        *ordering('created')
+    ).values_list('post_id', 'pk', *COMMENTER_FIELDS):
+        comments.setdefault(post_id, []).append(comment)
+    reactions = {}
+    totals = ReactionCounter.objects.values('post_id', 'kind').annotate(
+        total=Sum('count')
+    ).order_by('post_id', 'kind')
+    for row in totals:
+        reactions.setdefault(row['post_id'], []).append(
+            (row['kind'], row['total'])
+        )
+    rows = list(
+        Post.objects.values_list('pk', 'updated', 'author_id', *NAME_FIELDS)
+    )
+    post_counts = Counter(author_id for _, _, author_id, *_ in rows)
+    for pk, updated, author_id, *names in rows:
+        yield from paginated(
+            reverse('posts:post_detail', args=[pk]),
+            comments.get(pk, []),
+            updated,
+            post_counts[author_id],
+            reactions.get(pk, []),
+            *names,
+        )
+
+
+def all_pages():
+    yield from static_pages()
+    yield from feed_pages()
+    yield from post_pages()
+
+
+def write_file(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as file:
+        file.write(content)
+    os.replace(temp_path, path)
+
+
+def remove_file(root, name):
+    for path in (os.path.join(root, name), os.path.join(root, name + '.gz')):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def prerender(root, force=False):
+    """Обновляет каталог root и возвращает счётчики страниц."""
+    manifest_path = os.path.join(root, MANIFEST_NAME)
+    manifest = {}
+    if not force and os.path.exists(manifest_path):
+        with open(manifest_path) as file:
+            manifest = json.load(file)
+    stats = {'written': 0, 'unchanged': 0, 'skipped': 0, 'removed': 0}
+    pages = {}
+    with override_settings(CACHES=without_fragment_cache()):
+        for name, page_signature, render in all_pages():
+            previous = manifest.get(name, {})
+            exists = os.path.exists(os.path.join(root, name))
+            if page_signature and exists and (
+                previous.get('signature') == page_signature
+            ):
+                pages[name] = previous
+                stats['skipped'] += 1
+                continue
+            content = render()
+            content_hash = hashlib.md5(content).hexdigest()
+            pages[name] = {'signature': page_signature, 'hash': content_hash}
+            if exists and previous.get('hash') == content_hash:
+                stats['unchanged'] += 1
+                continue
+            write_file(os.path.join(root, name), content)
+            write_file(
+                os.path.join(root, name + '.gz'),
+                gzip.compress(content, compresslevel=9, mtime=0),
+            )
+            stats['written'] += 1
+    for name in manifest.keys() - pages.keys():
+        remove_file(root, name)
+        stats['removed'] += 1
+    write_file(manifest_path, json.dumps(pages, indent=1).encode())
+    return stats
@@ -0,0 +1,167 @@
+import threading
+import time
+from functools import wraps
+from http import HTTPStatus
+
+from django.conf import settings
+from django.core.cache import cache
+from django.shortcuts import render
+
+from . import metrics
+
+
+def client_ip(request):
+    """IP клиента с учётом NUM_PROXIES доверенных прокси перед сайтом.
+
+    Каждый прокси дописывает в X-Forwarded-For адрес, с которого пришёл
+    запрос, поэтому адрес клиента - NUM_PROXIES-й с конца: то, что левее,
+    мог подставить сам клиент.
+    """
+    forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if settings.NUM_PROXIES and forwarded_for:
+        addresses = [address.strip() for address in forwarded_for.split(',')]
+        return addresses[-min(settings.NUM_PROXIES, len(addresses))]
+    return request.META.get('REMOTE_ADDR')
+
+
+class TokenBucket:
+    """Ведро токенов: capacity запросов подряд, затем rate в секунду.
+
+    Сначала проверяется ведро процесса, которое не требует обращения
+    к кэшу, затем общее ведро в кэше, которое видят все процессы.
+    """
+
+    max_local_keys = 10000
+
+    def __init__(self, name, capacity, rate):
+        self.name = name
+        self.capacity = capacity
+        self.rate = rate
+        self.retry_after = int(1 / rate) + 1
+        # Через столько миллисекунд в ведре появляется новый токен.
+        self.interval = max(1, round(1000 / rate))
+        self.local = {}
+        self.lock = threading.Lock()
+        for outcome in ('allowed', 'rejected'):
+            metrics.register('ratelimit_total', limiter=name, outcome=outcome)
+
+    def refill(self, state, now):
+        tokens, updated = state or (self.capacity, now)
+        return min(self.capacity, tokens + (now - updated) * self.rate)
+
+    def take_local(self, key, now):
+        with self.lock:
+            if len(self.local) > self.max_local_keys:
+                self.local.clear()
+            tokens = self.refill(self.local.get(key), now)
+            allowed = tokens >= 1
+            self.local[key] = (tokens - allowed, now)
+        return allowed
+
+    def take_shared(self, key, now):
+        """Берёт токен из общего ведра в кэше.
+
+        В кэше хранится момент в миллисекундах, когда ведро снова станет
+        полным; каждый токен сдвигает его на interval. Значение меняется
+        только атомарными add, incr и decr, поэтому одновременные запросы
+        разных процессов не затирают друг друга.
+        """
+        cache_key = f'ratelimit:{self.name}:{key}'
+        start = int(now * 1000)
+        timeout = int(self.capacity / self.rate) + 1
+        if cache.add(cache_key, start + self.interval, timeout):
+            return True
+        try:
+            full_at = cache.incr(cache_key, self.interval)
+            if full_at > start + self.capacity * self.interval:
+                cache.decr(cache_key, self.interval)
+                return False
+            if full_at < start + self.interval:
+                # Ведро успело наполниться: отсчёт идёт от текущего момента.
+                cache.incr(cache_key, start + self.interval - full_at)
+        except ValueError:
+            # Запись истекла между add и incr: ведро снова полное.
+            cache.set(cache_key, start + self.interval, timeout)
+        cache.touch(cache_key, timeout)
+        return True
+
+    def take(self, *keys):
+        """Берёт по токену для каждого ключа, False - если нельзя."""
+        now = time.time()
+        allowed = all(self.take_local(key, now) for key in keys) and all(
+            self.take_shared(key, now) for key in keys
+        )
+        metrics.incr(
+            'ratelimit_total',
+            limiter=self.name,
+            outcome='allowed' if allowed else 'rejected',
+        )
+        return allowed
+
+
+class SlidingWindow:
+    """Не больше limit запросов за скользящее окно в period секунд.
+
+    В кэше хранятся счётчики текущего и предыдущего окон; предыдущее
+    учитывается пропорционально тому, насколько оно ещё попадает в окно.
+    """
+
+    def __init__(self, name, limit, period):
+        self.name = name
+        self.limit = limit
+        self.period = period
+        self.retry_after = period
+        for outcome in ('allowed', 'rejected'):
+            metrics.register('ratelimit_total', limiter=name, outcome=outcome)
+
+    def hit(self, key, now):
+        window, offset = divmod(now, self.period)
+        current = f'ratelimit:{self.name}:{key}:{int(window)}'
+        previous = f'ratelimit:{self.name}:{key}:{int(window) - 1}'
+        counts = cache.get_many([current, previous])
+        estimate = (
+            counts.get(previous, 0) * (1 - offset / self.period)
+            + counts.get(current, 0)
+        )
+        if estimate >= self.limit:
+            return False
+        if not cache.add(current, 1, timeout=self.period * 2):
+            try:
+                cache.incr(current)
+            except ValueError:
+                cache.set(current, 1, timeout=self.period * 2)
+        return True
+
+    def take(self, *keys):
+        """Учитывает запрос для каждого ключа, False - если лимит исчерпан."""
+        now = time.time()
+        allowed = all(self.hit(key, now) for key in keys)
+        metrics.incr(
+            'ratelimit_total',
+            limiter=self.name,
+            outcome='allowed' if allowed else 'rejected',
+        )
+        return allowed
+
+
+def too_many_requests(request, retry_after=None):
+    response = render(
+        request, 'core/429.html', status=HTTPStatus.TOO_MANY_REQUESTS
+    )
+    if retry_after:
+        response['Retry-After'] = str(retry_after)
+    return response
+
+
+def throttle(limiter, get_keys, methods=('POST',)):
+    """Отклоняет запросы с кодом 429, когда лимит ключей запроса исчерпан."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method in methods and not limiter.take(
+                *get_keys(request)
+            ):
+                return too_many_requests(request, limiter.retry_after)
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
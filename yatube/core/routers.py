@@ -0,0 +1,64 @@
+import random
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+
+_state = threading.local()
+
+
+@contextmanager
+def read_from_replicas():
+    """Внутри блока чтения идут в реплики из DATABASE_REPLICAS."""
+    previous = getattr(_state, 'replicas', False)
+    _state.replicas = True
+    try:
+        yield
+    finally:
+        _state.replicas = previous
+
+
+@contextmanager
+def track_writes():
+    """Отмечает, была ли внутри блока запись в базу."""
+    _state.wrote = False
+    try:
+        yield _state
+    finally:
+        _state.wrote = False
+
+
+@contextmanager
+def untracked_writes():
+    """Служебная запись в блоке не закрепляет клиента за основной базой."""
+    wrote = getattr(_state, 'wrote', False)
+    try:
+        yield
+    finally:
+        _state.wrote = wrote
+
+
+def use_replicas(view):
+    """Помечает view, которое только читает и может работать с репликой."""
+    view.use_replicas = True
+    return view
+
+
+class ReplicaRouter:
+    """Направляет чтения в реплики, а запись и миграции - в default."""
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if replicas and getattr(_state, 'replicas', False):
+            return random.choice(replicas)
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        _state.wrote = True
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
@@ -0,0 +1,60 @@
+import gzip
+
+import brotli
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.exceptions import ImproperlyConfigured
+
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.map', '.svg', '.ico', '.txt', '.html', '.json', '.xml',
+)
+# Мельче сжимать нет смысла: выигрыш меньше накладных расходов.
+MIN_COMPRESS_SIZE = 256
+
+
+def compress(path):
+    """Пишет рядом с файлом копии .gz и .br, если они меньше оригинала."""
+    with open(path, 'rb') as file:
+        content = file.read()
+    if len(content) < MIN_COMPRESS_SIZE:
+        return []
+    variants = [
+        ('.gz', gzip.compress(content, compresslevel=9, mtime=0)),
+        ('.br', brotli.compress(content)),
+    ]
+    written = []
+    for suffix, compressed in variants:
+        if len(compressed) < len(content):
+            with open(path + suffix, 'wb') as file:
+                file.write(compressed)
+            written.append(path + suffix)
+    return written
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Статика с хэшем содержимого в имени и сжатыми копиями.
+
+    Без манифеста или собранного файла отдаётся исходное имя, чтобы
+    страницы открывались и до collectstatic.
+    """
+
+    manifest_strict = False
+
+    def post_process(self, paths, dry_run=False, **options):
+        hashed_names = set()
+        for name, hashed_name, processed in super().post_process(
+            paths, dry_run, **options
+        ):
+            if hashed_name and not isinstance(processed, Exception):
+                hashed_names.add(hashed_name)
+            yield name, hashed_name, processed
+        if dry_run:
+            return
+        for hashed_name in sorted(hashed_names):
+            if hashed_name.endswith(COMPRESSIBLE_EXTENSIONS):
+                compress(self.path(hashed_name))
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except (ValueError, ImproperlyConfigured, OSError):
+            return name
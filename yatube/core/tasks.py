@@ -0,0 +1,209 @@
+"""Фоновые задачи в таблице core.Task без отдельного брокера.
+
+Функция с декоратором @task ставится в очередь вызовом delay() или
+enqueue(): строка задачи добавляется в текущей транзакции и видна
+обработчику только после её фиксации. Обработчик (manage.py run_worker)
+забирает порцию готовых задач одним SELECT ... LIMIT и UPDATE внутри
+BEGIN IMMEDIATE, поэтому два обработчика не возьмут одну задачу.
+
+Выполненная задача удаляется. Упавшая возвращается в очередь с паузой
+TASK_RETRY_DELAY * 2 ** (попытка - 1) секунд, после max_attempts попыток
+остаётся в таблице в состоянии failed с текстом ошибки. Задача, которая
+выполняется дольше TASK_TIMEOUT секунд, считается брошенной упавшим
+обработчиком и снова выдаётся; результат прежнего обработчика тогда
+не записывается.
+"""
+import json
+import os
+import socket
+import threading
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import timedelta
+from functools import update_wrapper
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, connection
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .db import atomic_write, immediate_atomic
+from .models import Task
+
+
+class TaskFunction:
+    """Функция, которую можно выполнить в фоне."""
+
+    def __init__(self, func, priority=0, max_attempts=3):
+        update_wrapper(self, func)
+        self.func = func
+        self.name = f'{func.__module__}.{func.__qualname__}'
+        self.priority = priority
+        self.max_attempts = max_attempts
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def delay(self, *args, **kwargs):
+        """Ставит вызов в очередь с параметрами по умолчанию."""
+        return self.enqueue(args, kwargs)
+
+    def enqueue(self, args=(), kwargs=None, priority=None, run_at=None):
+        """Ставит вызов в очередь; run_at - не раньше этого времени."""
+        return Task.objects.create(
+            name=self.name,
+            arguments=json.dumps(
+                {'args': list(args), 'kwargs': kwargs or {}},
+                cls=DjangoJSONEncoder,
+            ),
+            priority=self.priority if priority is None else priority,
+            run_at=run_at or timezone.now(),
+            max_attempts=self.max_attempts,
+        )
+
+
+def task(func=None, *, priority=0, max_attempts=3):
+    """Декоратор фоновой задачи: @task или @task(priority=10)."""
+    if func is None:
+        return lambda func: TaskFunction(func, priority, max_attempts)
+    return TaskFunction(func, priority, max_attempts)
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def requeue_stale(now):
+    """Возвращает в очередь задачи, брошенные упавшими обработчиками."""
+    stale = Task.objects.filter(
+        status=Task.RUNNING,
+        locked_at__lt=now - timedelta(seconds=settings.TASK_TIMEOUT),
+    )
+    stale.filter(attempts__gte=F('max_attempts')).update(
+        status=Task.FAILED, error='Превышено время выполнения.'
+    )
+    stale.update(status=Task.QUEUED, locked_by='', locked_at=None)
+
+
+def claim(worker, limit):
+    """Забирает до limit готовых задач в работу обработчику worker."""
+    now = timezone.now()
+    with immediate_atomic():
+        requeue_stale(now)
+        ids = list(
+            Task.objects.filter(status=Task.QUEUED, run_at__lte=now)
+            .values_list('id', flat=True)[:limit]
+        )
+        if not ids:
+            return []
+        Task.objects.filter(id__in=ids).update(
+            status=Task.RUNNING,
+            locked_by=worker,
+            locked_at=now,
+            attempts=F('attempts') + 1,
+        )
+        return list(Task.objects.filter(id__in=ids))
+
+
+def execute(task):
+    """Выполняет взятую в работу задачу и записывает результат.
+
+    Результаты пишут сразу несколько потоков и обработчиков, поэтому
+    запись повторяется, пока база занята другим писателем.
+    """
+    # Задачу, выданную заново после TASK_TIMEOUT, выполняет уже другой
+    # обработчик: её строку меняет только он.
+    mine = Task.objects.filter(pk=task.pk, locked_by=task.locked_by)
+    try:
+        arguments = json.loads(task.arguments)
+        import_string(task.name)(*arguments['args'], **arguments['kwargs'])
+    except Exception:
+        error = traceback.format_exc()
+    else:
+        atomic_write(mine.delete)()
+        return True
+    if task.attempts >= task.max_attempts:
+        atomic_write(mine.update)(status=Task.FAILED, error=error)
+    else:
+        delay = settings.TASK_RETRY_DELAY * 2 ** (task.attempts - 1)
+        atomic_write(mine.update)(
+            status=Task.QUEUED,
+            run_at=timezone.now() + timedelta(seconds=delay),
+            locked_by='',
+            locked_at=None,
+            error=error,
+        )
+    return False
+
+
+def execute_in_thread(task):
+    """execute() в потоке пула с собственным соединением с базой."""
+    try:
+        return execute(task)
+    finally:
+        connection.close()
+
+
+class Worker:
+    """Обработчик очереди с пулом из threads потоков.
+
+    Задачи забираются по числу свободных потоков и отдаются пулу по
+    одной, поэтому долгая задача (например, доставка вебхука с паузами
+    между повторами) занимает только свой поток.
+    """
+
+    def __init__(self, threads=1, name=None):
+        self.threads = threads
+        self.name = name or worker_name()
+        self.stopped = threading.Event()
+
+    def run_once(self):
+        """Выполняет одну задачу в текущем потоке; False, если их нет."""
+        tasks = claim(self.name, 1)
+        for task in tasks:
+            execute(task)
+        return bool(tasks)
+
+    def submit(self, pool, running):
+        """Отдаёт пулу задачи по числу свободных потоков.
+
+        running - множество future выполняемых задач; возвращает число
+        отданных задач.
+        """
+        running -= {future for future in running if future.done()}
+        free = self.threads - len(running)
+        tasks = claim(self.name, free) if free > 0 else []
+        for task in tasks:
+            running.add(pool.submit(execute_in_thread, task))
+        return len(tasks)
+
+    def run(self, burst=False):
+        """Выполняет задачи до stop(); с burst - пока очередь не опустеет."""
+        pool = None
+        if self.threads > 1:
+            pool = ThreadPoolExecutor(self.threads)
+        running = set()
+        try:
+            while not self.stopped.is_set():
+                close_old_connections()
+                if pool is None:
+                    if self.run_once():
+                        continue
+                elif self.submit(pool, running):
+                    continue
+                elif running:
+                    # Ждём свободный поток, но не дольше TASK_POLL, чтобы
+                    # свободные потоки забирали новые задачи.
+                    wait(running, settings.TASK_POLL, FIRST_COMPLETED)
+                    continue
+                if burst:
+                    return
+                self.stopped.wait(settings.TASK_POLL)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    def stop(self):
+        self.stopped.set()
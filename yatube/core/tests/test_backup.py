@@ -0,0 +1,53 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TransactionTestCase
+
+from posts.models import Post
+
+User = get_user_model()
+
+
+class BackupRestoreTests(TransactionTestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.author = User.objects.create_user(username='author')
+        self.post = Post.objects.create(
+            author=self.author,
+            text='Анжамбеман нивелирует мелодический амфибрахий.',
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def backup(self, name):
+        path = os.path.join(self.temp_dir, name)
+        call_command('backup_db', path, pages=1, pause=0, stdout=StringIO())
+        return path
+
+    def test_backup_and_restore(self):
+        """Копия, в том числе сжатая, восстанавливает удалённые данные."""
+        for name in ('db.sqlite3', 'db.sqlite3.gz'):
+            with self.subTest(name=name):
+                path = self.backup(name)
+                self.assertTrue(os.path.exists(path + '.sha256'))
+                Post.objects.all().delete()
+                call_command(
+                    'restore_db', path, interactive=False, stdout=StringIO()
+                )
+                self.assertTrue(Post.objects.filter(pk=self.post.pk).exists())
+
+    def test_restore_checksum_mismatch(self):
+        """Повреждённая копия не восстанавливается."""
+        path = self.backup('db.sqlite3.gz')
+        with open(path, 'ab') as file:
+            file.write(b'broken')
+        Post.objects.all().delete()
+        with self.assertRaises(CommandError):
+            call_command('restore_db', path, interactive=False)
+        self.assertFalse(Post.objects.exists())
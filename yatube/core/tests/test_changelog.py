@@ -0,0 +1,147 @@
+import json
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+
+from core.changelog import Consumer, prune
+from core.models import ChangeLog, ConsumerOffset
+from posts.models import Comment, Follow, Post
+
+User = get_user_model()
+
+
+class RecordingConsumer(Consumer):
+    name = 'recording'
+    handled = []
+
+    def handle(self, entries):
+        self.handled.extend(
+            (entry.model, entry.object_id, entry.action) for entry in entries
+        )
+
+
+class CommentsConsumer(RecordingConsumer):
+    name = 'comments'
+    models = ('posts.comment',)
+
+
+class FailingConsumer(Consumer):
+    name = 'failing'
+
+    def handle(self, entries):
+        raise RuntimeError
+
+
+class ChangeLogTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(username='reader')
+
+    def setUp(self):
+        RecordingConsumer.handled = []
+        self.post = Post.objects.create(author=self.author, text='Текст')
+        self.comment = Comment.objects.create(
+            post=self.post, author=self.reader, text='Комментарий'
+        )
+        self.follow = Follow.objects.create(
+            user=self.reader, author=self.author
+        )
+
+    def entries(self):
+        return list(
+            ChangeLog.objects.values_list('model', 'object_id', 'action')
+        )
+
+    def test_changes_recorded(self):
+        """Создание, правка и удаление попадают в журнал по порядку."""
+        self.post.text = 'Новый текст'
+        self.post.save()
+        follow_id = self.follow.pk
+        self.follow.delete()
+        self.assertEqual(self.entries(), [
+            ('posts.post', self.post.pk, ChangeLog.CREATED),
+            ('posts.comment', self.comment.pk, ChangeLog.CREATED),
+            ('posts.follow', follow_id, ChangeLog.CREATED),
+            ('posts.post', self.post.pk, ChangeLog.UPDATED),
+            ('posts.follow', follow_id, ChangeLog.DELETED),
+        ])
+        data = json.loads(ChangeLog.objects.filter(
+            action=ChangeLog.UPDATED
+        ).get().data)
+        self.assertEqual(data['text'], 'Новый текст')
+        self.assertEqual(data['author_id'], self.author.pk)
+
+    def test_rolled_back_change_not_recorded(self):
+        """Откаченное изменение не остаётся в журнале."""
+        count = ChangeLog.objects.count()
+        try:
+            with transaction.atomic():
+                Post.objects.create(author=self.author, text='Черновик')
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        self.assertEqual(ChangeLog.objects.count(), count)
+
+    def test_consumer_batches(self):
+        """Обработчик читает журнал порциями и запоминает смещение."""
+        consumer = RecordingConsumer()
+        self.assertEqual(consumer.run_once(batch_size=2), 2)
+        self.assertEqual(consumer.run(batch_size=2), 1)
+        self.assertEqual(consumer.run(), 0)
+        self.assertEqual(self.entries(), consumer.handled)
+        self.assertEqual(
+            ConsumerOffset.objects.get(consumer='recording').position,
+            ChangeLog.objects.last().pk,
+        )
+        Comment.objects.create(
+            post=self.post, author=self.author, text='Ответ'
+        )
+        self.assertEqual(consumer.run(), 1)
+        self.assertEqual(len(consumer.handled), 4)
+
+    def test_consumer_models(self):
+        """Обработчик получает только нужные ему модели."""
+        consumer = CommentsConsumer()
+        self.assertEqual(consumer.run(), 3)
+        self.assertEqual(consumer.handled, [
+            ('posts.comment', self.comment.pk, ChangeLog.CREATED),
+        ])
+
+    def test_failed_batch_retried(self):
+        """При ошибке смещение не сдвигается."""
+        with self.assertRaises(RuntimeError):
+            FailingConsumer().run()
+        self.assertFalse(
+            ConsumerOffset.objects.filter(
+                consumer='failing', position__gt=0
+            ).exists()
+        )
+
+    def test_prune(self):
+        """Удаляются только записи, прочитанные всеми обработчиками."""
+        consumers = [RecordingConsumer(), CommentsConsumer()]
+        consumers[0].run()
+        self.assertEqual(prune(consumers), 0)
+        consumers[1].run_once(batch_size=2)
+        self.assertEqual(prune(consumers), 2)
+        self.assertEqual(ChangeLog.objects.count(), 1)
+
+    @override_settings(CHANGELOG_CONSUMERS=[
+        'core.tests.test_changelog.RecordingConsumer',
+        'core.tests.test_changelog.CommentsConsumer',
+    ])
+    def test_command(self):
+        """Команда дочитывает журнал выбранными обработчиками."""
+        out = StringIO()
+        call_command('consume_changes', 'comments', once=True, stdout=out)
+        self.assertEqual(out.getvalue(), 'comments: 3\n')
+        self.assertFalse(
+            ConsumerOffset.objects.filter(consumer='recording').exists()
+        )
+        call_command('consume_changes', once=True, prune=True, stdout=out)
+        self.assertFalse(ChangeLog.objects.exists())
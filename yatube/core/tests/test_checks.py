@@ -0,0 +1,48 @@
+from django.test import SimpleTestCase, override_settings
+
+from core.checks import check_shared_cache
+
+LOCMEM = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+MEMCACHED = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+        'LOCATION': '127.0.0.1:11211',
+    }
+}
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    @override_settings(CACHES=LOCMEM)
+    def test_process_local_cache(self):
+        """Версии, кэш страниц и пользователя в памяти процесса - ошибка."""
+        errors = check_shared_cache(None)
+        self.assertEqual([error.id for error in errors], ['core.E001'])
+        for name in (
+            'posts.versions',
+            'AnonymousPageCacheMiddleware',
+            'CachedModelBackend',
+        ):
+            with self.subTest(name=name):
+                self.assertIn(name, errors[0].msg)
+
+    @override_settings(CACHES=MEMCACHED)
+    def test_shared_cache(self):
+        """С общим кэшем ошибок нет."""
+        self.assertEqual(check_shared_cache(None), [])
+
+    @override_settings(
+        CACHES=LOCMEM,
+        MIDDLEWARE=[],
+        AUTHENTICATION_BACKENDS=[
+            'django.contrib.auth.backends.ModelBackend'
+        ],
+    )
+    def test_only_enabled_parts_listed(self):
+        """В ошибке перечислены только включённые части сайта."""
+        message = check_shared_cache(None)[0].msg
+        self.assertNotIn('AnonymousPageCacheMiddleware', message)
+        self.assertNotIn('CachedModelBackend', message)
@@ -0,0 +1,151 @@
+import shutil
+import tempfile
+import threading
+import time
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from core.db import WriteQueue, atomic_write, immediate_atomic
+
+
+class SQLitePragmasTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.temp_dir = tempfile.mkdtemp()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(cls.temp_dir, ignore_errors=True)
+
+    def pragma(self, wrapper, name):
+        with wrapper.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_pragmas_applied_to_new_connection(self):
+        """Новое соединение получает настройки из SQLITE_PRAGMAS."""
+        settings_dict = dict(
+            connection.settings_dict,
+            NAME=f'{self.temp_dir}/pragmas.sqlite3',
+        )
+        wrapper = DatabaseWrapper(settings_dict, alias='pragmas')
+        try:
+            pragmas_values = {
+                'journal_mode': 'wal',
+                'synchronous': 1,
+                'temp_store': 2,
+                'cache_size': settings.SQLITE_PRAGMAS['cache_size'],
+                'busy_timeout': settings.SQLITE_PRAGMAS['busy_timeout'],
+            }
+            for name, value in pragmas_values.items():
+                with self.subTest(pragma=name):
+                    self.assertEqual(self.pragma(wrapper, name), value)
+        finally:
+            wrapper.close()
+
+    def test_sqlite_benchmark(self):
+        """Бенчмарк выводит результаты обоих профилей."""
+        out = StringIO()
+        call_command(
+            'sqlite_benchmark', duration=0.2, rows=100, stdout=out
+        )
+        self.assertIn('default:', out.getvalue())
+        self.assertIn('tuned:', out.getvalue())
+
+
+@override_settings(DB_WRITE_RETRY_DELAY=0)
+class AtomicWriteTests(TestCase):
+    def test_retry_on_locked(self):
+        """Запись повторяется, пока база заблокирована."""
+        calls = []
+
+        def write():
+            calls.append(1)
+            if len(calls) < 3:
+                raise OperationalError('database is locked')
+            return 'ok'
+
+        self.assertEqual(atomic_write(write)(), 'ok')
+        self.assertEqual(len(calls), 3)
+
+    def test_retry_limit(self):
+        """После DB_WRITE_RETRIES попыток ошибка пробрасывается."""
+        write = mock.Mock(side_effect=OperationalError('database is locked'))
+        with self.assertRaises(OperationalError):
+            atomic_write(write)()
+        self.assertEqual(write.call_count, settings.DB_WRITE_RETRIES)
+
+    def test_other_errors_not_retried(self):
+        """Прочие ошибки базы не повторяются."""
+        write = mock.Mock(side_effect=OperationalError('no such table'))
+        with self.assertRaises(OperationalError):
+            atomic_write(write)()
+        self.assertEqual(write.call_count, 1)
+
+
+class ImmediateAtomicTests(TransactionTestCase):
+    def test_begin_immediate(self):
+        """Внешняя транзакция записи начинается с BEGIN IMMEDIATE."""
+        with CaptureQueriesContext(connection) as queries:
+            with immediate_atomic():
+                with immediate_atomic():
+                    pass
+            with immediate_atomic():
+                pass
+        statements = [query['sql'] for query in queries.captured_queries]
+        self.assertEqual(statements.count('BEGIN IMMEDIATE'), 2)
+        self.assertNotIn('BEGIN', statements)
+
+
+class WriteQueueTests(TransactionTestCase):
+    def test_submit_returns_result(self):
+        """Запись через очередь возвращает результат или ошибку."""
+        queue = WriteQueue()
+        self.assertEqual(queue.submit(sum, [1, 2]), 3)
+        with self.assertRaises(ZeroDivisionError):
+            queue.submit(divmod, 1, 0)
+
+    def test_pending_writes_coalesced(self):
+        """Записи, накопившиеся за время транзакции, выполняются вместе."""
+        queue = WriteQueue()
+        started = threading.Event()
+        release = threading.Event()
+        results = []
+
+        def slow_write():
+            started.set()
+            release.wait(5)
+            return 'slow'
+
+        def submit(func, *args):
+            results.append(queue.submit(func, *args))
+            connection.close()
+
+        leader = threading.Thread(target=submit, args=(slow_write,))
+        leader.start()
+        started.wait(5)
+        followers = [
+            threading.Thread(target=submit, args=(str, number))
+            for number in range(3)
+        ]
+        with mock.patch.object(
+            queue, 'run_batch', wraps=queue.run_batch
+        ) as run_batch:
+            for thread in followers:
+                thread.start()
+            while len(queue.pending) < len(followers):
+                time.sleep(0.01)
+            release.set()
+            for thread in [leader] + followers:
+                thread.join(5)
+        self.assertEqual(sorted(results), ['0', '1', '2', 'slow'])
+        self.assertEqual(run_batch.call_count, 1)
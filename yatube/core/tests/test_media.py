@@ -0,0 +1,137 @@
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from sorl.thumbnail import get_thumbnail
+
+from core.tasks import Worker
+from posts.models import Post
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+
+User = get_user_model()
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class ServeMediaTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.post = Post.objects.create(
+            author=cls.author,
+            text='Публикация с картинкой',
+            image=SimpleUploadedFile(
+                name='small.gif', content=SMALL_GIF, content_type='image/gif'
+            ),
+        )
+        cls.url = cls.post.image.url
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def content(self, response):
+        return b''.join(response.streaming_content)
+
+    def test_file_served(self):
+        """Файл отдаётся целиком с заголовками кэширования."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/gif')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('max-age', response['Cache-Control'])
+        self.assertEqual(self.content(response), SMALL_GIF)
+
+    def test_range(self):
+        """По заголовку Range отдаётся часть файла."""
+        size = len(SMALL_GIF)
+        ranges = {
+            'bytes=0-5': (b'GIF89a', f'bytes 0-5/{size}'),
+            'bytes=-3': (
+                SMALL_GIF[-3:], f'bytes {size - 3}-{size - 1}/{size}'
+            ),
+            'bytes=30-': (SMALL_GIF[30:], f'bytes 30-{size - 1}/{size}'),
+        }
+        for header, (content, content_range) in ranges.items():
+            with self.subTest(range=header):
+                response = self.client.get(self.url, HTTP_RANGE=header)
+                self.assertEqual(response.status_code, 206)
+                self.assertEqual(response['Content-Range'], content_range)
+                self.assertEqual(response['Content-Length'], str(len(content)))
+                self.assertEqual(self.content(response), content)
+
+    def test_range_not_satisfiable(self):
+        """Диапазон за концом файла даёт 416."""
+        response = self.client.get(self.url, HTTP_RANGE='bytes=100-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(
+            response['Content-Range'], f'bytes */{len(SMALL_GIF)}'
+        )
+
+    def test_if_range_changed(self):
+        """Устаревший If-Range отменяет Range."""
+        response = self.client.get(
+            self.url, HTTP_RANGE='bytes=0-5', HTTP_IF_RANGE='"old"'
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_not_modified(self):
+        """По совпавшему ETag отдаётся 304."""
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_accel_redirect(self):
+        """С MEDIA_ACCEL_REDIRECT файл передаёт веб-сервер."""
+        with self.settings(MEDIA_ACCEL_REDIRECT='x-accel-redirect'):
+            response = self.client.get(self.url)
+        self.assertEqual(
+            response['X-Accel-Redirect'],
+            settings.MEDIA_ACCEL_PREFIX + self.post.image.name,
+        )
+        self.assertEqual(response.content, b'')
+        with self.settings(MEDIA_ACCEL_REDIRECT='x-sendfile'):
+            response = self.client.get(self.url)
+        self.assertEqual(response['X-Sendfile'], self.post.image.path)
+
+    def test_hidden_files(self):
+        """Изображение удалённой публикации и чужие пути не отдаются."""
+        image = self.post.image.name
+        Post.objects.filter(pk=self.post.pk).delete()
+        urls = (
+            settings.MEDIA_URL + image,
+            settings.MEDIA_URL + '../settings.py',
+            settings.MEDIA_URL + 'missing.gif',
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_thumbnails_deleted_with_post(self):
+        """Миниатюры удалённой публикации больше не отдаются."""
+        post = Post.objects.create(
+            author=self.author,
+            text='Публикация с миниатюрой',
+            image=SimpleUploadedFile(
+                name='thumb.gif', content=SMALL_GIF, content_type='image/gif'
+            ),
+        )
+        Worker().run(burst=True)
+        url = get_thumbnail(post.image, '960x339').url
+        self.assertEqual(self.client.get(url).status_code, 200)
+        post.delete()
+        Worker().run(burst=True)
+        self.assertEqual(self.client.get(url).status_code, 404)
@@ -0,0 +1,177 @@
+import gzip
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core import prerender
+from posts.counters import view_counter
+from posts.models import Comment, Group, Post, Reaction
+from posts.reactions import set_reaction
+from posts.tests.constants import INDEX_URL_NAME
+
+User = get_user_model()
+
+
+@override_settings(POSTS_PER_PAGE=2)
+class PrerenderTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        Post.objects.bulk_create(
+            Post(author=cls.author, group=cls.group, text=f'Публикация {i}')
+            for i in range(3)
+        )
+        cls.post = Post.objects.first()
+
+    def setUp(self):
+        cache.clear()
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def run_prerender(self):
+        out = StringIO()
+        call_command('prerender', self.root, stdout=out)
+        return out.getvalue()
+
+    def read(self, name):
+        with open(os.path.join(self.root, name), 'rb') as file:
+            return file.read()
+
+    def test_pages_written(self):
+        """Страницы сайта и ошибок сохраняются вместе со сжатыми копиями."""
+        self.run_prerender()
+        names = (
+            'about/author/index.html',
+            'about/tech/index.html',
+            '404.html',
+            '403.html',
+            '500.html',
+            'page-2.html',
+            'group/test-slug/page-2.html',
+            'profile/author/page-2.html',
+            f'posts/{self.post.pk}/index.html',
+        )
+        for name in names:
+            with self.subTest(name=name):
+                content = self.read(name)
+                self.assertEqual(gzip.decompress(self.read(name + '.gz')),
+                                 content)
+        self.assertIn(
+            Post.objects.last().text, self.read('page-2.html').decode()
+        )
+        self.assertNotIn(
+            'csrfmiddlewaretoken',
+            self.read(f'posts/{self.post.pk}/index.html').decode(),
+        )
+
+    def test_first_feed_pages_skipped(self):
+        """Первые страницы лент отдаёт Django, в каталоге их нет."""
+        self.run_prerender()
+        names = (
+            'index.html',
+            'group/test-slug/index.html',
+            'profile/author/index.html',
+        )
+        for name in names:
+            with self.subTest(name=name):
+                self.assertFalse(
+                    os.path.exists(os.path.join(self.root, name))
+                )
+
+    def test_fragment_cache_bypassed(self):
+        """Фрагмент ленты из кэша шаблонов не попадает в файл."""
+        self.run_prerender()
+        self.client.get(reverse(INDEX_URL_NAME), {'page': 2})
+        # bulk_create не меняет версию ленты: фрагмент в кэше устарел.
+        Post.objects.bulk_create(
+            [Post(author=self.author, text='Свежая публикация')]
+        )
+        self.run_prerender()
+        content = self.read('page-2.html').decode()
+        for post in Post.objects.all()[2:4]:
+            self.assertIn(post.text, content)
+
+    def test_post_page_signature(self):
+        """Имена автора и комментаторов, сообщество и реакции в подписи."""
+        self.run_prerender()
+        name = f'posts/{self.post.pk}/index.html'
+        self.author.first_name = 'Новое имя'
+        self.author.save()
+        self.run_prerender()
+        self.assertIn('Новое имя', self.read(name).decode())
+        self.group.title = 'Новое название'
+        self.group.save()
+        self.run_prerender()
+        self.assertIn('Новое название', self.read(name).decode())
+        Post.objects.create(author=self.author, text='Ещё публикация')
+        self.run_prerender()
+        self.assertIn(
+            'Всего публикаций автора: <span>4</span>',
+            self.read(name).decode(),
+        )
+        reader = User.objects.create_user(username='reader')
+        Comment.objects.create(
+            post=self.post, author=reader, text='Комментарий'
+        )
+        self.run_prerender()
+        reader.first_name = 'Комментатор'
+        reader.save()
+        self.run_prerender()
+        self.assertIn('Комментатор', self.read(name).decode())
+        set_reaction(self.author, self.post.pk, Reaction.LIKE)
+        self.run_prerender()
+        self.assertIn('👍 1', self.read(name).decode())
+
+    def test_views_not_counted(self):
+        """Рендер страниц не считается просмотром публикаций."""
+        view_counter.pending.clear()
+        self.run_prerender()
+        self.assertEqual(view_counter.pending, {})
+
+    def test_incremental(self):
+        """Повторный запуск перерисовывает только изменившиеся страницы."""
+        self.run_prerender()
+        with mock.patch.object(
+            prerender, 'render_path', wraps=prerender.render_path
+        ) as render_path:
+            self.assertIn('Записано: 0', self.run_prerender())
+            render_path.assert_has_calls(
+                [mock.call('/about/author/'), mock.call('/about/tech/')]
+            )
+            self.assertEqual(render_path.call_count, 2)
+            render_path.reset_mock()
+            Comment.objects.create(
+                post=self.post, author=self.author, text='Комментарий'
+            )
+            self.run_prerender()
+        render_path.assert_called_with(f'/posts/{self.post.pk}/', 1)
+        self.assertEqual(render_path.call_count, 3)
+        self.assertIn('Комментарий', self.read(
+            f'posts/{self.post.pk}/index.html'
+        ).decode())
+
+    def test_deleted_pages_removed(self):
+        """Страницы удалённых публикаций удаляются из каталога."""
+        self.run_prerender()
+        post = Post.objects.get(pk=self.post.pk)
+        name = f'posts/{post.pk}/index.html'
+        post.delete()
+        self.run_prerender()
+        self.assertFalse(os.path.exists(os.path.join(self.root, name)))
+        self.assertFalse(os.path.exists(os.path.join(self.root, name + '.gz')))
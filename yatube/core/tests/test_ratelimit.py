@@ -0,0 +1,124 @@
+import threading
+from http import HTTPStatus
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import (
+    Client,
+    RequestFactory,
+    TestCase,
+    override_settings,
+)
+from django.urls import reverse
+
+from core import metrics
+from core.ratelimit import SlidingWindow, TokenBucket, client_ip
+
+User = get_user_model()
+
+
+class TokenBucketTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    @mock.patch('core.ratelimit.time.time')
+    def test_capacity_and_refill(self, now):
+        """После capacity запросов ведро пустеет и пополняется со временем."""
+        now.return_value = 1000.0
+        bucket = TokenBucket('test', capacity=3, rate=1)
+        results = [bucket.take('ip:1') for _ in range(4)]
+        self.assertEqual(results, [True, True, True, False])
+        self.assertTrue(bucket.take('ip:2'))
+        now.return_value = 1001.0
+        self.assertTrue(bucket.take('ip:1'))
+        self.assertFalse(bucket.take('ip:1'))
+
+    @mock.patch('core.ratelimit.time.time', return_value=1000.0)
+    def test_shared_bucket(self, now):
+        """Общее ведро в кэше ограничивает и другие процессы."""
+        TokenBucket('shared', capacity=2, rate=1).take('ip:1')
+        TokenBucket('shared', capacity=2, rate=1).take('ip:1')
+        self.assertFalse(
+            TokenBucket('shared', capacity=2, rate=1).take('ip:1')
+        )
+
+    def test_shared_bucket_concurrent(self):
+        """Одновременные запросы разных процессов не превышают capacity."""
+        results = []
+        barrier = threading.Barrier(20)
+
+        def take():
+            bucket = TokenBucket('concurrent', capacity=5, rate=0.001)
+            barrier.wait()
+            results.append(bucket.take('ip:1'))
+
+        threads = [threading.Thread(target=take) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results.count(True), 5)
+
+    @mock.patch('core.ratelimit.time.time')
+    def test_shared_bucket_refills_after_idle(self, now):
+        """После простоя общее ведро снова полное, но не больше capacity."""
+        now.return_value = 1000.0
+        for _ in range(2):
+            TokenBucket('idle', capacity=2, rate=1).take('ip:1')
+        now.return_value = 1100.0
+        results = [
+            TokenBucket('idle', capacity=2, rate=1).take('ip:1')
+            for _ in range(3)
+        ]
+        self.assertEqual(results, [True, True, False])
+
+    @mock.patch('core.ratelimit.time.time')
+    def test_sliding_window(self, now):
+        """Окно учитывает долю запросов предыдущего периода."""
+        now.return_value = 6000.0
+        window = SlidingWindow('window', limit=4, period=60)
+        results = [window.take('user:1') for _ in range(5)]
+        self.assertEqual(results, [True, True, True, True, False])
+        now.return_value = 6075.0
+        self.assertTrue(window.take('user:1'))
+        self.assertFalse(window.take('user:1'))
+        now.return_value = 6120.0
+        self.assertTrue(window.take('user:1'))
+
+    def test_metrics_exported(self):
+        """Счётчики ограничителя доступны персоналу на /metrics/."""
+        bucket = TokenBucket('export', capacity=1, rate=0.001)
+        bucket.take('ip:1')
+        bucket.take('ip:1')
+        self.assertIn(
+            ('ratelimit_total', {'limiter': 'export', 'outcome': 'rejected'},
+             1),
+            metrics.collect(),
+        )
+        staff = User.objects.create_user(username='staff', is_staff=True)
+        client = Client()
+        client.force_login(staff)
+        response = client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertIn(
+            'ratelimit_total{limiter="export",outcome="allowed"} 1',
+            response.content.decode(),
+        )
+        self.assertNotEqual(
+            Client().get(reverse('metrics')).status_code, HTTPStatus.OK
+        )
+
+
+class ClientIPTests(TestCase):
+    def test_client_ip(self):
+        """Адрес клиента берётся с учётом доверенных прокси."""
+        request = RequestFactory().get(
+            '/',
+            REMOTE_ADDR='10.0.0.1',
+            HTTP_X_FORWARDED_FOR='6.6.6.6, 203.0.113.7',
+        )
+        for proxies, address in ((0, '10.0.0.1'), (1, '203.0.113.7')):
+            with self.subTest(proxies=proxies):
+                with override_settings(NUM_PROXIES=proxies):
+                    self.assertEqual(client_ip(request), address)
@@ -0,0 +1,66 @@
+import time
+
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core.middleware import REPLICA_PIN_COOKIE, ReplicaRoutingMiddleware
+from core.routers import ReplicaRouter, read_from_replicas
+from posts.models import Post
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRoutingTests(SimpleTestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+        self.used = []
+
+    def get_response(self, request):
+        self.used.append(self.router.db_for_read(Post))
+        if request.method == 'POST':
+            self.router.db_for_write(Post)
+        return HttpResponse()
+
+    def process(self, request):
+        return ReplicaRoutingMiddleware(self.get_response)(request)
+
+    def test_router(self):
+        """Чтения уходят в реплику только внутри read_from_replicas."""
+        self.assertEqual(self.router.db_for_read(Post), 'default')
+        with read_from_replicas():
+            self.assertEqual(self.router.db_for_read(Post), 'replica')
+            self.assertEqual(self.router.db_for_write(Post), 'default')
+        self.assertFalse(self.router.allow_migrate('replica', 'posts'))
+
+    def test_read_only_views_use_replicas(self):
+        """Лента читается из реплики, создание публикации - нет."""
+        urls_databases = {
+            '/': 'replica',
+            '/about/author/': 'replica',
+            '/create/': 'default',
+            '/nonexist-page/': 'default',
+        }
+        for url, database in urls_databases.items():
+            with self.subTest(url=url):
+                self.process(self.factory.get(url))
+                self.assertEqual(self.used.pop(), database)
+
+    def test_read_your_writes(self):
+        """После записи клиент закреплён за основной базой."""
+        response = self.process(self.factory.post('/posts/1/comment/'))
+        self.assertIn(REPLICA_PIN_COOKIE, response.cookies)
+        request = self.factory.get('/')
+        request.COOKIES[REPLICA_PIN_COOKIE] = (
+            response.cookies[REPLICA_PIN_COOKIE].value
+        )
+        self.process(request)
+        self.assertEqual(self.used, ['default', 'default'])
+        request.COOKIES[REPLICA_PIN_COOKIE] = str(time.time() - 1)
+        self.process(request)
+        self.assertEqual(self.used.pop(), 'replica')
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas(self):
+        """Без реплик всё читается из default."""
+        self.process(self.factory.get('/'))
+        self.assertEqual(self.used, ['default'])
@@ -0,0 +1,142 @@
+import gzip
+import os
+import shutil
+import tempfile
+from io import StringIO
+from wsgiref.util import setup_testing_defaults
+
+import brotli
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.templatetags.static import static
+from django.test import SimpleTestCase
+
+from core.fileserver import PrecompressedFileServer, accepts
+
+CSS = 'body { color: #333; }\n' * 50
+
+
+class CompressedStaticStorageTests(SimpleTestCase):
+    def setUp(self):
+        self.source = tempfile.mkdtemp()
+        self.root = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.source, 'css'))
+        with open(os.path.join(self.source, 'css', 'site.css'), 'w') as file:
+            file.write(CSS)
+
+    def tearDown(self):
+        shutil.rmtree(self.source, ignore_errors=True)
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_collectstatic(self):
+        """collectstatic пишет файл с хэшем в имени и копии .gz и .br."""
+        with self.settings(
+            STATICFILES_DIRS=[self.source], STATIC_ROOT=self.root
+        ):
+            call_command('collectstatic', interactive=False, stdout=StringIO())
+            url = static('css/site.css')
+            name = staticfiles_storage.stored_name('css/site.css')
+        self.assertNotEqual(name, 'css/site.css')
+        self.assertEqual(url, f'/static/{name}')
+        with gzip.open(os.path.join(self.root, name + '.gz'), 'rt') as file:
+            self.assertEqual(file.read(), CSS)
+        with open(os.path.join(self.root, name + '.br'), 'rb') as file:
+            self.assertEqual(brotli.decompress(file.read()).decode(), CSS)
+
+    def test_missing_manifest(self):
+        """Без манифеста адрес строится по исходному имени."""
+        with self.settings(
+            STATICFILES_DIRS=[self.source], STATIC_ROOT=self.root
+        ):
+            self.assertEqual(static('css/site.css'), '/static/css/site.css')
+
+
+class PrecompressedFileServerTests(SimpleTestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.name = 'site.0123456789ab.css'
+        self.path = os.path.join(self.root, self.name)
+        with open(self.path, 'w') as file:
+            file.write(CSS)
+        with gzip.open(self.path + '.gz', 'wt') as file:
+            file.write(CSS)
+        self.server = PrecompressedFileServer(
+            self.application, '/static/', self.root,
+            max_age=60, immutable=True,
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def application(self, environ, start_response):
+        start_response('404 Not Found', [])
+        return [b'django']
+
+    def request(self, path, **headers):
+        environ = {'PATH_INFO': path}
+        environ.update(headers)
+        setup_testing_defaults(environ)
+        result = {}
+
+        def start_response(status, response_headers):
+            result['status'] = status
+            result['headers'] = dict(response_headers)
+
+        body = b''.join(self.server(environ, start_response))
+        return result['status'], result['headers'], body
+
+    def test_accepts(self):
+        """Разбор Accept-Encoding учитывает q=0."""
+        self.assertTrue(accepts('gzip, deflate, br', 'br'))
+        self.assertTrue(accepts('*', 'gzip'))
+        self.assertFalse(accepts('gzip;q=0, br', 'gzip'))
+        self.assertFalse(accepts('deflate', 'gzip'))
+
+    def test_gzip_negotiated(self):
+        """Клиенту, принимающему gzip, отдаётся сжатая копия."""
+        status, headers, body = self.request(
+            f'/static/{self.name}', HTTP_ACCEPT_ENCODING='gzip'
+        )
+        self.assertEqual(status, '200 OK')
+        self.assertEqual(headers['Content-Encoding'], 'gzip')
+        self.assertEqual(headers['Content-Type'], 'text/css')
+        self.assertEqual(headers['Vary'], 'Accept-Encoding')
+        self.assertIn('immutable', headers['Cache-Control'])
+        self.assertEqual(gzip.decompress(body).decode(), CSS)
+
+    def test_identity(self):
+        """Без Accept-Encoding отдаётся исходный файл."""
+        status, headers, body = self.request(f'/static/{self.name}')
+        self.assertNotIn('Content-Encoding', headers)
+        self.assertEqual(body.decode(), CSS)
+
+    def test_unhashed_name_not_immutable(self):
+        """Файл без хэша в имени кэшируется на max_age."""
+        shutil.copy(self.path, os.path.join(self.root, 'site.css'))
+        _, headers, _ = self.request('/static/site.css')
+        self.assertEqual(headers['Cache-Control'], 'public, max-age=60')
+
+    def test_not_modified(self):
+        """По совпавшему ETag отдаётся 304."""
+        _, headers, _ = self.request(f'/static/{self.name}')
+        status, _, body = self.request(
+            f'/static/{self.name}', HTTP_IF_NONE_MATCH=headers['ETag']
+        )
+        self.assertEqual(status, '304 Not Modified')
+        self.assertEqual(body, b'')
+
+    def test_passthrough(self):
+        """Чужие адреса и выход за каталог передаются приложению."""
+        paths = ('/about/', '/static/missing.css', '/static/../etc/passwd')
+        for path in paths:
+            with self.subTest(path=path):
+                self.assertEqual(self.request(path)[2], b'django')
+
+    def test_head(self):
+        """На HEAD отдаются только заголовки."""
+        status, headers, body = self.request(
+            f'/static/{self.name}', REQUEST_METHOD='HEAD'
+        )
+        self.assertEqual(status, '200 OK')
+        self.assertEqual(headers['Content-Length'], str(len(CSS)))
+        self.assertEqual(body, b'')
@@ -0,0 +1,142 @@
+import threading
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from core.models import Task
+from core.tasks import Worker, claim, execute, task
+
+calls = []
+
+
+@task
+def remember(value):
+    calls.append(value)
+
+
+@task(priority=5)
+def urgent(value):
+    calls.append(value)
+
+
+released = threading.Event()
+
+
+@task(priority=5)
+def slow():
+    calls.append(('медленная', released.wait(5)))
+
+
+@task
+def release():
+    released.set()
+
+
+@task(max_attempts=2)
+def fail():
+    raise ValueError('сбой')
+
+
+class TaskQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_delay_and_run(self):
+        """Задача выполняется обработчиком и удаляется из очереди."""
+        remember.delay('значение')
+        self.assertEqual(calls, [])
+        Worker().run(burst=True)
+        self.assertEqual(calls, ['значение'])
+        self.assertFalse(Task.objects.exists())
+
+    def test_priority_and_run_at(self):
+        """Сначала задачи с большим приоритетом, отложенные ждут."""
+        remember.delay('обычная')
+        urgent.delay('срочная')
+        remember.enqueue(
+            ['отложенная'], run_at=timezone.now() + timedelta(hours=1)
+        )
+        Worker().run(burst=True)
+        self.assertEqual(calls, ['срочная', 'обычная'])
+        self.assertEqual(Task.objects.get().status, Task.QUEUED)
+
+    def test_claim_once(self):
+        """Взятую задачу не получит другой обработчик."""
+        remember.delay(1)
+        remember.delay(2)
+        first = claim('first', 1)
+        second = claim('second', 5)
+        self.assertEqual(len(first), 1)
+        self.assertEqual(len(second), 1)
+        self.assertNotEqual(first[0].pk, second[0].pk)
+        self.assertEqual(claim('third', 5), [])
+        self.assertEqual(second[0].attempts, 1)
+
+    @override_settings(TASK_RETRY_DELAY=0)
+    def test_retries(self):
+        """Упавшая задача повторяется до max_attempts раз."""
+        fail.delay()
+        Worker().run(burst=True)
+        failed = Task.objects.get()
+        self.assertEqual(failed.status, Task.FAILED)
+        self.assertEqual(failed.attempts, 2)
+        self.assertIn('сбой', failed.error)
+
+    def test_retry_delay(self):
+        """Повтор откладывается на TASK_RETRY_DELAY секунд."""
+        fail.delay()
+        Worker().run(burst=True)
+        retry = Task.objects.get()
+        self.assertEqual(retry.status, Task.QUEUED)
+        self.assertGreater(retry.run_at, timezone.now())
+
+    @override_settings(TASK_TIMEOUT=60)
+    def test_stale_requeued(self):
+        """Задача брошенного обработчика снова выдаётся."""
+        remember.delay('брошенная')
+        claim('dead', 1)
+        Task.objects.update(locked_at=timezone.now() - timedelta(hours=1))
+        Worker().run(burst=True)
+        self.assertEqual(calls, ['брошенная'])
+
+    @override_settings(TASK_TIMEOUT=60)
+    def test_stale_result_ignored(self):
+        """Брошенный обработчик не удаляет задачу, выданную заново."""
+        remember.delay('брошенная')
+        stale = claim('dead', 1)[0]
+        Task.objects.update(locked_at=timezone.now() - timedelta(hours=1))
+        claim('alive', 1)
+        self.assertTrue(execute(stale))
+        self.assertEqual(Task.objects.get().locked_by, 'alive')
+
+    def test_command(self):
+        """run_worker --burst выполняет очередь и выходит."""
+        remember.delay('из команды')
+        call_command('run_worker', burst=True)
+        self.assertEqual(calls, ['из команды'])
+
+
+class ThreadPoolTests(TransactionTestCase):
+    def setUp(self):
+        calls.clear()
+        released.clear()
+
+    def test_threads(self):
+        """Пул потоков выполняет всю очередь."""
+        for value in range(5):
+            remember.delay(value)
+        Worker(threads=2).run(burst=True)
+        self.assertEqual(sorted(calls), list(range(5)))
+        self.assertFalse(Task.objects.exists())
+
+    def test_slow_task_does_not_block_others(self):
+        """Пока долгая задача идёт, свободный поток берёт следующие."""
+        slow.delay()
+        for value in range(3):
+            remember.delay(value)
+        release.delay()
+        Worker(threads=2).run(burst=True)
+        self.assertEqual(calls[:3], [0, 1, 2])
+        self.assertEqual(calls[3], ('медленная', True))
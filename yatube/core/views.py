@@ -1,6 +1,11 @@
 from http import HTTPStatus
 
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import Http404, HttpResponse
 from django.shortcuts import render
+from django.views.decorators.http import require_safe
+
+from . import media, metrics
 
 
 def page_not_found(request, exception):
@@ -22,3 +27,20 @@ def permission_denied(request, exception):
 
 def csrf_failure(request, reason=''):
     return render(request, 'core/403csrf.html')
+
+
+@staff_member_required
+def export_metrics(request):
+    """Счётчики приложения в текстовом формате Prometheus."""
+    return HttpResponse(
+        metrics.render(), content_type='text/plain; version=0.0.4'
+    )
+
+
+@require_safe
+def serve_media(request, path):
+    """Медиафайл: доступ проверяется здесь, передачу ведёт веб-сервер."""
+    full_path = media.media_path(path)
+    if not media.is_visible(path):
+        raise Http404(path)
+    return media.file_response(request, path, full_path)
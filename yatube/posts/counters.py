@@ -0,0 +1,91 @@
+"""Счётчики просмотров публикаций с отложенной записью в базу.
+
+Просмотры копятся в памяти процесса и раз в VIEW_COUNTS_FLUSH_INTERVAL
+секунд передаются фоновой задаче posts.tasks.write_views: запрос,
+на котором подошёл срок, только ставит её в очередь, а UPDATE делает
+обработчик очереди. Просмотры, накопленные процессом после последней
+передачи, при его остановке теряются: для счётчика это допустимо.
+
+Запись просмотров меняет только версию popular, поэтому ETag страниц
+публикаций от просмотров не зависит; API учитывает версию popular,
+когда запрошено поле views.
+"""
+import threading
+import time
+from collections import Counter
+from functools import wraps
+
+from django.conf import settings
+from django.db import DatabaseError
+
+from core.db import run_write
+from core.routers import untracked_writes
+
+from .tasks import write_views
+
+
+class ViewCounter:
+    """Буфер просмотров процесса."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = Counter()
+        self.flushed_at = time.monotonic()
+
+    def add(self, post_id):
+        """Учитывает просмотр; отдаёт буфер в очередь, если подошёл срок."""
+        with self.lock:
+            self.pending[post_id] += 1
+            due = (
+                time.monotonic() - self.flushed_at
+                >= settings.VIEW_COUNTS_FLUSH_INTERVAL
+            )
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Ставит запись накопленных просмотров в очередь задач.
+
+        Возвращает число публикаций.
+        """
+        with self.lock:
+            pending, self.pending = self.pending, Counter()
+            self.flushed_at = time.monotonic()
+        if not pending:
+            return 0
+        # Задача с просмотрами не меняет того, что видит сам посетитель.
+        try:
+            with untracked_writes():
+                run_write(write_views.delay, sorted(pending.items()))
+        except DatabaseError:
+            # Просмотры не должны ронять страницу: вернём их в буфер
+            # до следующей передачи.
+            with self.lock:
+                self.pending.update(pending)
+            return 0
+        return len(pending)
+
+
+view_counter = ViewCounter()
+
+
+def count_views(view):
+    """Считает просмотры публикации post_id.
+
+    Учитываются и ответы 304, и страницы, отданные из кэша
+    AnonymousPageCacheMiddleware: для них middleware вызывает
+    page_cache_hit.
+    """
+    @wraps(view)
+    def wrapper(request, post_id, **kwargs):
+        response = view(request, post_id=post_id, **kwargs)
+        if response.status_code in (200, 304):
+            view_counter.add(post_id)
+        return response
+
+    wrapper.page_cache_hit = (
+        lambda request, post_id: view_counter.add(post_id)
+    )
+    # Для служебного рендера, который не должен считаться просмотром.
+    wrapper.uncounted = view
+    return wrapper
@@ -0,0 +1,168 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.text import Truncator
+
+from core.routers import use_replicas
+
+from .models import Group, Post
+from .utils import conditional_page, page_versions
+from .versions import group_scope, index_scope, popular_scope, profile_scope
+
+User = get_user_model()
+
+
+class PostsFeed(Feed):
+    """RSS последних публикаций."""
+
+    title = 'Yatube: последние публикации'
+    description = 'Последние публикации на сайте.'
+
+    def link(self, obj=None):
+        return reverse('posts:index')
+
+    def posts(self, obj):
+        return Post.objects.all()
+
+    def items(self, obj=None):
+        return self.posts(obj).select_related('author', 'group')[
+            :settings.FEED_ITEMS
+        ]
+
+    def item_title(self, item):
+        return Truncator(item.text).words(10)
+
+    def item_description(self, item):
+        return item.text
+
+    def item_link(self, item):
+        return reverse('posts:post_detail', args=[item.pk])
+
+    def item_author_name(self, item):
+        return item.author.get_full_name() or item.author.username
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_updateddate(self, item):
+        return item.updated
+
+    def item_categories(self, item):
+        return [item.group.title] if item.group else []
+
+
+class GroupPostsFeed(PostsFeed):
+    """RSS последних публикаций сообщества."""
+
+    def get_object(self, request, slug):
+        return get_object_or_404(Group, slug=slug)
+
+    def title(self, obj):
+        return f'Yatube: {obj.title}'
+
+    def description(self, obj):
+        return obj.description
+
+    def link(self, obj):
+        return reverse('posts:group_list', args=[obj.slug])
+
+    def posts(self, obj):
+        return obj.posts.all()
+
+
+class AuthorPostsFeed(PostsFeed):
+    """RSS последних публикаций автора."""
+
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def title(self, obj):
+        return f'Yatube: {obj.get_full_name() or obj.username}'
+
+    def description(self, obj):
+        return f'Последние публикации пользователя {obj.username}.'
+
+    def link(self, obj):
+        return reverse('posts:profile', args=[obj.username])
+
+    def posts(self, obj):
+        return obj.posts.all()
+
+
+class PopularPostsFeed(PostsFeed):
+    """RSS самых просматриваемых публикаций."""
+
+    title = 'Yatube: популярные публикации'
+    description = 'Самые просматриваемые публикации на сайте.'
+
+    def link(self, obj=None):
+        return reverse('posts:popular')
+
+    def posts(self, obj):
+        return Post.objects.filter(views__gt=0).order_by('-views', 'id')
+
+
+class AtomFeedMixin:
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj=None):
+        return self._get_dynamic_attr('description', obj)
+
+
+class PostsAtomFeed(AtomFeedMixin, PostsFeed):
+    pass
+
+
+class GroupPostsAtomFeed(AtomFeedMixin, GroupPostsFeed):
+    pass
+
+
+class AuthorPostsAtomFeed(AtomFeedMixin, AuthorPostsFeed):
+    pass
+
+
+def cached_feed(feed, get_scopes):
+    """Лента из кэша с условным GET по версиям областей.
+
+    Пока версии не менялись, читатель получает 304 или готовый ответ из
+    кэша, и запрос публикаций не выполняется.
+    """
+    @use_replicas
+    @conditional_page(get_scopes)
+    def view(request, **kwargs):
+        source = '{}|{}'.format(
+            request.get_full_path(),
+            page_versions(request, get_scopes, kwargs),
+        )
+        key = 'feed:' + hashlib.md5(source.encode()).hexdigest()
+        response = cache.get(key)
+        if response is None:
+            response = feed(request, **kwargs)
+            cache.set(key, response, settings.FEED_CACHE_TIMEOUT)
+        return response
+    return view
+
+
+index_rss = cached_feed(PostsFeed(), lambda request: [index_scope()])
+index_atom = cached_feed(PostsAtomFeed(), lambda request: [index_scope()])
+group_rss = cached_feed(
+    GroupPostsFeed(), lambda request, slug: [group_scope(slug)]
+)
+group_atom = cached_feed(
+    GroupPostsAtomFeed(), lambda request, slug: [group_scope(slug)]
+)
+author_rss = cached_feed(
+    AuthorPostsFeed(), lambda request, username: [profile_scope(username)]
+)
+author_atom = cached_feed(
+    AuthorPostsAtomFeed(), lambda request, username: [profile_scope(username)]
+)
+popular_rss = cached_feed(
+    PopularPostsFeed(), lambda request: [index_scope(), popular_scope()]
+)
@@ -1,6 +1,6 @@
 from django import forms
 
-from .models import Comment, Post
+from .models import Comment, Post, Reaction
 
 
 class PostForm(forms.ModelForm):
@@ -13,3 +13,11 @@ class CommentForm(forms.ModelForm):
     class Meta:
         model = Comment
         fields = ('text',)
+
+
+class ReactionForm(forms.Form):
+    """Желаемая реакция; пустое значение снимает реакцию."""
+
+    kind = forms.ChoiceField(
+        choices=(('', ''),) + Reaction.KINDS, required=False
+    )
@@ -0,0 +1,64 @@
+"""Сведения об изображении публикации для вывода без сдвига вёрстки."""
+import base64
+from io import BytesIO
+
+from django.core.exceptions import SuspiciousFileOperation
+from PIL import Image, ImageOps
+
+# Файл может отсутствовать, лежать вне MEDIA_ROOT или не быть картинкой.
+READ_ERRORS = (
+    OSError,
+    ValueError,
+    SyntaxError,
+    SuspiciousFileOperation,
+    Image.DecompressionBombError,
+)
+# Пропорции миниатюры 960x339 в ленте и на странице публикации.
+PLACEHOLDER_SIZE = (24, 8)
+PLACEHOLDER_QUALITY = 40
+COLOR_SAMPLE_SIZE = (64, 64)
+
+
+def dominant_color(image):
+    """Самый частый из четырёх основных цветов изображения, #rrggbb."""
+    sample = image.copy()
+    sample.thumbnail(COLOR_SAMPLE_SIZE)
+    quantized = sample.quantize(colors=4)
+    _, index = max(quantized.getcolors())
+    palette = quantized.getpalette()[index * 3:index * 3 + 3]
+    return '#{:02x}{:02x}{:02x}'.format(*palette)
+
+
+def placeholder(image):
+    """Крошечное JPEG-превью в data URI, растягиваемое до загрузки."""
+    small = ImageOps.fit(image, PLACEHOLDER_SIZE, Image.BILINEAR)
+    buffer = BytesIO()
+    small.save(buffer, 'JPEG', quality=PLACEHOLDER_QUALITY, optimize=True)
+    encoded = base64.b64encode(buffer.getvalue()).decode()
+    return f'data:image/jpeg;base64,{encoded}'
+
+
+def image_info(file):
+    """Размеры, основной цвет и заглушка изображения или None.
+
+    Позиция чтения файла возвращается в начало, чтобы его можно было
+    сохранить после разбора.
+    """
+    try:
+        file.seek(0)
+        with Image.open(file) as opened:
+            width, height = opened.size
+            image = opened.convert('RGB')
+        return {
+            'width': width,
+            'height': height,
+            'color': dominant_color(image),
+            'placeholder': placeholder(image),
+        }
+    except READ_ERRORS:
+        return None
+    finally:
+        try:
+            file.seek(0)
+        except READ_ERRORS:
+            pass
@@ -0,0 +1,151 @@
+"""Поток новых комментариев к публикации в формате server-sent events.
+
+Общий канал - сама таблица комментариев: клиент помнит id последнего
+полученного комментария и после переподключения передаёт его в
+Last-Event-ID. Комментарии, добавленные в этом же процессе, будят потоки
+сразу через channel, добавленные в других процессах находятся запросом
+по индексу (post_id, id) не позже чем через LIVE_COMMENTS_POLL секунд.
+
+Каждый открытый поток занимает поток сервера, поэтому процесс держит
+не больше LIVE_COMMENTS_MAX_STREAMS потоков; остальным клиентам
+отдаётся только пауза переподключения LIVE_COMMENTS_BUSY_RETRY.
+"""
+import json
+import threading
+import time
+
+from django.conf import settings
+from django.template.loader import render_to_string
+
+from .models import Comment
+
+
+class Channel:
+    """Оповещение ожидающих потоков процесса о новых комментариях."""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._counter = 0
+
+    def publish(self):
+        with self._condition:
+            self._counter += 1
+            self._condition.notify_all()
+
+    def wait(self, seen, timeout):
+        """Ждёт публикации после seen не дольше timeout секунд.
+
+        Возвращает номер последней публикации.
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._counter != seen, timeout
+            )
+            return self._counter
+
+    @property
+    def counter(self):
+        return self._counter
+
+
+channel = Channel()
+
+
+class StreamSlots:
+    """Места для потоков событий в процессе."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def acquire(self):
+        """Занимает место; False, если свободных мест нет."""
+        with self._lock:
+            if self.count >= settings.LIVE_COMMENTS_MAX_STREAMS:
+                return False
+            self.count += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self.count -= 1
+
+
+slots = StreamSlots()
+
+
+class Stream:
+    """Поток событий, освобождающий место при закрытии ответа.
+
+    Ответ закрывается и тогда, когда поток не успел начаться, поэтому
+    место освобождает close(), а не finally в генераторе.
+    """
+
+    def __init__(self, events):
+        self.events = events
+        self.closed = False
+
+    def __iter__(self):
+        return self.events
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.events.close()
+            slots.release()
+
+
+def event(comment):
+    data = {
+        'id': comment.pk,
+        'author': comment.author.username,
+        'text': comment.text,
+        'created': comment.created.isoformat(),
+        'html': render_to_string(
+            'posts/includes/comment.html', {'comment': comment}
+        ),
+    }
+    return 'id: {}\nevent: comment\ndata: {}\n\n'.format(
+        comment.pk, json.dumps(data, ensure_ascii=False)
+    )
+
+
+def busy():
+    """Ответ без событий: браузер переподключится позже."""
+    return f'retry: {settings.LIVE_COMMENTS_BUSY_RETRY}\n\n'
+
+
+def comment_stream(post_id, last_id):
+    """Поток событий комментариев или None, если мест нет."""
+    if not slots.acquire():
+        return None
+    return Stream(comment_events(post_id, last_id))
+
+
+def comment_events(post_id, last_id):
+    """События новых комментариев с id больше last_id.
+
+    Поток закрывается через LIVE_COMMENTS_DURATION секунд, чтобы не
+    занимать поток сервера; браузер переподключается сам через retry
+    миллисекунд. Пока комментариев нет, раз в LIVE_COMMENTS_HEARTBEAT
+    секунд отправляется комментарий-пульс, чтобы прокси не закрыли
+    соединение.
+    """
+    started = last_beat = time.monotonic()
+    seen = channel.counter
+    yield f'retry: {settings.LIVE_COMMENTS_RETRY}\n\n'
+    while True:
+        comments = Comment.objects.filter(
+            post_id=post_id, id__gt=last_id
+        ).select_related('author').order_by('id')
+        for comment in comments:
+            last_id = comment.pk
+            last_beat = time.monotonic()
+            yield event(comment)
+        now = time.monotonic()
+        if now - started >= settings.LIVE_COMMENTS_DURATION:
+            return
+        if now - last_beat >= settings.LIVE_COMMENTS_HEARTBEAT:
+            last_beat = now
+            yield ': heartbeat\n\n'
+        seen = channel.wait(seen, settings.LIVE_COMMENTS_POLL)
@@ -0,0 +1,122 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.template.backends.django import DjangoTemplates
+
+from posts.models import Group, Post
+from posts.templatetags.post_cards import card_cache_keys
+
+User = get_user_model()
+
+FEED_TEMPLATE = 'posts/includes/more_posts.html'
+# Прежняя лента: {% include %} карточки и {% url %} для каждой публикации.
+LEGACY_CARD = """{% load thumbnail %}
+<article>
+  <ul>
+    <li>
+      Автор: {{ post.author.get_full_name }}
+      <a href="{% url 'posts:profile' post.author %}">
+        все публикации пользователя</a>
+    </li>
+    <li>
+      Дата публикации: {{ post.pub_date|date:"d E Y" }}
+    </li>
+  </ul>
+  {% thumbnail post.image "960x339" crop="center" upscale=True as im %}
+    <img class="card-img my-2" src="{{ im.url }}">
+  {% endthumbnail %}
+  <p>{{ post.text }}</p>
+  <p>
+    <a href="{% url 'posts:post_detail' post.id %}">
+      подробная информация о публикации</a>
+  </p>
+</article>"""
+LEGACY_FEED = """{% for post in posts %}
+<hr>
+{% include 'legacy/post.html' %}
+{% if post.group %}
+  <a href="{% url 'posts:group_list' post.group.slug %}">
+    все публикации сообщества {{ post.group }}</a>
+{% endif %}
+{% endfor %}"""
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время рендера ленты: прежнего цикла с {% include %} '
+        'и {% url %}, тега post_cards с отрисовкой карточек и тега '
+        'с карточками из кэша.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=10)
+        parser.add_argument('--repeat', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options['posts'], options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, count, repeat):
+        author = User.objects.create_user(username='feed-benchmark')
+        group = Group.objects.create(
+            title='Бенчмарк', slug='feed-benchmark', description='-'
+        )
+        Post.objects.bulk_create(
+            Post(author=author, group=group, text='Текст публикации ' * 10)
+            for _ in range(count)
+        )
+        posts = list(
+            Post.objects.filter(author=author).select_related(
+                'author', 'group'
+            )
+        )
+        keys = card_cache_keys(posts, show_group=True)
+        # Как в рабочем режиме: шаблоны компилируются один раз.
+        params = dict(settings.TEMPLATES[0], NAME='feed_benchmark')
+        params.pop('BACKEND')
+        params['APP_DIRS'] = False
+        params['OPTIONS'] = dict(params['OPTIONS'], loaders=[(
+            'django.template.loaders.cached.Loader',
+            [
+                ('django.template.loaders.locmem.Loader', {
+                    'legacy/feed.html': LEGACY_FEED,
+                    'legacy/post.html': LEGACY_CARD,
+                }),
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ],
+        )])
+        engine = DjangoTemplates(params)
+        context = {'posts': posts, 'show_group': True}
+        profiles = (
+            ('include', 'legacy/feed.html', False),
+            ('render', FEED_TEMPLATE, False),
+            ('cached', FEED_TEMPLATE, True),
+        )
+        try:
+            for name, template_name, cached in profiles:
+                template = engine.get_template(template_name)
+                elapsed = 0
+                for _ in range(repeat):
+                    if not cached:
+                        cache.delete_many(keys)
+                    started = time.perf_counter()
+                    template.render(context)
+                    elapsed += time.perf_counter() - started
+                elapsed = elapsed / repeat * 1000
+                self.stdout.write(f'{name}: {elapsed:.2f} мс на страницу')
+        finally:
+            # id публикаций освободятся после отката.
+            cache.delete_many(keys)
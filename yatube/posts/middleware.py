@@ -0,0 +1,98 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import Resolver404, resolve
+from django.utils.cache import (get_cache_key, get_conditional_response,
+                                learn_cache_key, patch_vary_headers)
+from django.utils.http import parse_http_date_safe
+
+from .utils import page_versions
+
+PAGE_CACHE_HEADER = 'X-Page-Cache'
+
+
+class AnonymousPageCacheMiddleware:
+    """Отдаёт анонимным посетителям готовые страницы из кэша.
+
+    Кэшируются view, отмеченные conditional_page(cache_anonymous=True).
+    Ключ строится из адреса, заголовков Vary и версий областей страницы,
+    поэтому новые публикации и комментарии делают старые копии
+    недоступными. Запросы с cookie сессии или CSRF идут мимо кэша.
+    Если у view есть page_cache_hit(request, **kwargs), он вызывается
+    при каждом ответе из кэша.
+
+    Версии и страницы хранятся в CACHES['default']; при нескольких
+    процессах сервера он должен быть общим (core.checks), иначе другие
+    процессы не увидят смены версий.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        match = self.resolve(request)
+        get_scopes = None
+        if match is not None:
+            get_scopes = getattr(match.func, 'page_cache_scopes', None)
+        if get_scopes is None:
+            return self.get_response(request)
+        kwargs = match.kwargs
+        key_prefix = self.key_prefix(request, get_scopes, kwargs)
+        cache_key = get_cache_key(request, key_prefix, 'GET', cache=cache)
+        response = cache.get(cache_key) if cache_key else None
+        if response is not None:
+            response[PAGE_CACHE_HEADER] = 'hit'
+            hit = getattr(match.func, 'page_cache_hit', None)
+            if hit is not None:
+                hit(request, **kwargs)
+            return get_conditional_response(
+                request,
+                etag=response.get('ETag'),
+                last_modified=parse_http_date_safe(
+                    response.get('Last-Modified')
+                ),
+                response=response,
+            )
+        response = self.get_response(request)
+        if self.can_store(request, response):
+            patch_vary_headers(response, ('Cookie',))
+            cache_key = learn_cache_key(
+                request,
+                response,
+                settings.PAGE_CACHE_TIMEOUT,
+                key_prefix,
+                cache=cache,
+            )
+            cache.set(cache_key, response, settings.PAGE_CACHE_TIMEOUT)
+        return response
+
+    def resolve(self, request):
+        """Результат resolve() для запроса, который может идти в кэш."""
+        if request.method not in ('GET', 'HEAD'):
+            return None
+        if (
+            settings.SESSION_COOKIE_NAME in request.COOKIES
+            or settings.CSRF_COOKIE_NAME in request.COOKIES
+        ):
+            return None
+        try:
+            return resolve(request.path_info)
+        except Resolver404:
+            return None
+
+    def key_prefix(self, request, get_scopes, kwargs):
+        versions = page_versions(request, get_scopes, kwargs)
+        return 'page:' + hashlib.md5(str(versions).encode()).hexdigest()
+
+    def can_store(self, request, response):
+        """Сохраняются только общие для всех анонимных посетителей ответы."""
+        return (
+            request.method == 'GET'
+            and response.status_code == 200
+            and not response.streaming
+            and not response.cookies
+            and not request.META.get('CSRF_COOKIE_USED')
+            and not request.user.is_authenticated
+            and not request.session.modified
+        )
@@ -0,0 +1,95 @@
+# Generated by Django 2.2.16 on 2026-10-19 16:58
+
+import base64
+from io import BytesIO
+
+from django.core.exceptions import SuspiciousFileOperation
+from django.db import migrations, models
+from PIL import Image, ImageOps
+
+# Копия posts.images на момент миграции: миграция не должна меняться
+# вместе с рабочим кодом.
+READ_ERRORS = (
+    OSError,
+    ValueError,
+    SyntaxError,
+    SuspiciousFileOperation,
+    Image.DecompressionBombError,
+)
+
+
+def dominant_color(image):
+    sample = image.copy()
+    sample.thumbnail((64, 64))
+    quantized = sample.quantize(colors=4)
+    _, index = max(quantized.getcolors())
+    palette = quantized.getpalette()[index * 3:index * 3 + 3]
+    return '#{:02x}{:02x}{:02x}'.format(*palette)
+
+
+def placeholder(image):
+    small = ImageOps.fit(image, (24, 8), Image.BILINEAR)
+    buffer = BytesIO()
+    small.save(buffer, 'JPEG', quality=40, optimize=True)
+    encoded = base64.b64encode(buffer.getvalue()).decode()
+    return f'data:image/jpeg;base64,{encoded}'
+
+
+def image_info(file):
+    try:
+        with Image.open(file) as opened:
+            width, height = opened.size
+            image = opened.convert('RGB')
+        return {
+            'width': width,
+            'height': height,
+            'color': dominant_color(image),
+            'placeholder': placeholder(image),
+        }
+    except READ_ERRORS:
+        return None
+
+
+def fill_image_info(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    for post in Post.objects.exclude(image='').iterator():
+        info = image_info(post.image)
+        post.image.close()
+        if info:
+            Post.objects.filter(pk=post.pk).update(
+                image_width=info['width'],
+                image_height=info['height'],
+                image_color=info['color'],
+                image_placeholder=info['placeholder'],
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0013_post_updated'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_color',
+            field=models.CharField(blank=True, editable=False, max_length=7, verbose_name='Основной цвет изображения'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='image_height',
+            field=models.PositiveIntegerField(editable=False, null=True, verbose_name='Высота изображения'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='image_placeholder',
+            field=models.TextField(blank=True, editable=False, verbose_name='Заглушка изображения'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='image_width',
+            field=models.PositiveIntegerField(editable=False, null=True, verbose_name='Ширина изображения'),
+        ),
+        migrations.RunPython(fill_image_info, migrations.RunPython.noop),
+    ]
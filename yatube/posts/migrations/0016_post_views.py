@@ -0,0 +1,22 @@
+# Generated by Django 2.2.16 on 2026-10-19 17:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0015_post_pub_date_id_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='views',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Просмотры'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['-views', 'id'], name='posts_post_views_ac1f48_idx'),
+        ),
+    ]
@@ -2,6 +2,7 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import models
 
+from .images import image_info
 
 User = get_user_model()
 
@@ -26,6 +27,7 @@ class Group(models.Model):
 class Post(models.Model):
     text = models.TextField(verbose_name='Текст', help_text='Текст публикации')
     pub_date = models.DateTimeField(auto_now_add=True, verbose_name='Дата')
+    updated = models.DateTimeField(auto_now=True, verbose_name='Изменено')
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -46,15 +48,78 @@ class Post(models.Model):
         upload_to=settings.POSTS_UPLOAD_TO,
         blank=True
     )
+    image_width = models.PositiveIntegerField(
+        null=True,
+        editable=False,
+        verbose_name='Ширина изображения',
+    )
+    image_height = models.PositiveIntegerField(
+        null=True,
+        editable=False,
+        verbose_name='Высота изображения',
+    )
+    image_color = models.CharField(
+        max_length=7,
+        blank=True,
+        editable=False,
+        verbose_name='Основной цвет изображения',
+    )
+    image_placeholder = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name='Заглушка изображения',
+    )
+    views = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Просмотры',
+    )
 
     class Meta:
         ordering = ('-pub_date', 'id')
+        # Для постраничного вывода по курсору (pub_date, id) в API
+        # и ленты самых просматриваемых публикаций.
+        indexes = [
+            models.Index(fields=['pub_date', 'id']),
+            models.Index(fields=['-views', 'id']),
+        ]
         verbose_name = 'Публикация'
         verbose_name_plural = 'Публикации'
 
     def __str__(self) -> str:
         return self.text[:15]
 
+    def save(self, *args, **kwargs):
+        self.prepare_image()
+        super().save(*args, **kwargs)
+
+    def prepare_image(self):
+        """Сохраняет новое изображение и заполняет сведения о нём.
+
+        Вьюхи вызывают его до run_write: разбор картинки и запись файла
+        не держат блокировку записи и не повторяются вместе с транзакцией.
+        save() вызывает его для остальных сохранений; повторный вызов
+        ничего не делает. Если файл не читается, сведения остаются
+        пустыми, а шаблоны выводят изображение без них.
+        """
+        if self.image and self.image._committed and (
+            self.image_width
+            or self.image.name == getattr(self, '_prepared_image', None)
+        ):
+            return
+        info = {}
+        if self.image:
+            info = image_info(self.image) or {}
+            if self.image._committed:
+                self.image.close()
+            else:
+                self.image.save(self.image.name, self.image.file, save=False)
+            self._prepared_image = self.image.name
+        self.image_width = info.get('width')
+        self.image_height = info.get('height')
+        self.image_color = info.get('color', '')
+        self.image_placeholder = info.get('placeholder', '')
+
 
 class Comment(models.Model):
     post = models.ForeignKey(
@@ -107,3 +172,72 @@ class Follow(models.Model):
         ]
         verbose_name = 'Подписка'
         verbose_name_plural = 'Подписки'
+
+
+class Reaction(models.Model):
+    LIKE = 'like'
+    LOVE = 'love'
+    LAUGH = 'laugh'
+    SAD = 'sad'
+    KINDS = (
+        (LIKE, '👍'),
+        (LOVE, '❤️'),
+        (LAUGH, '😂'),
+        (SAD, '😢'),
+    )
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='reactions',
+        verbose_name='Пользователь',
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='reactions',
+        verbose_name='Публикация',
+    )
+    kind = models.CharField(
+        max_length=10, choices=KINDS, verbose_name='Реакция'
+    )
+    created = models.DateTimeField(auto_now=True, verbose_name='Дата')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'post'],
+                name='posts_reaction_user_post_pair_unique'
+            )
+        ]
+        verbose_name = 'Реакция'
+        verbose_name_plural = 'Реакции'
+
+    def __str__(self) -> str:
+        return f'{self.user_id}:{self.post_id} {self.kind}'
+
+
+class ReactionCounter(models.Model):
+    """Часть счётчика реакций; сумма по шардам - число реакций."""
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='reaction_counters',
+        verbose_name='Публикация',
+    )
+    kind = models.CharField(
+        max_length=10, choices=Reaction.KINDS, verbose_name='Реакция'
+    )
+    shard = models.PositiveSmallIntegerField(verbose_name='Шард')
+    count = models.IntegerField(default=0, verbose_name='Количество')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['post', 'kind', 'shard'],
+                name='posts_reactioncounter_post_kind_shard_unique'
+            )
+        ]
+        verbose_name = 'Счётчик реакций'
+        verbose_name_plural = 'Счётчики реакций'
@@ -0,0 +1,121 @@
+"""Реакции на публикации и их счётчики.
+
+Число реакций каждого вида хранится в REACTION_SHARDS строках
+ReactionCounter, и каждое изменение правит случайную из них. Поэтому
+популярная публикация не превращается в одну горячую строку, которую
+по очереди блокируют все пишущие. При чтении шарды суммируются, а
+сумма кэшируется до следующего изменения реакций публикации.
+
+Удалённые реакции (снятые или удалённые вместе с пользователем)
+вычитает обработчик post_delete: reaction_deleted.
+"""
+import random
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Sum
+
+from . import versions
+from .models import Reaction, ReactionCounter
+
+
+def counts_key(post_id):
+    return f'reactions:{post_id}'
+
+
+def add_to_shard(post_id, kind, delta):
+    shard = random.randrange(settings.REACTION_SHARDS)
+    counters = ReactionCounter.objects.filter(
+        post_id=post_id, kind=kind, shard=shard
+    )
+    if not counters.update(count=F('count') + delta):
+        ReactionCounter.objects.create(
+            post_id=post_id, kind=kind, shard=shard, count=delta
+        )
+
+
+def take_from_shard(post_id, kind):
+    """Вычитает реакцию из шарда, в котором она учтена.
+
+    Новых строк не создаёт: при удалении публикации её реакции и
+    счётчики удаляются вместе, и строка для неё нарушила бы ключ.
+    """
+    shards = list(
+        ReactionCounter.objects.filter(
+            post_id=post_id, kind=kind, count__gt=0
+        ).values_list('pk', flat=True)
+    )
+    if shards:
+        ReactionCounter.objects.filter(pk=random.choice(shards)).update(
+            count=F('count') - 1
+        )
+
+
+def forget_counts(post_id):
+    """Сбрасывает сумму в кэше и версию страницы публикации."""
+    cache.delete(counts_key(post_id))
+    transaction.on_commit(lambda: cache.delete(counts_key(post_id)))
+    versions.bump(versions.post_scope(post_id))
+
+
+def reaction_deleted(reaction):
+    take_from_shard(reaction.post_id, reaction.kind)
+    forget_counts(reaction.post_id)
+
+
+def set_reaction(user, post_id, kind):
+    """Ставит пользователю реакцию kind или снимает её, если kind - None.
+
+    Повтор с теми же аргументами ничего не меняет, поэтому повторно
+    отправленная форма не сбивает счётчик. Вызывается в транзакции
+    записи (run_write). Возвращает True, если реакция изменилась.
+    """
+    current = Reaction.objects.filter(user=user, post_id=post_id).first()
+    previous = current.kind if current else None
+    if previous == kind:
+        return False
+    if kind is None:
+        # Счётчик уменьшит reaction_deleted.
+        current.delete()
+        return True
+    if current is None:
+        Reaction.objects.create(user=user, post_id=post_id, kind=kind)
+    else:
+        current.kind = kind
+        current.save(update_fields=['kind', 'created'])
+        add_to_shard(post_id, previous, -1)
+    add_to_shard(post_id, kind, 1)
+    forget_counts(post_id)
+    return True
+
+
+def reaction_counts(post_id):
+    """Число реакций публикации по видам, {kind: count}."""
+    counts = cache.get(counts_key(post_id))
+    if counts is None:
+        counts = dict(
+            ReactionCounter.objects.filter(post_id=post_id)
+            .values('kind')
+            .annotate(total=Sum('count'))
+            .values_list('kind', 'total')
+        )
+        cache.set(counts_key(post_id), counts, settings.REACTION_CACHE_TIMEOUT)
+    return counts
+
+
+def reactions_context(user, post_id):
+    """Виды реакций с числами и реакция пользователя для шаблона."""
+    counts = reaction_counts(post_id)
+    mine = None
+    if user.is_authenticated:
+        mine = Reaction.objects.filter(
+            user=user, post_id=post_id
+        ).values_list('kind', flat=True).first()
+    return {
+        'reactions': [
+            (kind, label, counts.get(kind, 0))
+            for kind, label in Reaction.KINDS
+        ],
+        'my_reaction': mine,
+    }
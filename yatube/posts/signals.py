@@ -0,0 +1,175 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from core.changelog import record
+from core.models import ChangeLog
+
+from . import live, versions
+from .models import Comment, Follow, Group, Post, Reaction
+from .reactions import reaction_deleted
+from .tasks import delete_thumbnails, make_thumbnails
+
+User = get_user_model()
+# Поля пользователя, которые выводятся на страницах публикаций.
+USER_DISPLAY_FIELDS = ('username', 'first_name', 'last_name')
+
+
+@receiver(pre_save, sender=Post)
+def remember_previous_values(sender, instance, **kwargs):
+    """Запоминает сообщество и изображение до правки.
+
+    Версию прежнего сообщества нужно сменить, а миниатюры прежнего
+    изображения - удалить.
+    """
+    instance._previous_group_slug = instance._previous_image = None
+    if instance.pk:
+        previous = Post.objects.filter(pk=instance.pk).values_list(
+            'group__slug', 'image'
+        ).first()
+        if previous is not None:
+            instance._previous_group_slug, instance._previous_image = previous
+
+
+@receiver(post_save, sender=Post)
+def queue_thumbnails(sender, instance, **kwargs):
+    """Готовит миниатюры нового изображения и удаляет миниатюры прежнего.
+
+    Файл к этому моменту уже может быть сохранён (Post.prepare_image),
+    поэтому новое изображение узнаётся по смене имени.
+    """
+    previous = getattr(instance, '_previous_image', None) or ''
+    if instance.image and instance.image.name != previous:
+        make_thumbnails.delay(instance.pk)
+    if previous and previous != instance.image.name:
+        delete_thumbnails.delay(previous)
+
+
+@receiver(post_delete, sender=Post)
+def queue_thumbnails_deletion(sender, instance, **kwargs):
+    if instance.image:
+        delete_thumbnails.delay(instance.image.name)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def bump_post_versions(sender, instance, **kwargs):
+    scopes = {
+        versions.index_scope(),
+        versions.post_scope(instance.pk),
+        versions.profile_scope(instance.author.username),
+    }
+    for slug in (
+        instance.group.slug if instance.group_id else None,
+        getattr(instance, '_previous_group_slug', None),
+    ):
+        if slug:
+            scopes.add(versions.group_scope(slug))
+    versions.bump(*scopes)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def bump_comment_versions(sender, instance, **kwargs):
+    versions.bump(versions.post_scope(instance.post_id))
+
+
+@receiver(post_save, sender=Comment)
+def publish_comment(sender, instance, created, **kwargs):
+    """Будит потоки живых комментариев после фиксации транзакции."""
+    if created:
+        transaction.on_commit(live.channel.publish)
+
+
+@receiver(post_delete, sender=Reaction)
+def uncount_reaction(sender, instance, **kwargs):
+    """Реакция снята или удалена вместе с пользователем."""
+    reaction_deleted(instance)
+
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def bump_follow_versions(sender, instance, **kwargs):
+    versions.bump(versions.follow_scope(instance.user_id))
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def bump_group_versions(sender, instance, **kwargs):
+    """Название сообщества выводится и в профилях его авторов."""
+    usernames = Post.objects.filter(group_id=instance.pk).values_list(
+        'author__username', flat=True
+    ).distinct()
+    versions.bump(
+        versions.index_scope(),
+        versions.group_scope(instance.slug),
+        versions.group_info_scope(instance.pk),
+        *(versions.profile_scope(username) for username in usernames),
+    )
+
+
+def display_names(user):
+    return tuple(getattr(user, field) for field in USER_DISPLAY_FIELDS)
+
+
+def user_scopes(user, *usernames):
+    """Области страниц, на которых выводится имя пользователя.
+
+    Это и страницы публикаций, которые он комментировал.
+    """
+    slugs = Post.objects.filter(
+        author_id=user.pk, group__isnull=False
+    ).values_list('group__slug', flat=True).distinct()
+    commented = Comment.objects.filter(author_id=user.pk).values_list(
+        'post_id', flat=True
+    ).distinct()
+    return {
+        versions.user_scope(user.pk),
+        versions.index_scope(),
+        *(versions.profile_scope(username) for username in usernames),
+        *(versions.group_scope(slug) for slug in slugs),
+        *(versions.post_scope(post_id) for post_id in commented),
+    }
+
+
+@receiver(pre_save, sender=User)
+def remember_previous_names(sender, instance, update_fields=None, **kwargs):
+    """Запоминает имя пользователя до правки.
+
+    Вход сохраняет только last_login: такие сохранения не проверяются.
+    """
+    instance._previous_names = None
+    if update_fields and not set(USER_DISPLAY_FIELDS) & set(update_fields):
+        return
+    if instance.pk:
+        instance._previous_names = User.objects.filter(
+            pk=instance.pk
+        ).values_list(*USER_DISPLAY_FIELDS).first()
+
+
+@receiver(post_save, sender=User)
+def bump_renamed_user_versions(sender, instance, **kwargs):
+    previous = getattr(instance, '_previous_names', None)
+    if previous is None or previous == display_names(instance):
+        return
+    versions.bump(*user_scopes(instance, instance.username, previous[0]))
+
+
+@receiver(post_delete, sender=User)
+def bump_deleted_user_versions(sender, instance, **kwargs):
+    versions.bump(*user_scopes(instance, instance.username))
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_save, sender=Follow)
+def record_save(sender, instance, created, **kwargs):
+    record(instance, ChangeLog.CREATED if created else ChangeLog.UPDATED)
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Comment)
+@receiver(post_delete, sender=Follow)
+def record_delete(sender, instance, **kwargs):
+    record(instance, ChangeLog.DELETED)
@@ -0,0 +1,17 @@
+// Живые комментарии: список с атрибутом data-live подписывается на поток
+// server-sent events и добавляет новые комментарии в начало. После обрыва
+// EventSource переподключается сам и передаёт id последнего полученного
+// комментария в заголовке Last-Event-ID.
+(function () {
+  'use strict';
+
+  var list = document.querySelector('[data-live]');
+  if (!list || !window.EventSource) {
+    return;
+  }
+  var source = new EventSource(list.dataset.live);
+  source.addEventListener('comment', function (event) {
+    var comment = JSON.parse(event.data);
+    list.insertAdjacentHTML('afterbegin', comment.html);
+  });
+})();
@@ -0,0 +1,62 @@
+// Бесконечная лента: когда читатель докручивает до конца списка
+// с атрибутом data-more, следующая порция записей загружается с этого
+// адреса и дописывается в список. Адрес следующей порции приходит
+// в заголовке X-Next-Page. Без JavaScript работает обычный паджинатор.
+(function () {
+  'use strict';
+
+  var list = document.querySelector('[data-more]');
+  if (!list || !list.dataset.more || !window.fetch ||
+      !('IntersectionObserver' in window)) {
+    return;
+  }
+  var paginator = document.querySelector('.pagination');
+  var sentinel = document.createElement('div');
+  var loading = false;
+  list.parentNode.insertBefore(sentinel, list.nextSibling);
+
+  function stop(showPaginator) {
+    observer.disconnect();
+    if (paginator && showPaginator) {
+      paginator.hidden = false;
+    }
+  }
+
+  function loadMore() {
+    loading = true;
+    fetch(list.dataset.more, {
+      credentials: 'same-origin',
+      headers: {'X-Requested-With': 'XMLHttpRequest'}
+    }).then(function (response) {
+      if (!response.ok) {
+        throw new Error(response.status);
+      }
+      list.dataset.more = response.headers.get('X-Next-Page') || '';
+      return response.text();
+    }).then(function (html) {
+      list.insertAdjacentHTML('beforeend', html);
+      loading = false;
+      if (!list.dataset.more) {
+        stop(false);
+        return;
+      }
+      // Если после загрузки конец списка всё ещё виден, наблюдатель
+      // не сработает сам: подписываемся заново.
+      observer.unobserve(sentinel);
+      observer.observe(sentinel);
+    }).catch(function () {
+      stop(true);
+    });
+  }
+
+  var observer = new IntersectionObserver(function (entries) {
+    if (entries[0].isIntersecting && !loading) {
+      loadMore();
+    }
+  }, {rootMargin: '600px 0px'});
+
+  if (paginator) {
+    paginator.hidden = true;
+  }
+  observer.observe(sentinel);
+})();
@@ -0,0 +1,54 @@
+from collections import defaultdict
+
+from django.db.models import F
+from sorl.thumbnail import delete, get_thumbnail
+
+from core.db import run_write
+from core.tasks import task
+
+from . import versions
+from .models import Post
+
+# Миниатюры из posts/includes/image.html.
+THUMBNAILS = (
+    ('960x339', {'crop': 'center', 'upscale': True}),
+)
+
+
+@task
+def make_thumbnails(post_id):
+    """Готовит миниатюры изображения, чтобы их не создавал запрос."""
+    post = Post.objects.filter(pk=post_id).first()
+    if post is None or not post.image:
+        return
+    for geometry, options in THUMBNAILS:
+        get_thumbnail(post.image, geometry, **options)
+
+
+@task
+def delete_thumbnails(name):
+    """Удаляет миниатюры изображения удалённой или заменённой публикации.
+
+    Исходное изображение остаётся на диске, но core.views.serve_media
+    его уже не отдаёт; миниатюры он не проверяет, поэтому их удаляем.
+    """
+    delete(name, delete_file=False)
+
+
+def add_views(by_delta):
+    for delta, post_ids in by_delta.items():
+        Post.objects.filter(pk__in=post_ids).update(views=F('views') + delta)
+    versions.bump(versions.popular_scope())
+
+
+@task
+def write_views(counts):
+    """Записывает просмотры [[post_id, просмотры], ...] из буфера процесса.
+
+    Одна короткая транзакция: по одному UPDATE на каждое встретившееся
+    приращение, а не на каждую публикацию.
+    """
+    by_delta = defaultdict(list)
+    for post_id, delta in counts:
+        by_delta[delta].append(post_id)
+    run_write(add_views, by_delta)
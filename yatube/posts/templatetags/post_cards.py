@@ -0,0 +1,132 @@
+from urllib.parse import quote
+
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils.http import RFC3986_SUBDELIMS
+from django.utils.safestring import mark_safe
+
+from core.cursors import encode_cursor
+from posts.versions import get_versions, group_info_scope, user_scope
+
+register = template.Library()
+
+CARD_TEMPLATE = 'posts/includes/post.html'
+# Символы, которые reverse() оставляет в адресе без кодирования.
+URL_SAFE = RFC3986_SUBDELIMS + '/~:@'
+
+
+class UrlPattern:
+    """Адрес view, вычисленный один раз; аргумент подставляется строкой."""
+
+    # Подходит и для int, и для str/slug конвертеров.
+    sentinel = '9876543210'
+
+    def __init__(self, view_name):
+        url = reverse(view_name, args=[self.sentinel])
+        self.prefix, self.suffix = url.split(self.sentinel)
+
+    def __call__(self, value):
+        return self.prefix + quote(str(value), safe=URL_SAFE) + self.suffix
+
+
+class CardRenderer:
+    """Рендерит карточки публикаций одним скомпилированным шаблоном.
+
+    Создаётся один раз на страницу: шаблон загружается и адреса
+    вычисляются до цикла по публикациям, а не в каждой карточке.
+    """
+
+    def __init__(self, engine):
+        self.template = engine.get_template(CARD_TEMPLATE)
+        self.profile_url = UrlPattern('posts:profile')
+        self.detail_url = UrlPattern('posts:post_detail')
+        self.group_url = UrlPattern('posts:group_list')
+
+    @classmethod
+    def for_context(cls, context):
+        renderer = context.render_context.get(cls)
+        if renderer is None:
+            renderer = context.render_context[cls] = cls(
+                context.template.engine
+            )
+        return renderer
+
+    def render(self, context, post, show_group=False):
+        group = post.group if show_group else None
+        with context.push(
+            post=post,
+            profile_url=self.profile_url(post.author.username),
+            detail_url=self.detail_url(post.pk),
+            group=group,
+            group_url=self.group_url(group.slug) if group else '',
+        ):
+            return self.template.render(context)
+
+
+def card_scopes(post, show_group):
+    """Области, данные которых выводятся в карточке, кроме самой публикации."""
+    scopes = [user_scope(post.author_id)]
+    if show_group and post.group_id:
+        scopes.append(group_info_scope(post.group_id))
+    return scopes
+
+
+def card_cache_keys(posts, show_group=False):
+    """Ключи карточек: время правки публикации и версии автора и сообщества.
+
+    Версии всех авторов и сообществ страницы читаются одним get_many.
+    """
+    variant = 'group' if show_group else 'plain'
+    scopes = list(dict.fromkeys(
+        scope for post in posts for scope in card_scopes(post, show_group)
+    ))
+    versions = dict(zip(scopes, get_versions(*scopes)))
+    return [
+        'post_card:{}:{}:{}:{}'.format(
+            post.pk,
+            post.updated.timestamp(),
+            variant,
+            ':'.join(
+                str(versions[scope])
+                for scope in card_scopes(post, show_group)
+            ),
+        )
+        for post in posts
+    ]
+
+
+@register.simple_tag(takes_context=True)
+def post_cards(context, posts, show_group=False):
+    """Список отрендеренных карточек страницы.
+
+    Готовые карточки читаются из кэша одним get_many; ключ включает
+    время изменения публикации и версии её автора и сообщества, поэтому
+    правка публикации или их переименование сразу дают новую карточку.
+    """
+    keys = card_cache_keys(posts, show_group)
+    cached = cache.get_many(keys)
+    rendered = {}
+    for key, post in zip(keys, posts):
+        if key not in cached:
+            rendered[key] = CardRenderer.for_context(context).render(
+                context, post, show_group
+            )
+    if rendered:
+        cache.set_many(rendered, settings.POST_CARD_CACHE_TIMEOUT)
+    cached.update(rendered)
+    return [mark_safe(cached[key]) for key in keys]
+
+
+@register.simple_tag
+def more_url(view_name, page_obj, date_field, *args):
+    """Адрес порции записей после последней записи страницы или ''.
+
+    Курсор строится по полю date_field и id последней записи.
+    """
+    if not page_obj.has_next():
+        return ''
+    last = page_obj[len(page_obj) - 1]
+    cursor = encode_cursor(getattr(last, date_field), last.pk)
+    return f'{reverse(view_name, args=args)}?cursor={cursor}'
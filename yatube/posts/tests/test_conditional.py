@@ -0,0 +1,156 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from posts.models import Comment, Group, Post
+from posts.tests.constants import (
+    GROUP_LIST_URL_NAME,
+    INDEX_URL_NAME,
+    POST_DETAIL_URL_NAME,
+    PROFILE_URL_NAME,
+)
+
+User = get_user_model()
+
+
+class ConditionalPageTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.author,
+            group=cls.group,
+            text='Тестовая публикация',
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def etag(self, url, client=None):
+        response = (client or self.client).get(url)
+        self.assertEqual(response.status_code, 200)
+        return response['ETag']
+
+    def test_not_modified(self):
+        """Неизменённая страница отдаётся 304 без рендера шаблона."""
+        urls = (
+            reverse(INDEX_URL_NAME),
+            reverse(GROUP_LIST_URL_NAME, args=[self.group.slug]),
+            reverse(PROFILE_URL_NAME, args=[self.author.username]),
+            reverse(POST_DETAIL_URL_NAME, args=[self.post.pk]),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                etag = self.etag(url)
+                with mock.patch('posts.views.render') as render:
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+                render.assert_not_called()
+
+    def test_last_modified(self):
+        """По If-Modified-Since без изменений тоже отдаётся 304."""
+        url = reverse(INDEX_URL_NAME)
+        response = self.client.get(url)
+        response = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_new_post_changes_etag(self):
+        """Новая публикация меняет ETag ленты, сообщества и профиля."""
+        urls = (
+            reverse(INDEX_URL_NAME),
+            reverse(GROUP_LIST_URL_NAME, args=[self.group.slug]),
+            reverse(PROFILE_URL_NAME, args=[self.author.username]),
+        )
+        etags = {url: self.etag(url) for url in urls}
+        Post.objects.create(
+            author=self.author, group=self.group, text='Новая публикация'
+        )
+        for url, etag in etags.items():
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+
+    def test_new_post_shown_on_index(self):
+        """После новой публикации лента отдаётся с ней, а не из кэша."""
+        url = reverse(INDEX_URL_NAME)
+        etag = self.etag(url)
+        Post.objects.create(author=self.author, text='Свежая публикация')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertContains(response, 'Свежая публикация')
+
+    def test_post_detail_depends_on_author_and_group(self):
+        """Страница публикации меняется с автором, группой, комментатором."""
+        url = reverse(POST_DETAIL_URL_NAME, args=[self.post.pk])
+
+        def add_post():
+            Post.objects.create(author=self.author, text='Ещё публикация')
+
+        def rename_author():
+            self.author.first_name = 'Новое имя'
+            self.author.save()
+
+        def rename_group():
+            self.group.title = 'Новое название'
+            self.group.save()
+
+        def rename_commenter():
+            self.reader.first_name = 'Новый комментатор'
+            self.reader.save()
+
+        Comment.objects.create(
+            post=self.post, author=self.reader, text='Комментарий'
+        )
+        changes = (
+            (add_post, 'Всего публикаций автора: <span>2</span>'),
+            (rename_author, 'Автор: Новое имя'),
+            (rename_group, 'Новое название'),
+            (rename_commenter, 'Новый комментатор'),
+        )
+        for change, text in changes:
+            with self.subTest(change=change.__name__):
+                etag = self.etag(url)
+                change()
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertContains(response, text)
+
+    def test_login_keeps_etag(self):
+        """Вход автора не меняет ETag страниц."""
+        url = reverse(POST_DETAIL_URL_NAME, args=[self.post.pk])
+        etag = self.etag(url)
+        self.author.save(update_fields=['last_login'])
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_new_comment_changes_etag(self):
+        """Новый комментарий меняет ETag страницы публикации."""
+        url = reverse(POST_DETAIL_URL_NAME, args=[self.post.pk])
+        etag = self.etag(url)
+        Comment.objects.create(
+            post=self.post, author=self.reader, text='Комментарий'
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_etag_depends_on_user_and_query(self):
+        """ETag различается для пользователей и номеров страниц."""
+        url = reverse(INDEX_URL_NAME)
+        reader = self.client_class()
+        reader.force_login(self.reader)
+        etags = {
+            self.etag(url),
+            self.etag(url, reader),
+            self.etag(url + '?page=2'),
+        }
+        self.assertEqual(len(etags), 3)
@@ -0,0 +1,112 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.models import Task
+from core.tasks import Worker
+from posts.counters import view_counter
+from posts.middleware import PAGE_CACHE_HEADER
+from posts.models import Post
+from posts.tests.constants import POST_DETAIL_URL_NAME
+
+User = get_user_model()
+
+
+class ViewCountersTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.posts = [
+            Post.objects.create(author=cls.author, text=f'Публикация {i}')
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        view_counter.pending.clear()
+
+    def views(self, post):
+        return Post.objects.get(pk=post.pk).views
+
+    @override_settings(VIEW_COUNTS_FLUSH_INTERVAL=0)
+    def test_every_kind_of_response_counted(self):
+        """Просмотр считается при рендере, из кэша страниц и при 304."""
+        url = reverse(POST_DETAIL_URL_NAME, args=[self.posts[0].pk])
+        response = self.client.get(url)
+        cached = self.client.get(url)
+        self.assertEqual(cached[PAGE_CACHE_HEADER], 'hit')
+        not_modified = self.client.get(
+            url, HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(not_modified.status_code, 304)
+        Worker().run(burst=True)
+        self.assertEqual(self.views(self.posts[0]), 3)
+        self.client.get(reverse(POST_DETAIL_URL_NAME, args=[0]))
+        self.assertEqual(view_counter.pending, {})
+
+    @override_settings(VIEW_COUNTS_FLUSH_INTERVAL=60 * 60)
+    def test_views_buffered(self):
+        """Просмотры пишутся в базу пачкой, по UPDATE на приращение."""
+        for post, views in zip(self.posts, (3, 1, 1)):
+            for _ in range(views):
+                self.client.get(
+                    reverse(POST_DETAIL_URL_NAME, args=[post.pk])
+                )
+        self.assertEqual(self.views(self.posts[0]), 0)
+        self.assertEqual(view_counter.flush(), 3)
+        self.assertEqual(self.views(self.posts[0]), 0)
+        self.assertEqual(Task.objects.count(), 1)
+        with CaptureQueriesContext(connection) as queries:
+            Worker().run(burst=True)
+        updates = [
+            query for query in queries
+            if query['sql'].startswith('UPDATE "posts_post"')
+        ]
+        self.assertEqual(len(updates), 2)
+        self.assertEqual(
+            [self.views(post) for post in self.posts], [3, 1, 1]
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(view_counter.flush(), 0)
+
+    def test_popular(self):
+        """Популярные публикации отсортированы по просмотрам."""
+        for views, post in zip((1, 5), self.posts):
+            view_counter.pending[post.pk] = views
+        view_counter.flush()
+        Worker().run(burst=True)
+        response = self.client.get(reverse('posts:popular'))
+        self.assertEqual(
+            list(response.context['page_obj']),
+            [self.posts[1], self.posts[0]],
+        )
+        response = self.client.get(reverse('posts:popular_rss'))
+        content = response.content.decode()
+        self.assertLess(
+            content.index(self.posts[1].text),
+            content.index(self.posts[0].text),
+        )
+        self.assertNotIn(self.posts[2].text, content)
+
+    def test_api_etag_follows_views(self):
+        """ETag API с полем views меняется после записи просмотров."""
+        url = reverse('api:v1:post_detail', args=[self.posts[0].pk])
+        etags = {
+            fields: self.client.get(url, {'fields': fields})['ETag']
+            for fields in ('id,views', 'id')
+        }
+        view_counter.pending[self.posts[0].pk] = 2
+        view_counter.flush()
+        Worker().run(burst=True)
+        with_views = self.client.get(
+            url, {'fields': 'id,views'}, HTTP_IF_NONE_MATCH=etags['id,views']
+        )
+        self.assertEqual(with_views.json()['views'], 2)
+        without_views = self.client.get(
+            url, {'fields': 'id'}, HTTP_IF_NONE_MATCH=etags['id']
+        )
+        self.assertEqual(without_views.status_code, 304)
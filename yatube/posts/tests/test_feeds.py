@@ -0,0 +1,82 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class FeedsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.author,
+            group=cls.group,
+            text='Тестовая публикация',
+        )
+        cls.urls = (
+            reverse('posts:index_rss'),
+            reverse('posts:index_atom'),
+            reverse('posts:group_rss', args=[cls.group.slug]),
+            reverse('posts:group_atom', args=[cls.group.slug]),
+            reverse('posts:profile_rss', args=[cls.author.username]),
+            reverse('posts:profile_atom', args=[cls.author.username]),
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_feeds(self):
+        """Ленты RSS и Atom содержат публикацию."""
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertIn('xml', response['Content-Type'])
+                self.assertContains(response, self.post.text)
+
+    def test_missing_objects(self):
+        """Лента несуществующего сообщества или автора - 404."""
+        urls = (
+            reverse('posts:group_rss', args=['missing']),
+            reverse('posts:profile_atom', args=['missing']),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_cached_until_versions_change(self):
+        """Пока публикации не менялись, лента не читает базу."""
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                with self.assertNumQueries(0):
+                    self.client.get(url)
+                with self.assertNumQueries(0):
+                    not_modified = self.client.get(
+                        url, HTTP_IF_NONE_MATCH=response['ETag']
+                    )
+                self.assertEqual(not_modified.status_code, 304)
+        Post.objects.create(
+            author=self.author, group=self.group, text='Новая публикация'
+        )
+        for url in self.urls:
+            with self.subTest(url=url):
+                self.assertContains(self.client.get(url), 'Новая публикация')
+
+    def test_feed_links(self):
+        """Страницы лент ссылаются на RSS и Atom."""
+        response = self.client.get(
+            reverse('posts:group_list', args=[self.group.slug])
+        )
+        self.assertContains(response, self.urls[2])
+        self.assertContains(response, self.urls[3])
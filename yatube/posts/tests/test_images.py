@@ -0,0 +1,138 @@
+import shutil
+import tempfile
+from io import BytesIO
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+from sorl.thumbnail import default
+from sorl.thumbnail.images import ImageFile
+
+from core.models import Task
+from core.tasks import Worker
+from posts.images import image_info
+from posts.models import Post
+from posts.tests.constants import (
+    INDEX_URL_NAME,
+    POST_CREATE_URL_NAME,
+    POST_DETAIL_URL_NAME,
+)
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+User = get_user_model()
+
+
+def make_image(size=(40, 20), color=(255, 0, 0)):
+    buffer = BytesIO()
+    Image.new('RGB', size, color).save(buffer, 'PNG')
+    return SimpleUploadedFile(
+        name='red.png', content=buffer.getvalue(), content_type='image/png'
+    )
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class PostImageInfoTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        self.post = Post.objects.create(
+            author=self.author, text='Картинка', image=make_image()
+        )
+
+    def test_info_computed_on_upload(self):
+        """При загрузке сохраняются размеры, цвет и заглушка."""
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertEqual((post.image_width, post.image_height), (40, 20))
+        self.assertEqual(post.image_color, '#ff0000')
+        self.assertTrue(
+            post.image_placeholder.startswith('data:image/jpeg;base64,')
+        )
+        with post.image.open('rb') as file:
+            self.assertEqual(Image.open(file).size, (40, 20))
+
+    def test_image_replaced_and_cleared(self):
+        """Замена и удаление изображения обновляют сведения о нём."""
+        self.post.image = make_image(size=(10, 30), color=(0, 0, 255))
+        self.post.save()
+        self.assertEqual((self.post.image_width, self.post.image_height),
+                         (10, 30))
+        self.assertEqual(self.post.image_color, '#0000ff')
+        self.post.image = None
+        self.post.save()
+        self.assertIsNone(self.post.image_width)
+        self.assertEqual(self.post.image_placeholder, '')
+
+    def test_image_prepared_before_write(self):
+        """Картинка разбирается и сохраняется до транзакции записи."""
+        states = []
+
+        def run_write(func, *args, **kwargs):
+            post = func.__self__
+            states.append((post.image._committed, post.image_width))
+            return func(*args, **kwargs)
+
+        self.client.force_login(self.author)
+        with mock.patch(
+            'posts.views.run_write', side_effect=run_write
+        ), mock.patch(
+            'posts.models.image_info', wraps=image_info
+        ) as info:
+            self.client.post(
+                reverse(POST_CREATE_URL_NAME),
+                {'text': 'Новая публикация', 'image': make_image()},
+            )
+        self.assertEqual(states, [(True, 40)])
+        info.assert_called_once()
+
+    def test_missing_file(self):
+        """Отсутствующий или битый файл не мешает сохранению."""
+        post = Post.objects.create(
+            author=self.author, text='Без файла', image='posts/missing.png'
+        )
+        self.assertIsNone(post.image_width)
+        post = Post.objects.create(
+            author=self.author,
+            text='Битый файл',
+            image=SimpleUploadedFile('broken.png', b'not an image'),
+        )
+        self.assertEqual(post.image_color, '')
+
+    def test_rendered_with_placeholder(self):
+        """В ленте картинка с размерами, заглушкой и ленивой загрузкой."""
+        content = self.client.get(reverse(INDEX_URL_NAME)).content.decode()
+        self.assertIn('width="960" height="339"', content)
+        self.assertIn('loading="lazy"', content)
+        self.assertIn(self.post.image_placeholder, content)
+        content = self.client.get(
+            reverse(POST_DETAIL_URL_NAME, args=[self.post.pk])
+        ).content.decode()
+        self.assertIn('background: #ff0000', content)
+        self.assertNotIn('loading="lazy"', content)
+
+    def test_thumbnails_made_in_background(self):
+        """Миниатюры новой картинки готовит фоновая задача."""
+        task = Task.objects.get(name='posts.tasks.make_thumbnails')
+        self.assertIsNone(default.kvstore.get(ImageFile(self.post.image)))
+        Worker().run(burst=True)
+        self.assertFalse(Task.objects.filter(pk=task.pk).exists())
+        self.assertIsNotNone(
+            default.kvstore.get(ImageFile(self.post.image))
+        )
+        self.post.text = 'Без новой картинки'
+        self.post.save()
+        self.assertFalse(Task.objects.exists())
@@ -0,0 +1,144 @@
+import json
+import threading
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from posts.live import Channel, slots
+from posts.models import Comment, Post
+from posts.tests.constants import POST_DETAIL_URL_NAME
+
+User = get_user_model()
+
+
+def events(response):
+    """Разбирает поток server-sent events на события с данными."""
+    content = b''.join(response.streaming_content).decode()
+    result = []
+    for block in content.split('\n\n'):
+        fields = dict(
+            line.split(': ', 1) for line in block.splitlines()
+            if not line.startswith(':')
+        )
+        if 'data' in fields:
+            result.append((int(fields['id']), json.loads(fields['data'])))
+    return content, result
+
+
+@override_settings(LIVE_COMMENTS_DURATION=0)
+class LiveCommentsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.post = Post.objects.create(
+            author=cls.author, text='Тестовая публикация'
+        )
+        cls.comments = [
+            Comment.objects.create(
+                post=cls.post, author=cls.author, text=f'Комментарий {i}'
+            )
+            for i in range(3)
+        ]
+        cls.url = reverse('posts:comments_live', args=[cls.post.pk])
+
+    def setUp(self):
+        cache.clear()
+
+    def test_new_comments(self):
+        """Поток отдаёт комментарии после last_event_id по порядку."""
+        response = self.client.get(
+            self.url, {'last_event_id': self.comments[0].pk}
+        )
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        content, result = events(response)
+        self.assertTrue(content.startswith('retry: '))
+        self.assertEqual(
+            [pk for pk, _ in result],
+            [comment.pk for comment in self.comments[1:]],
+        )
+        self.assertEqual(result[0][1]['text'], 'Комментарий 1')
+        self.assertIn('Комментарий 1', result[0][1]['html'])
+
+    def test_last_event_id_header(self):
+        """При переподключении id берётся из Last-Event-ID."""
+        response = self.client.get(
+            self.url,
+            {'last_event_id': 0},
+            HTTP_LAST_EVENT_ID=str(self.comments[1].pk),
+        )
+        _, result = events(response)
+        self.assertEqual([pk for pk, _ in result], [self.comments[2].pk])
+
+    @override_settings(
+        LIVE_COMMENTS_DURATION=0.05,
+        LIVE_COMMENTS_HEARTBEAT=0,
+        LIVE_COMMENTS_POLL=0.01,
+    )
+    def test_heartbeat(self):
+        """Без новых комментариев поток шлёт пульс."""
+        response = self.client.get(
+            self.url, HTTP_LAST_EVENT_ID=str(self.comments[2].pk)
+        )
+        content, result = events(response)
+        self.assertEqual(result, [])
+        self.assertIn(': heartbeat', content)
+
+    def test_errors(self):
+        """Несуществующая публикация - 404, некорректный id - 400."""
+        urls_statuses = {
+            reverse('posts:comments_live', args=[0]): 404,
+            self.url + '?last_event_id=broken': 400,
+        }
+        for url, status in urls_statuses.items():
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, status)
+
+    @override_settings(LIVE_COMMENTS_MAX_STREAMS=1)
+    def test_streams_limit(self):
+        """Сверх LIVE_COMMENTS_MAX_STREAMS отдаётся только пауза."""
+        first = self.client.get(self.url)
+        busy = self.client.get(self.url)
+        self.assertEqual(busy.status_code, 200)
+        self.assertFalse(busy.streaming)
+        self.assertEqual(
+            busy.content.decode(),
+            f'retry: {settings.LIVE_COMMENTS_BUSY_RETRY}\n\n',
+        )
+        events(first)
+        self.assertEqual(slots.count, 0)
+        self.assertTrue(events(self.client.get(self.url))[0])
+
+    def test_unread_stream_releases_slot(self):
+        """Место освобождается и у закрытого непрочитанного потока."""
+        self.client.get(self.url).close()
+        self.assertEqual(slots.count, 0)
+
+    def test_post_detail_subscribes(self):
+        """Страница публикации подписывается на поток комментариев."""
+        response = self.client.get(
+            reverse(POST_DETAIL_URL_NAME, args=[self.post.pk])
+        )
+        self.assertContains(
+            response,
+            f'data-live="{self.url}?last_event_id={self.comments[-1].pk}"',
+        )
+
+
+class ChannelTests(SimpleTestCase):
+    def test_publish_wakes_waiting(self):
+        """Публикация будит ожидающий поток до истечения таймаута."""
+        channel = Channel()
+        seen = channel.counter
+        timer = threading.Timer(0.01, channel.publish)
+        timer.start()
+        self.assertEqual(channel.wait(seen, 5), seen + 1)
+        timer.join()
+
+    def test_wait_timeout(self):
+        """Без публикаций ожидание заканчивается по таймауту."""
+        channel = Channel()
+        self.assertEqual(channel.wait(channel.counter, 0.01), 0)
@@ -61,9 +61,14 @@ class PostModelTest(TestCase):
         field_verboses = {
             'text': 'Текст',
             'pub_date': 'Дата',
+            'updated': 'Изменено',
             'author': 'Автор',
             'group': 'Сообщество',
             'image': 'Изображение',
+            'image_width': 'Ширина изображения',
+            'image_height': 'Высота изображения',
+            'image_color': 'Основной цвет изображения',
+            'image_placeholder': 'Заглушка изображения',
         }
         self._check_field_attr(field_verboses, post, 'verbose_name')
 
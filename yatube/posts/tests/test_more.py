@@ -0,0 +1,115 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Comment, Follow, Group, Post
+from posts.tests.constants import (
+    FOLLOW_URL_NAME,
+    GROUP_LIST_URL_NAME,
+    INDEX_URL_NAME,
+    POST_DETAIL_URL_NAME,
+    PROFILE_URL_NAME,
+)
+
+User = get_user_model()
+
+DATA_MORE = re.compile(r'data-more="([^"]*)"')
+
+
+@override_settings(POSTS_PER_PAGE=2)
+class MoreFragmentsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        for number in range(5):
+            Post.objects.create(
+                author=cls.author,
+                group=cls.group,
+                text=f'Публикация номер {number}',
+            )
+        cls.post = Post.objects.first()
+        for number in range(3):
+            Comment.objects.create(
+                post=cls.post,
+                author=cls.reader,
+                text=f'Комментарий номер {number}',
+            )
+        Follow.objects.create(user=cls.reader, author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.reader)
+
+    def scroll(self, url):
+        """Страница и все порции, подгруженные по data-more."""
+        response = self.client.get(url)
+        contents = [response.content.decode()]
+        more_url = DATA_MORE.search(contents[0]).group(1)
+        while more_url:
+            response = self.client.get(more_url.replace('&amp;', '&'))
+            self.assertEqual(response.status_code, 200)
+            content = response.content.decode()
+            self.assertNotIn('<html', content)
+            self.assertNotIn('pagination', content)
+            contents.append(content)
+            more_url = response['X-Next-Page']
+        return ''.join(contents)
+
+    def test_feeds_scroll_to_end(self):
+        """Прокрутка ленты показывает каждую публикацию один раз."""
+        urls = (
+            reverse(INDEX_URL_NAME),
+            reverse(GROUP_LIST_URL_NAME, args=[self.group.slug]),
+            reverse(PROFILE_URL_NAME, args=[self.author.username]),
+            reverse(FOLLOW_URL_NAME),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                content = self.scroll(url)
+                for number in range(5):
+                    self.assertEqual(
+                        content.count(f'Публикация номер {number}'), 1
+                    )
+
+    def test_same_date_scroll_to_end(self):
+        """Публикации с одинаковой датой не повторяются и не теряются."""
+        Post.objects.update(pub_date=self.post.pub_date)
+        content = self.scroll(reverse(INDEX_URL_NAME))
+        for number in range(5):
+            self.assertEqual(content.count(f'Публикация номер {number}'), 1)
+
+    def test_comments_scroll_to_end(self):
+        """Прокрутка комментариев показывает каждый один раз."""
+        content = self.scroll(
+            reverse(POST_DETAIL_URL_NAME, args=[self.post.pk])
+        )
+        for number in range(3):
+            self.assertEqual(content.count(f'Комментарий номер {number}'), 1)
+
+    def test_last_page_has_no_more(self):
+        """На последней странице нет адреса следующей порции."""
+        response = self.client.get(reverse(INDEX_URL_NAME), {'page': 3})
+        self.assertContains(response, 'data-more=""')
+
+    def test_bad_cursor(self):
+        """Некорректный курсор - 400."""
+        response = self.client.get(
+            reverse('posts:index_more'), {'cursor': 'broken'}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_follow_more_requires_login(self):
+        """Порция ленты подписок только для авторизованных."""
+        self.client.logout()
+        response = self.client.get(reverse('posts:follow_more'))
+        self.assertEqual(response.status_code, 302)
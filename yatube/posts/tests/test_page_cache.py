@@ -0,0 +1,126 @@
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from posts.middleware import PAGE_CACHE_HEADER
+from posts.models import Comment, Group, Post
+from posts.tests.constants import (
+    FOLLOW_URL_NAME,
+    GROUP_LIST_URL_NAME,
+    INDEX_URL_NAME,
+    POST_DETAIL_URL_NAME,
+    PROFILE_URL_NAME,
+)
+
+User = get_user_model()
+
+
+class AnonymousPageCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.author,
+            group=cls.group,
+            text='Тестовая публикация',
+        )
+        cls.urls = (
+            reverse(INDEX_URL_NAME),
+            reverse(GROUP_LIST_URL_NAME, args=[cls.group.slug]),
+            reverse(PROFILE_URL_NAME, args=[cls.author.username]),
+            reverse(POST_DETAIL_URL_NAME, args=[cls.post.pk]),
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_anonymous_pages_cached(self):
+        """Повторная страница отдаётся из кэша без вызова view."""
+        for url in self.urls:
+            with self.subTest(url=url):
+                first = self.client.get(url)
+                self.assertNotIn(PAGE_CACHE_HEADER, first)
+                with mock.patch('posts.views.render') as render:
+                    second = self.client.get(url)
+                render.assert_not_called()
+                self.assertEqual(second[PAGE_CACHE_HEADER], 'hit')
+                self.assertEqual(second.content, first.content)
+
+    def test_query_string_in_key(self):
+        """Разные страницы ленты кэшируются отдельно."""
+        url = reverse(INDEX_URL_NAME)
+        self.client.get(url)
+        response = self.client.get(url + '?page=2')
+        self.assertNotIn(PAGE_CACHE_HEADER, response)
+
+    def test_cached_page_not_modified(self):
+        """Из кэша по совпавшему ETag отдаётся 304."""
+        url = reverse(INDEX_URL_NAME)
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_new_content_invalidates(self):
+        """Новые публикации и комментарии сбрасывают кэш страниц."""
+        for url in self.urls:
+            self.client.get(url)
+        Post.objects.create(
+            author=self.author, group=self.group, text='Новая публикация'
+        )
+        Comment.objects.create(
+            post=self.post, author=self.author, text='Новый комментарий'
+        )
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertNotIn(PAGE_CACHE_HEADER, response)
+
+    def test_changes_shown_from_cache(self):
+        """Страницы в кэше под новой версией уже содержат изменения."""
+        detail_url = reverse(POST_DETAIL_URL_NAME, args=[self.post.pk])
+        for url in self.urls:
+            self.client.get(url)
+        Post.objects.create(author=self.author, text='Свежая публикация')
+        self.group.title = 'Новое название'
+        self.group.save()
+        for url in (reverse(INDEX_URL_NAME), detail_url):
+            self.client.get(url)
+        self.assertContains(
+            self.client.get(reverse(INDEX_URL_NAME)), 'Свежая публикация'
+        )
+        response = self.client.get(detail_url)
+        self.assertEqual(response[PAGE_CACHE_HEADER], 'hit')
+        self.assertContains(response, 'Новое название')
+        self.assertContains(response, 'Всего публикаций автора: <span>2')
+
+    def test_cookies_bypass_cache(self):
+        """Запросы с cookie сессии или CSRF не берутся из кэша."""
+        url = reverse(INDEX_URL_NAME)
+        self.client.get(url)
+        for name in (settings.SESSION_COOKIE_NAME, settings.CSRF_COOKIE_NAME):
+            with self.subTest(cookie=name):
+                client = self.client_class()
+                client.cookies[name] = 'value'
+                self.assertNotIn(PAGE_CACHE_HEADER, client.get(url))
+
+    def test_authorized_pages_not_stored(self):
+        """Страницы авторизованных пользователей не попадают в кэш."""
+        client = self.client_class()
+        client.force_login(self.author)
+        for url in self.urls + (reverse(FOLLOW_URL_NAME),):
+            with self.subTest(url=url):
+                client.get(url)
+                self.assertNotIn(PAGE_CACHE_HEADER, client.get(url))
+        response = self.client.get(reverse(INDEX_URL_NAME))
+        self.assertNotIn(PAGE_CACHE_HEADER, response)
+        self.assertNotContains(response, 'Выйти')
@@ -0,0 +1,132 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post
+from posts.templatetags import post_cards
+from posts.tests.constants import (
+    GROUP_LIST_URL_NAME,
+    INDEX_URL_NAME,
+    POST_DETAIL_URL_NAME,
+    PROFILE_URL_NAME,
+)
+
+User = get_user_model()
+
+
+class PostCardTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author.name+1@x')
+        cls.group = Group.objects.create(
+            title='Тестовая группа карточек',
+            slug='test-slug-cards',
+            description='Тестовое описание карточек',
+        )
+        Post.objects.bulk_create(
+            Post(author=cls.author, group=cls.group, text=f'Карточка {i}')
+            for i in range(5)
+        )
+        cls.post = Post.objects.first()
+
+    def setUp(self):
+        cache.clear()
+
+    def test_card_links(self):
+        """Ссылки карточки совпадают с результатом reverse()."""
+        urls = (
+            reverse(PROFILE_URL_NAME, args=[self.author.username]),
+            reverse(POST_DETAIL_URL_NAME, args=[self.post.pk]),
+            reverse(GROUP_LIST_URL_NAME, args=[self.group.slug]),
+        )
+        content = self.client.get(reverse(INDEX_URL_NAME)).content.decode()
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertIn(f'href="{url}"', content)
+
+    def test_group_link_only_outside_group(self):
+        """Ссылка на сообщество не выводится на странице сообщества."""
+        group_url = reverse(GROUP_LIST_URL_NAME, args=[self.group.slug])
+        response = self.client.get(group_url)
+        self.assertNotContains(response, f'href="{group_url}"')
+        response = self.client.get(reverse(INDEX_URL_NAME))
+        self.assertContains(response, f'href="{group_url}"', count=5)
+
+    def test_urls_resolved_once_per_page(self):
+        """Адреса карточек вычисляются один раз на страницу."""
+        with mock.patch.object(
+            post_cards, 'reverse', wraps=post_cards.reverse
+        ) as card_reverse:
+            self.client.get(reverse(INDEX_URL_NAME))
+        self.assertEqual(card_reverse.call_count, 3)
+
+    def test_cards_cached(self):
+        """Повторная страница собирается из кэша одним get_many."""
+        self.client.force_login(self.author)
+        url = reverse(GROUP_LIST_URL_NAME, args=[self.group.slug])
+        self.client.get(url)
+        with mock.patch.object(
+            post_cards.CardRenderer, 'render'
+        ) as render, mock.patch.object(
+            post_cards.cache, 'get_many', wraps=post_cards.cache.get_many
+        ) as get_many:
+            response = self.client.get(url)
+        render.assert_not_called()
+        card_lookups = [
+            call for call in get_many.call_args_list
+            if any(key.startswith('post_card:') for key in call.args[0])
+        ]
+        self.assertEqual(len(card_lookups), 1)
+        self.assertContains(response, self.post.text)
+
+    def test_edited_post_rerendered(self):
+        """Правка публикации меняет ключ её карточки."""
+        url = reverse(GROUP_LIST_URL_NAME, args=[self.group.slug])
+        self.client.get(url)
+        self.post.text = 'Отредактированная карточка'
+        self.post.save()
+        with mock.patch.object(
+            post_cards.CardRenderer, 'render',
+            side_effect=post_cards.CardRenderer.render, autospec=True,
+        ) as render:
+            response = self.client.get(url)
+        self.assertEqual(render.call_count, 1)
+        self.assertContains(response, 'Отредактированная карточка')
+
+    def test_renamed_author_and_group_rerendered(self):
+        """Новое имя автора и название сообщества попадают в карточки."""
+        self.client.force_login(self.author)
+        url = reverse(PROFILE_URL_NAME, args=[self.author.username])
+        self.client.get(url)
+        self.author.first_name = 'Переименованный'
+        self.author.save()
+        self.group.title = 'Новое название'
+        self.group.save()
+        response = self.client.get(url)
+        self.assertContains(response, 'Автор: Переименованный', count=5)
+        self.assertContains(
+            response, 'все публикации сообщества Новое название', count=5
+        )
+
+    def test_login_keeps_cards(self):
+        """Вход автора не сбрасывает его карточки."""
+        url = reverse(GROUP_LIST_URL_NAME, args=[self.group.slug])
+        self.client.get(url)
+        self.author.save(update_fields=['last_login'])
+        with mock.patch.object(post_cards.CardRenderer, 'render') as render:
+            self.client.get(url)
+        render.assert_not_called()
+
+    def test_feed_benchmark(self):
+        """Бенчмарк выводит время всех вариантов ленты."""
+        out = StringIO()
+        call_command('feed_benchmark', posts=2, repeat=1, stdout=out)
+        self.assertIn('include:', out.getvalue())
+        self.assertIn('render:', out.getvalue())
+        self.assertIn('cached:', out.getvalue())
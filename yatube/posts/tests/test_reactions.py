@@ -0,0 +1,126 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post, Reaction, ReactionCounter
+from posts.reactions import reaction_counts, set_reaction
+from posts.tests.constants import POST_DETAIL_URL_NAME
+
+User = get_user_model()
+
+
+class ReactionsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.post = Post.objects.create(author=cls.author, text='Публикация')
+        cls.url = reverse('posts:react', args=[cls.post.pk])
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.reader)
+
+    def test_set_change_and_remove(self):
+        """Реакцию ставят, меняют и снимают; повтор ничего не меняет."""
+        steps = (
+            (Reaction.LIKE, {Reaction.LIKE: 1}),
+            (Reaction.LIKE, {Reaction.LIKE: 1}),
+            (Reaction.LOVE, {Reaction.LIKE: 0, Reaction.LOVE: 1}),
+            ('', {Reaction.LIKE: 0, Reaction.LOVE: 0}),
+            ('', {Reaction.LIKE: 0, Reaction.LOVE: 0}),
+        )
+        for kind, expected in steps:
+            with self.subTest(kind=kind):
+                response = self.client.post(self.url, {'kind': kind})
+                self.assertRedirects(
+                    response,
+                    reverse(POST_DETAIL_URL_NAME, args=[self.post.pk]),
+                )
+                self.assertEqual(reaction_counts(self.post.pk), expected)
+        self.assertFalse(Reaction.objects.exists())
+
+    def test_unknown_kind_ignored(self):
+        """Неизвестная реакция не сохраняется."""
+        self.client.post(self.url, {'kind': 'angry'})
+        self.assertFalse(Reaction.objects.exists())
+
+    def test_one_reaction_per_user(self):
+        """У пользователя одна реакция на публикацию."""
+        Reaction.objects.create(
+            user=self.reader, post=self.post, kind=Reaction.LIKE
+        )
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Reaction.objects.create(
+                user=self.reader, post=self.post, kind=Reaction.SAD
+            )
+
+    @override_settings(REACTION_SHARDS=4)
+    def test_sharded_counter(self):
+        """Счётчик разнесён по шардам, сумма равна числу реакций."""
+        for number in range(20):
+            user = User.objects.create_user(username=f'user{number}')
+            set_reaction(user, self.post.pk, Reaction.LIKE)
+        shards = ReactionCounter.objects.filter(
+            post=self.post, kind=Reaction.LIKE
+        )
+        self.assertLessEqual(shards.count(), 4)
+        self.assertGreater(shards.count(), 1)
+        self.assertEqual(reaction_counts(self.post.pk), {Reaction.LIKE: 20})
+
+    def test_user_deleted(self):
+        """Реакции удалённого пользователя вычитаются из счётчика."""
+        user = User.objects.create_user(username='leaving')
+        set_reaction(user, self.post.pk, Reaction.LIKE)
+        set_reaction(self.reader, self.post.pk, Reaction.LIKE)
+        self.assertEqual(reaction_counts(self.post.pk), {Reaction.LIKE: 2})
+        user.delete()
+        self.assertEqual(reaction_counts(self.post.pk), {Reaction.LIKE: 1})
+        cache.clear()
+        self.assertEqual(reaction_counts(self.post.pk), {Reaction.LIKE: 1})
+
+    def test_post_deleted(self):
+        """Публикация с реакциями удаляется вместе со счётчиками."""
+        post = Post.objects.create(author=self.author, text='Удаляемая')
+        set_reaction(self.reader, post.pk, Reaction.LIKE)
+        post.delete()
+        self.assertFalse(
+            ReactionCounter.objects.filter(post_id=post.pk).exists()
+        )
+
+    def test_counts_cached(self):
+        """Сумма шардов читается из кэша до изменения реакций."""
+        set_reaction(self.reader, self.post.pk, Reaction.LIKE)
+        reaction_counts(self.post.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                reaction_counts(self.post.pk), {Reaction.LIKE: 1}
+            )
+        set_reaction(self.author, self.post.pk, Reaction.LIKE)
+        self.assertEqual(reaction_counts(self.post.pk), {Reaction.LIKE: 2})
+
+    def test_post_detail(self):
+        """Страница показывает реакции и отмечает реакцию пользователя."""
+        set_reaction(self.reader, self.post.pk, Reaction.LAUGH)
+        detail = reverse(POST_DETAIL_URL_NAME, args=[self.post.pk])
+        response = self.client.get(detail)
+        self.assertEqual(response.context['my_reaction'], Reaction.LAUGH)
+        self.assertIn(
+            (Reaction.LAUGH, '😂', 1), response.context['reactions']
+        )
+        self.assertContains(response, self.url)
+        self.client.logout()
+        response = self.client.get(detail)
+        self.assertNotContains(response, self.url)
+        self.assertContains(response, '😂 1')
+
+    def test_login_and_post_required(self):
+        """Реакции только для авторизованных и только методом POST."""
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+        self.client.logout()
+        response = self.client.post(self.url, {'kind': Reaction.LIKE})
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(Reaction.objects.exists())
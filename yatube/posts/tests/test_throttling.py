@@ -0,0 +1,73 @@
+from http import HTTPStatus
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Follow, Post
+from posts.tests.constants import (
+    ADD_COMMENT_URL_NAME,
+    PROFILE_FOLLOW_URL_NAME,
+    PROFILE_UNFOLLOW_URL_NAME,
+)
+
+User = get_user_model()
+
+
+class WriteRateLimitTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='user')
+        cls.author = User.objects.create_user(username='author')
+        cls.post = Post.objects.create(
+            author=cls.author,
+            text='Женское окончание иллюстрирует конкретный палимпсест.',
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.user_client = Client()
+        self.user_client.force_login(self.user)
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_follow_toggling_limited(self):
+        """Частые подписки и отписки получают 429 и не меняют базу."""
+        limit = settings.WRITE_RATE_LIMITS['follow']['limit']
+        kwargs = {'username': self.author.username}
+        for number in range(limit):
+            name = (PROFILE_FOLLOW_URL_NAME, PROFILE_UNFOLLOW_URL_NAME)[
+                number % 2
+            ]
+            response = self.user_client.get(reverse(name, kwargs=kwargs))
+            self.assertEqual(response.status_code, HTTPStatus.FOUND)
+        following = Follow.objects.filter(
+            user=self.user, author=self.author
+        ).exists()
+        response = self.user_client.get(
+            reverse(PROFILE_FOLLOW_URL_NAME, kwargs=kwargs)
+        )
+        self.assertEqual(response.status_code, HTTPStatus.TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+        self.assertEqual(
+            Follow.objects.filter(user=self.user, author=self.author).exists(),
+            following,
+        )
+
+    def test_comments_limited_per_user(self):
+        """Лимит комментариев считается отдельно для каждого пользователя."""
+        limit = settings.WRITE_RATE_LIMITS['add_comment']['limit']
+        url = reverse(ADD_COMMENT_URL_NAME, kwargs={'post_id': self.post.id})
+        for _ in range(limit):
+            self.user_client.post(url, {'text': 'Комментарий'})
+        response = self.user_client.post(url, {'text': 'Лишний'})
+        self.assertEqual(response.status_code, HTTPStatus.TOO_MANY_REQUESTS)
+        self.assertEqual(self.post.comments.count(), limit)
+        author_client = Client()
+        author_client.force_login(self.author)
+        response = author_client.post(url, {'text': 'Ответ автора'})
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
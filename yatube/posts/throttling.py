@@ -0,0 +1,19 @@
+from django.conf import settings
+
+from core.ratelimit import SlidingWindow, throttle
+
+
+def user_keys(request):
+    return [f'user:{request.user.pk}']
+
+
+def write_limiter(name):
+    return SlidingWindow(name, **settings.WRITE_RATE_LIMITS[name])
+
+
+throttle_posts = throttle(write_limiter('post_create'), user_keys)
+throttle_comments = throttle(write_limiter('add_comment'), user_keys)
+# Подписка и отписка выполняются по GET и расходуют общий лимит.
+throttle_follows = throttle(
+    write_limiter('follow'), user_keys, methods=('GET', 'POST')
+)
@@ -1,6 +1,6 @@
 from django.urls import path
 
-from . import views
+from . import feeds, views
 
 app_name = 'posts'
 
@@ -16,19 +16,54 @@ urlpatterns = [
         name='profile_unfollow'
     ),
     path('profile/<str:username>/', views.profile, name='profile'),
+    path(
+        'profile/<str:username>/more/',
+        views.profile_more,
+        name='profile_more'
+    ),
+    path('profile/<str:username>/rss/', feeds.author_rss, name='profile_rss'),
+    path(
+        'profile/<str:username>/atom/',
+        feeds.author_atom,
+        name='profile_atom'
+    ),
     path('group/<slug:slug>/', views.group_posts, name='group_list'),
+    path('group/<slug:slug>/more/', views.group_more, name='group_more'),
+    path('group/<slug:slug>/rss/', feeds.group_rss, name='group_rss'),
+    path('group/<slug:slug>/atom/', feeds.group_atom, name='group_atom'),
     path(
         'posts/<int:post_id>/comment/',
         views.add_comment,
         name='add_comment'
     ),
+    path(
+        'posts/<int:post_id>/react/',
+        views.react,
+        name='react'
+    ),
     path(
         'posts/<int:post_id>/edit/',
         views.post_edit,
         name='post_edit'
     ),
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
+    path(
+        'posts/<int:post_id>/comments/more/',
+        views.comments_more,
+        name='comments_more'
+    ),
+    path(
+        'posts/<int:post_id>/comments/live/',
+        views.comments_live,
+        name='comments_live'
+    ),
     path('create/', views.post_create, name='post_create'),
     path('follow/', views.follow_index, name='follow_index'),
+    path('follow/more/', views.follow_more, name='follow_more'),
+    path('popular/', views.popular, name='popular'),
+    path('popular/rss/', feeds.popular_rss, name='popular_rss'),
+    path('more/', views.index_more, name='index_more'),
+    path('rss/', feeds.index_rss, name='index_rss'),
+    path('atom/', feeds.index_atom, name='index_atom'),
     path('', views.index, name='index'),
 ]
@@ -1,7 +1,77 @@
+import hashlib
+from datetime import datetime, timezone
+from functools import wraps
+
 from django.conf import settings
 from django.core.paginator import Paginator
+from django.views.decorators.http import condition
+
+from .versions import get_versions
 
 
 def paginate(posts, page_number):
     paginator = Paginator(posts, settings.POSTS_PER_PAGE)
     return paginator.get_page(page_number)
+
+
+def newest(queryset, field='pub_date'):
+    """Дата самой новой записи queryset или None."""
+    return queryset.order_by(f'-{field}').values_list(field, flat=True).first()
+
+
+def page_versions(request, get_scopes, kwargs):
+    """Версии областей страницы, посчитанные один раз на запрос."""
+    if not hasattr(request, '_page_versions'):
+        request._page_versions = get_versions(*get_scopes(request, **kwargs))
+    return request._page_versions
+
+
+def conditional_page(get_scopes, get_newest=None, cache_anonymous=False):
+    """Отвечает 304 Not Modified, если страница не менялась.
+
+    get_scopes(request, **kwargs) возвращает области страницы, их версии
+    вместе с пользователем и строкой запроса дают ETag. Last-Modified -
+    самая поздняя из версий и даты get_newest(request, **kwargs).
+    Проверка выполняется до основного запроса и рендера шаблона.
+    С cache_anonymous страница кэшируется для анонимных посетителей
+    в AnonymousPageCacheMiddleware.
+
+    Ответы с ошибками (401, 404, 400) уходят без ETag и Last-Modified:
+    иначе повторный запрос с ними получил бы 304 вместо ошибки.
+    """
+    def etag(request, *args, **kwargs):
+        user = request.user.pk if request.user.is_authenticated else 0
+        source = '{}|{}|{}'.format(
+            page_versions(request, get_scopes, kwargs),
+            user,
+            request.GET.urlencode(),
+        )
+        return hashlib.md5(source.encode()).hexdigest()
+
+    def last_modified(request, *args, **kwargs):
+        modified = datetime.fromtimestamp(
+            max(page_versions(request, get_scopes, kwargs)) / 1000,
+            timezone.utc,
+        )
+        newest = get_newest(request, **kwargs) if get_newest else None
+        return max(modified, newest) if newest else modified
+
+    def decorator(view):
+        conditional = condition(
+            etag_func=etag, last_modified_func=last_modified
+        )(view)
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            response = conditional(request, *args, **kwargs)
+            if response.status_code not in (200, 304):
+                for header in ('ETag', 'Last-Modified'):
+                    if response.has_header(header):
+                        del response[header]
+            return response
+
+        if cache_anonymous:
+            wrapper.page_cache_scopes = get_scopes
+        return wrapper
+
+    return decorator
@@ -0,0 +1,85 @@
+"""Версии областей кэша: ленты, сообщества, профиля, публикации.
+
+Версия - время последнего изменения области в миллисекундах. Если версии
+нет в кэше, она создаётся равной текущему времени, поэтому после очистки
+кэша версии не повторяют уже выданные клиентам значения. Версии видны
+всем процессам сервера, только если кэш у них общий (core.checks).
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+def version_key(scope):
+    return f'version:{scope}'
+
+
+def now_ms():
+    return int(time.time() * 1000)
+
+
+def get_versions(*scopes):
+    """Возвращает версии областей в порядке scopes."""
+    keys = [version_key(scope) for scope in scopes]
+    versions = cache.get_many(keys)
+    missing = {key: now_ms() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def _bump(scopes):
+    keys = [version_key(scope) for scope in scopes]
+    current = cache.get_many(keys)
+    now = now_ms()
+    cache.set_many(
+        {key: max(now, current.get(key, 0) + 1) for key in keys},
+        timeout=None,
+    )
+
+
+def bump(*scopes):
+    """Меняет версии областей.
+
+    Версии меняются сразу, чтобы клиенты не получили 304 на старые
+    данные, и ещё раз после фиксации транзакции, чтобы страница,
+    прочитанная до фиксации, не осталась в кэше под новой версией.
+    """
+    _bump(scopes)
+    transaction.on_commit(lambda: _bump(scopes))
+
+
+def index_scope():
+    return 'index'
+
+
+def group_scope(slug):
+    return f'group:{slug}'
+
+
+def profile_scope(username):
+    return f'profile:{username}'
+
+
+def user_scope(user_id):
+    """Имя пользователя, которое выводится рядом с его записями."""
+    return f'user:{user_id}'
+
+
+def group_info_scope(group_id):
+    """Название и адрес сообщества без его ленты."""
+    return f'group_info:{group_id}'
+
+
+def post_scope(post_id):
+    return f'post:{post_id}'
+
+
+def popular_scope():
+    return 'popular'
+
+
+def follow_scope(user_id):
+    return f'follow:{user_id}'
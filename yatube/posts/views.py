@@ -1,14 +1,34 @@
 from django.contrib.auth import get_user_model
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
+from django.http import (Http404, HttpResponse, HttpResponseBadRequest,
+                         StreamingHttpResponse)
 from django.shortcuts import get_object_or_404, redirect, render
+from django.views.decorators.http import require_POST, require_safe
 
-from .forms import CommentForm, PostForm
-from .models import Follow, Group, Post
-from .utils import paginate
+from core.cursors import InvalidCursor, cursor_page
+from core.db import run_write
+from core.routers import use_replicas
+
+from .counters import count_views
+from .forms import CommentForm, PostForm, ReactionForm
+from .live import busy, comment_stream
+from .reactions import reactions_context, set_reaction
+from .models import Comment, Follow, Group, Post
+from .throttling import throttle_comments, throttle_follows, throttle_posts
+from .utils import conditional_page, newest, paginate
+from .versions import (follow_scope, get_versions, group_scope, index_scope,
+                       popular_scope, post_scope, profile_scope)
 
 User = get_user_model()
 
 
+@use_replicas
+@conditional_page(
+    lambda request: [index_scope()],
+    lambda request: newest(Post.objects.all()),
+    cache_anonymous=True,
+)
 def index(request):
     """Лента всех публикаций"""
     post_list = Post.objects.prefetch_related(
@@ -19,10 +39,39 @@ def index(request):
     template = 'posts/index.html'
     context = {
         'page_obj': page_obj,
+        # Фрагмент ленты в кэше шаблона меняется вместе с версией ленты.
+        'index_version': get_versions(index_scope())[0],
     }
     return render(request, template, context)
 
 
+@use_replicas
+@conditional_page(
+    lambda request: [index_scope(), popular_scope()],
+    cache_anonymous=True,
+)
+def popular(request):
+    """Самые просматриваемые публикации."""
+    post_list = Post.objects.filter(views__gt=0).order_by(
+        '-views', 'id'
+    ).prefetch_related(
+        'author',
+        'group',
+    )
+    page_obj = paginate(post_list, request.GET.get('page'))
+    template = 'posts/popular.html'
+    context = {
+        'page_obj': page_obj,
+    }
+    return render(request, template, context)
+
+
+@use_replicas
+@conditional_page(
+    lambda request, slug: [group_scope(slug)],
+    lambda request, slug: newest(Post.objects.filter(group__slug=slug)),
+    cache_anonymous=True,
+)
 def group_posts(request, slug):
     """Лента публикаций сообщества."""
     group = get_object_or_404(Group, slug=slug)
@@ -38,6 +87,17 @@ def group_posts(request, slug):
     return render(request, template, context)
 
 
+@use_replicas
+@conditional_page(
+    lambda request, username: [
+        profile_scope(username),
+        follow_scope(request.user.pk),
+    ],
+    lambda request, username: newest(
+        Post.objects.filter(author__username=username)
+    ),
+    cache_anonymous=True,
+)
 def profile(request, username):
     """Профиль пользователя и лента его публикаций."""
     author = get_object_or_404(User, username=username)
@@ -58,6 +118,29 @@ def profile(request, username):
     return render(request, template, context)
 
 
+def post_detail_scopes(request, post_id):
+    """Публикация, профиль автора (имя и число публикаций) и сообщество."""
+    scopes = [post_scope(post_id)]
+    names = Post.objects.filter(pk=post_id).values_list(
+        'author__username', 'group__slug'
+    ).first()
+    if names is not None:
+        username, slug = names
+        scopes.append(profile_scope(username))
+        if slug:
+            scopes.append(group_scope(slug))
+    return scopes
+
+
+@count_views
+@use_replicas
+@conditional_page(
+    post_detail_scopes,
+    lambda request, post_id: newest(
+        Comment.objects.filter(post_id=post_id), 'created'
+    ),
+    cache_anonymous=True,
+)
 def post_detail(request, post_id):
     """Страница публикации."""
     post = get_object_or_404(Post, id=post_id)
@@ -71,11 +154,13 @@ def post_detail(request, post_id):
         'post': post,
         'form': form,
         'page_obj': page_obj,
+        **reactions_context(request.user, post.pk),
     }
     return render(request, template, context)
 
 
 @login_required
+@throttle_posts
 def post_create(request):
     """Создание публикации."""
     template = 'posts/create_post.html'
@@ -87,7 +172,8 @@ def post_create(request):
         if form.is_valid():
             post = form.save(commit=False)
             post.author = request.user
-            post.save()
+            post.prepare_image()
+            run_write(post.save)
             return redirect('posts:profile', username=request.user)
         return render(request, template, {'form': form})
     else:
@@ -110,7 +196,8 @@ def post_edit(request, post_id):
             if form.is_valid():
                 post = form.save(commit=False)
                 post.author = request.user
-                post.save()
+                post.prepare_image()
+                run_write(post.save)
                 return redirect('posts:post_detail', post_id)
         else:
             form = PostForm(instance=post)
@@ -119,6 +206,21 @@ def post_edit(request, post_id):
 
 
 @login_required
+@require_POST
+def react(request, post_id):
+    """Поставить, сменить или снять реакцию на публикацию."""
+    post = get_object_or_404(Post, id=post_id)
+    form = ReactionForm(request.POST)
+    if form.is_valid():
+        run_write(
+            set_reaction, request.user, post.pk,
+            form.cleaned_data['kind'] or None,
+        )
+    return redirect('posts:post_detail', post_id)
+
+
+@login_required
+@throttle_comments
 def add_comment(request, post_id):
     """Добавление комментария к публикации."""
     post = get_object_or_404(Post, id=post_id)
@@ -128,11 +230,18 @@ def add_comment(request, post_id):
             comment = form.save(commit=False)
             comment.author = request.user
             comment.post = post
-            comment.save()
+            run_write(comment.save)
     return redirect('posts:post_detail', post_id)
 
 
+@use_replicas
 @login_required
+@conditional_page(
+    lambda request: [index_scope(), follow_scope(request.user.pk)],
+    lambda request: newest(
+        Post.objects.filter(author__following__user=request.user)
+    ),
+)
 def follow_index(request):
     """Лента публикаций избранных авторов."""
     author_list = request.user.follower.values('author')
@@ -148,19 +257,160 @@ def follow_index(request):
 
 
 @login_required
+@throttle_follows
 def profile_follow(request, username):
     """Подписаться на автора."""
     author = get_object_or_404(User, username=username)
     user = request.user
     if author != user:
-        Follow.objects.get_or_create(user=user, author=author)
+        run_write(Follow.objects.get_or_create, user=user, author=author)
     return redirect('posts:profile', username=username)
 
 
 @login_required
+@throttle_follows
 def profile_unfollow(request, username):
     """Отписаться от автора."""
     author = get_object_or_404(User, username=username)
     user = request.user
-    Follow.objects.filter(user=user, author=author).delete()
+    run_write(Follow.objects.filter(user=user, author=author).delete)
     return redirect('posts:profile', username=username)
+
+
+def render_more(request, template, name, queryset, date_field, **context):
+    """Порция записей после курсора без обёртки страницы.
+
+    Адрес следующей порции передаётся в заголовке X-Next-Page.
+    """
+    try:
+        items, cursor = cursor_page(
+            queryset,
+            date_field,
+            request.GET.get('cursor'),
+            settings.POSTS_PER_PAGE,
+        )
+    except InvalidCursor:
+        return HttpResponseBadRequest()
+    context[name] = items
+    response = render(request, template, context)
+    response['X-Next-Page'] = (
+        f'{request.path}?cursor={cursor}' if cursor else ''
+    )
+    return response
+
+
+@use_replicas
+@conditional_page(lambda request: [index_scope()], cache_anonymous=True)
+def index_more(request):
+    """Следующие публикации ленты."""
+    return render_more(
+        request,
+        'posts/includes/more_posts.html',
+        'posts',
+        Post.objects.select_related('author', 'group'),
+        'pub_date',
+        show_group=True,
+    )
+
+
+@use_replicas
+@conditional_page(
+    lambda request, slug: [group_scope(slug)],
+    cache_anonymous=True,
+)
+def group_more(request, slug):
+    """Следующие публикации сообщества."""
+    group = get_object_or_404(Group, slug=slug)
+    return render_more(
+        request,
+        'posts/includes/more_posts.html',
+        'posts',
+        group.posts.select_related('author'),
+        'pub_date',
+    )
+
+
+@use_replicas
+@conditional_page(
+    lambda request, username: [profile_scope(username)],
+    cache_anonymous=True,
+)
+def profile_more(request, username):
+    """Следующие публикации пользователя."""
+    author = get_object_or_404(User, username=username)
+    return render_more(
+        request,
+        'posts/includes/more_posts.html',
+        'posts',
+        author.posts.select_related('author', 'group'),
+        'pub_date',
+        show_group=True,
+    )
+
+
+@use_replicas
+@login_required
+@conditional_page(
+    lambda request: [index_scope(), follow_scope(request.user.pk)]
+)
+def follow_more(request):
+    """Следующие публикации избранных авторов."""
+    return render_more(
+        request,
+        'posts/includes/more_posts.html',
+        'posts',
+        Post.objects.filter(
+            author__following__user=request.user
+        ).select_related('author', 'group'),
+        'pub_date',
+        show_group=True,
+    )
+
+
+@use_replicas
+@conditional_page(
+    lambda request, post_id: [post_scope(post_id)],
+    cache_anonymous=True,
+)
+def comments_more(request, post_id):
+    """Следующие комментарии к публикации."""
+    post = get_object_or_404(Post, id=post_id)
+    return render_more(
+        request,
+        'posts/includes/more_comments.html',
+        'comments',
+        post.comments.select_related('author'),
+        'created',
+    )
+
+
+@require_safe
+def comments_live(request, post_id):
+    """Поток новых комментариев к публикации (server-sent events).
+
+    После переподключения браузер передаёт id последнего полученного
+    комментария в Last-Event-ID; при первом подключении он берётся
+    из параметра last_event_id. Если процесс уже держит
+    LIVE_COMMENTS_MAX_STREAMS потоков, отдаётся только пауза
+    переподключения.
+    """
+    if not Post.objects.filter(pk=post_id).exists():
+        raise Http404
+    last_id = request.META.get(
+        'HTTP_LAST_EVENT_ID', request.GET.get('last_event_id', 0)
+    )
+    try:
+        last_id = int(last_id)
+    except ValueError:
+        return HttpResponseBadRequest()
+    stream = comment_stream(post_id, last_id)
+    if stream is None:
+        response = HttpResponse(busy(), content_type='text/event-stream')
+    else:
+        response = StreamingHttpResponse(
+            stream, content_type='text/event-stream'
+        )
+    response['Cache-Control'] = 'no-cache'
+    # nginx не должен копить поток в буфере.
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -1,6 +1,9 @@
+from django.contrib.auth import forms as auth_forms
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import UserCreationForm
 
+from .tasks import send_password_reset
+
 User = get_user_model()
 
 
@@ -8,3 +11,25 @@ class CreationForm(UserCreationForm):
     class Meta:
         model = User
         fields = ('first_name', 'last_name', 'username', 'email')
+
+
+class PasswordResetForm(auth_forms.PasswordResetForm):
+    """Сброс пароля: письмо отправляется фоновой задачей.
+
+    Токен и ссылку сброса задача строит сама, чтобы они не хранились
+    в таблице задач.
+    """
+    # Части контекста письма, которые можно хранить в очереди.
+    QUEUED_CONTEXT = ('domain', 'site_name', 'protocol')
+
+    def send_mail(self, subject_template_name, email_template_name,
+                  context, from_email, to_email,
+                  html_email_template_name=None):
+        send_password_reset.delay(
+            context['user'].pk,
+            {key: context[key] for key in self.QUEUED_CONTEXT},
+            from_email,
+            subject_template_name,
+            email_template_name,
+            html_email_template_name,
+        )
@@ -0,0 +1,47 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.core.mail import EmailMultiAlternatives
+from django.template import loader
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from core.tasks import task
+
+User = get_user_model()
+
+
+@task(priority=10, max_attempts=5)
+def send_email(subject, body, from_email, to, html=None):
+    """Отправляет письмо вне запроса."""
+    message = EmailMultiAlternatives(subject, body, from_email, to)
+    if html is not None:
+        message.attach_alternative(html, 'text/html')
+    message.send()
+
+
+@task(priority=10, max_attempts=5)
+def send_password_reset(user_id, context, from_email, subject_template_name,
+                        email_template_name, html_email_template_name=None):
+    """Отправляет письмо со ссылкой сброса пароля.
+
+    Ссылка строится здесь: в очереди хранится id пользователя, а не
+    действующий токен сброса.
+    """
+    user = User.objects.filter(pk=user_id, is_active=True).first()
+    if user is None:
+        return
+    email = getattr(user, User.get_email_field_name())
+    context = {
+        **context,
+        'email': email,
+        'user': user,
+        'uid': urlsafe_base64_encode(force_bytes(user.pk)),
+        'token': default_token_generator.make_token(user),
+    }
+    subject = loader.render_to_string(subject_template_name, context)
+    subject = ''.join(subject.splitlines())
+    body = loader.render_to_string(email_template_name, context)
+    html = None
+    if html_email_template_name is not None:
+        html = loader.render_to_string(html_email_template_name, context)
+    send_email(subject, body, from_email, [email], html)
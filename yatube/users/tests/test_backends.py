@@ -0,0 +1,54 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from users.backends import CachedModelBackend, user_cache_key
+
+User = get_user_model()
+
+
+class CachedModelBackendTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(
+            username='user', password='old-password-1234'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.user_client = Client()
+        self.user_client.force_login(self.user)
+
+    def test_authenticated_page_without_auth_queries(self):
+        """Повторный запрос пользователя не обращается к базе."""
+        url = reverse('about:author')
+        self.user_client.get(url)
+        with self.assertNumQueries(0):
+            response = self.user_client.get(url)
+        self.assertEqual(response.context['user'], self.user)
+
+    def test_cache_invalidated_on_save(self):
+        """Сохранение пользователя сбрасывает кэш."""
+        backend = CachedModelBackend()
+        backend.get_user(self.user.pk)
+        self.assertIsNotNone(cache.get(user_cache_key(self.user.pk)))
+        self.user.first_name = 'Имя'
+        self.user.save()
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+        self.assertEqual(backend.get_user(self.user.pk).first_name, 'Имя')
+
+    def test_password_change_logs_out_other_sessions(self):
+        """После смены пароля старая сессия не принимается."""
+        other_client = Client()
+        other_client.force_login(self.user)
+        url = reverse('about:author')
+        other_client.get(url)
+        self.user_client.post(reverse('users:password_change'), {
+            'old_password': 'old-password-1234',
+            'new_password1': 'new-password-5678',
+            'new_password2': 'new-password-5678',
+        })
+        response = other_client.get(url)
+        self.assertFalse(response.context['user'].is_authenticated)
@@ -0,0 +1,68 @@
+from http import HTTPStatus
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from users.throttling import auth_bucket
+
+
+class AuthThrottlingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        auth_bucket.local.clear()
+
+    @mock.patch(
+        'django.contrib.auth.backends.ModelBackend.authenticate',
+        autospec=True,
+    )
+    def test_login_flood_rejected_before_hashing(self, authenticate):
+        """Лишние попытки входа отклоняются без проверки пароля."""
+        authenticate.return_value = None
+        capacity = settings.AUTH_THROTTLE['capacity']
+        url = reverse(settings.LOGIN_URL)
+        statuses = [
+            self.client.post(url, {
+                'username': 'victim', 'password': 'guess',
+            }).status_code
+            for _ in range(capacity + 1)
+        ]
+        self.assertNotIn(HTTPStatus.TOO_MANY_REQUESTS, statuses[:-1])
+        self.assertEqual(statuses[-1], HTTPStatus.TOO_MANY_REQUESTS)
+        self.assertEqual(authenticate.call_count, capacity)
+
+    @override_settings(NUM_PROXIES=1)
+    @mock.patch(
+        'django.contrib.auth.backends.ModelBackend.authenticate',
+        autospec=True,
+        return_value=None,
+    )
+    def test_clients_behind_proxy_throttled_separately(self, authenticate):
+        """За прокси попытки одного клиента не блокируют вход другим."""
+        capacity = settings.AUTH_THROTTLE['capacity']
+        url = reverse(settings.LOGIN_URL)
+        for number in range(capacity):
+            self.client.post(
+                url,
+                {'username': f'guess{number}', 'password': 'guess'},
+                REMOTE_ADDR='127.0.0.1',
+                HTTP_X_FORWARDED_FOR='203.0.113.7',
+            )
+        response = self.client.post(
+            url,
+            {'username': 'other', 'password': 'secret'},
+            REMOTE_ADDR='127.0.0.1',
+            HTTP_X_FORWARDED_FOR='198.51.100.2',
+        )
+        self.assertNotEqual(
+            response.status_code, HTTPStatus.TOO_MANY_REQUESTS
+        )
+
+    def test_get_not_throttled(self):
+        """Открытие формы входа не расходует попытки."""
+        with mock.patch.object(auth_bucket, 'take') as take:
+            response = self.client.get(reverse(settings.LOGIN_URL))
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        take.assert_not_called()
@@ -1,11 +1,16 @@
+import re
 from http import HTTPStatus
 
 from django.conf import settings
 from django import forms
 from django.contrib.auth import get_user_model
+from django.core import mail
 from django.test import Client, TestCase
 from django.urls import reverse
 
+from core.models import Task
+from core.tasks import Worker
+
 from users.tests.constants import (
     SIGNUP_URL_NAME,
     LOGOUT_URL_NAME,
@@ -98,3 +103,38 @@ class UsersNameTests(TestCase):
                 form_field = response.context.get('form').fields.get(value)
                 self.assertIsNotNone(form_field)
                 self.assertIsInstance(form_field, expected)
+
+
+class PasswordResetEmailTests(TestCase):
+    def test_email_sent_by_worker(self):
+        """Письмо сброса пароля отправляет фоновая задача."""
+        User.objects.create_user(
+            username='user', email='user@example.com', password='secret-123'
+        )
+        response = self.client.post(
+            reverse(PASSWORD_RESET_URL_NAME), {'email': 'user@example.com'}
+        )
+        self.assertRedirects(response, reverse(PASSWORD_RESET_DONE_URL_NAME))
+        self.assertEqual(len(mail.outbox), 0)
+        Worker().run(burst=True)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['user@example.com'])
+        self.assertIn('/auth/reset/', mail.outbox[0].body)
+
+    def test_reset_link_not_queued(self):
+        """В очереди нет ссылки сброса, а ссылка из письма действует."""
+        user = User.objects.create_user(
+            username='user', email='user@example.com', password='secret-123'
+        )
+        self.client.post(
+            reverse(PASSWORD_RESET_URL_NAME), {'email': 'user@example.com'}
+        )
+        arguments = Task.objects.get().arguments
+        Worker().run(burst=True)
+        link = re.search(r'/auth/reset/\S+', mail.outbox[0].body).group()
+        token = link.rstrip('/').split('/')[-1]
+        self.assertNotIn(token, arguments)
+        self.assertNotIn('user@example.com', arguments)
+        response = self.client.get(link, follow=True)
+        self.assertTrue(response.context['validlink'])
+        self.assertEqual(response.context['form'].user, user)
@@ -0,0 +1,20 @@
+from django.conf import settings
+
+from core.ratelimit import TokenBucket, client_ip, throttle
+
+auth_bucket = TokenBucket('auth', **settings.AUTH_THROTTLE)
+
+
+def auth_keys(request):
+    """Ключи ограничения: IP клиента и имя пользователя."""
+    keys = [f'ip:{client_ip(request)}']
+    username = request.POST.get('username')
+    if not username and request.user.is_authenticated:
+        username = request.user.get_username()
+    if username:
+        keys.append(f'user:{username.lower()}')
+    return keys
+
+
+# Отклоняет POST до вычисления хеша пароля.
+throttle_auth = throttle(auth_bucket, auth_keys)
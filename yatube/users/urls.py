@@ -8,14 +8,16 @@ from django.contrib.auth.views import (LoginView, LogoutView,
 from django.urls import path
 
 from . import views
+from .forms import PasswordResetForm
+from .throttling import throttle_auth
 
 app_name = 'users'
 
 urlpatterns = [
-    path('signup/', views.SignUp.as_view(), name='signup'),
+    path('signup/', throttle_auth(views.SignUp.as_view()), name='signup'),
     path(
         'login/',
-        LoginView.as_view(template_name='users/login.html'),
+        throttle_auth(LoginView.as_view(template_name='users/login.html')),
         name='login'
     ),
     path(
@@ -32,9 +34,9 @@ urlpatterns = [
     ),
     path(
         'password_change/',
-        PasswordChangeView.as_view(
+        throttle_auth(PasswordChangeView.as_view(
             template_name='users/password_change_form.html'
-        ),
+        )),
         name='password_change'
     ),
     path(
@@ -47,6 +49,7 @@ urlpatterns = [
     path(
         'password_reset/',
         PasswordResetView.as_view(
+            form_class=PasswordResetForm,
             template_name='users/password_reset_form.html'
         ),
         name='password_reset'
@@ -60,9 +63,9 @@ urlpatterns = [
     ),
     path(
         'reset/<uidb64>/<token>/',
-        PasswordResetConfirmView.as_view(
+        throttle_auth(PasswordResetConfirmView.as_view(
             template_name='users/password_reset_confirm.html'
-        ),
+        )),
         name='password_reset_confirm'
     ),
 ]
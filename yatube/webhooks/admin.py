@@ -0,0 +1,13 @@
+from django.contrib import admin
+
+from .models import Webhook
+
+
+class WebhookAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'url', 'group', 'author', 'comments', 'is_active',)
+    list_filter = ('is_active', 'group',)
+    search_fields = ('url',)
+    empty_value_display = '-пусто-'
+
+
+admin.site.register(Webhook, WebhookAdmin)
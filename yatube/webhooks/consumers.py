@@ -0,0 +1,119 @@
+import json
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.urls import reverse
+
+from core.changelog import Consumer
+from core.models import ChangeLog
+from posts.models import Group, Post
+
+from .delivery import deliver
+from .models import Webhook
+
+User = get_user_model()
+
+
+class WebhookConsumer(Consumer):
+    """Превращает новые публикации и комментарии в задачи доставки.
+
+    События порции журнала собираются по адресам, и на каждый адрес
+    ставится одна задача на WEBHOOK_BATCH_SIZE событий. Задачи ставятся
+    в транзакции обработчика, поэтому событие попадает в очередь ровно
+    один раз; получатель отличает повторы доставки по event_id.
+    """
+
+    name = 'webhooks'
+    models = ('posts.post', 'posts.comment')
+
+    def handle(self, entries):
+        rows = [
+            (entry, json.loads(entry.data)) for entry in entries
+            if entry.action == ChangeLog.CREATED
+        ]
+        if not rows:
+            return
+        post_ids = {
+            data['post_id'] for entry, data in rows
+            if entry.model == 'posts.comment'
+        }
+        posts = {
+            pk: (group_id, author_id)
+            for pk, group_id, author_id in Post.objects.filter(
+                pk__in=post_ids
+            ).values_list('pk', 'group_id', 'author_id')
+        }
+        events = []
+        for entry, data in rows:
+            if entry.model == 'posts.post':
+                scope = (data['group_id'], data['author_id'])
+            elif data['post_id'] in posts:
+                scope = posts[data['post_id']]
+            else:
+                continue
+            events.append((entry, data, scope))
+        if not events:
+            return
+        groups = {group_id for _, _, (group_id, _) in events if group_id}
+        authors = {author_id for _, _, (_, author_id) in events}
+        webhooks = Webhook.objects.filter(is_active=True).filter(
+            Q(group_id__in=groups) | Q(author_id__in=authors)
+        )
+        payloads = self.payloads(events)
+        size = settings.WEBHOOK_BATCH_SIZE
+        for webhook in webhooks:
+            batch = [
+                payloads[entry.pk] for entry, _, scope in events
+                if self.matches(webhook, entry, scope)
+            ]
+            for start in range(0, len(batch), size):
+                deliver.delay(webhook.pk, batch[start:start + size])
+
+    def matches(self, webhook, entry, scope):
+        group_id, author_id = scope
+        if entry.model == 'posts.comment' and not webhook.comments:
+            return False
+        return (
+            webhook.group_id is None or webhook.group_id == group_id
+        ) and (
+            webhook.author_id is None or webhook.author_id == author_id
+        )
+
+    def payloads(self, events):
+        """Тела событий по id записи журнала."""
+        usernames = dict(
+            User.objects.filter(
+                pk__in={data['author_id'] for _, data, _ in events}
+            ).values_list('pk', 'username')
+        )
+        slugs = dict(
+            Group.objects.filter(
+                pk__in={group_id for _, _, (group_id, _) in events}
+            ).values_list('pk', 'slug')
+        )
+        payloads = {}
+        for entry, data, (group_id, _) in events:
+            payload = {
+                'event_id': entry.pk,
+                'author': usernames.get(data['author_id']),
+                'group': slugs.get(group_id),
+                'text': data['text'],
+            }
+            if entry.model == 'posts.post':
+                payload.update(
+                    type='post.created',
+                    id=data['id'],
+                    created=data['pub_date'],
+                    url=reverse('posts:post_detail', args=[data['id']]),
+                )
+            else:
+                payload.update(
+                    type='comment.created',
+                    id=data['id'],
+                    post=data['post_id'],
+                    created=data['created'],
+                    url=reverse('posts:post_detail', args=[data['post_id']]),
+                )
+            payloads[entry.pk] = payload
+        return payloads
@@ -0,0 +1,66 @@
+"""Доставка пачек событий на адреса вебхуков.
+
+Соединения с получателями переиспользуются: у каждого потока обработчика
+своя requests.Session с пулом соединений. Временные ошибки (обрыв,
+429, 5xx) повторяются в сессии с экспоненциальной паузой; если и они
+не помогли, задача доставки повторяется очередью core.tasks позже.
+"""
+import hashlib
+import hmac
+import json
+import threading
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from core.tasks import task
+
+from .models import Webhook
+
+SIGNATURE_HEADER = 'X-Yatube-Signature'
+
+_local = threading.local()
+
+
+def get_session():
+    """Сессия потока с пулом соединений и повтором временных ошибок."""
+    session = getattr(_local, 'session', None)
+    if session is None:
+        retry = Retry(
+            total=settings.WEBHOOK_RETRIES,
+            backoff_factor=settings.WEBHOOK_BACKOFF,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=None,
+        )
+        adapter = HTTPAdapter(max_retries=retry)
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        _local.session = session
+    return session
+
+
+def sign(secret, body):
+    digest = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return f'sha256={digest}'
+
+
+@task(max_attempts=5)
+def deliver(webhook_id, events):
+    """Отправляет пачку событий одним POST; ошибка - повтор задачи."""
+    webhook = Webhook.objects.filter(pk=webhook_id, is_active=True).first()
+    if webhook is None:
+        return
+    body = json.dumps({'events': events}, ensure_ascii=False).encode()
+    headers = {'Content-Type': 'application/json'}
+    if webhook.secret:
+        headers[SIGNATURE_HEADER] = sign(webhook.secret, body)
+    response = get_session().post(
+        webhook.url,
+        data=body,
+        headers=headers,
+        timeout=settings.WEBHOOK_TIMEOUT,
+    )
+    response.raise_for_status()
@@ -0,0 +1,39 @@
+# Generated by Django 2.2.16 on 2026-10-19 17:19
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0015_post_pub_date_id_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Webhook',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField(verbose_name='Адрес')),
+                ('secret', models.CharField(blank=True, help_text='Ключ подписи HMAC-SHA256 в заголовке X-Yatube-Signature', max_length=100, verbose_name='Секрет')),
+                ('comments', models.BooleanField(default=False, verbose_name='Сообщать о комментариях')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Включён')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Создан')),
+                ('author', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='webhooks', to=settings.AUTH_USER_MODEL, verbose_name='Автор')),
+                ('group', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='webhooks', to='posts.Group', verbose_name='Сообщество')),
+            ],
+            options={
+                'verbose_name': 'Вебхук',
+                'verbose_name_plural': 'Вебхуки',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='webhook',
+            constraint=models.CheckConstraint(check=models.Q(('group__isnull', False), ('author__isnull', False), _connector='OR'), name='webhook_group_or_author'),
+        ),
+    ]
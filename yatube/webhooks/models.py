@@ -0,0 +1,53 @@
+from django.contrib.auth import get_user_model
+from django.db import models
+
+from posts.models import Group
+
+User = get_user_model()
+
+
+class Webhook(models.Model):
+    url = models.URLField(verbose_name='Адрес')
+    secret = models.CharField(
+        max_length=100,
+        blank=True,
+        verbose_name='Секрет',
+        help_text='Ключ подписи HMAC-SHA256 в заголовке X-Yatube-Signature',
+    )
+    group = models.ForeignKey(
+        Group,
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+        related_name='webhooks',
+        verbose_name='Сообщество',
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+        related_name='webhooks',
+        verbose_name='Автор',
+    )
+    comments = models.BooleanField(
+        default=False, verbose_name='Сообщать о комментариях'
+    )
+    is_active = models.BooleanField(default=True, verbose_name='Включён')
+    created = models.DateTimeField(auto_now_add=True, verbose_name='Создан')
+
+    class Meta:
+        constraints = [
+            models.CheckConstraint(
+                check=(
+                    models.Q(group__isnull=False)
+                    | models.Q(author__isnull=False)
+                ),
+                name='webhook_group_or_author',
+            ),
+        ]
+        verbose_name = 'Вебхук'
+        verbose_name_plural = 'Вебхуки'
+
+    def __str__(self) -> str:
+        return self.url
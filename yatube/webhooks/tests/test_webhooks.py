@@ -0,0 +1,146 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from core.models import Task
+from core.tasks import Worker
+from posts.models import Comment, Group, Post
+from webhooks.consumers import WebhookConsumer
+from webhooks.delivery import SIGNATURE_HEADER, sign
+from webhooks.models import Webhook
+
+User = get_user_model()
+
+
+class Receiver(HTTPServer):
+    """Локальный получатель вебхуков: запоминает тела запросов."""
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), ReceiverHandler)
+        self.requests = []
+        self.statuses = []
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_port}/hook/'
+
+
+class ReceiverHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+        if status == 200:
+            self.server.requests.append((body, dict(self.headers)))
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@override_settings(WEBHOOK_RETRIES=0, TASK_RETRY_DELAY=0)
+class WebhookTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.receiver = Receiver()
+        cls.thread = threading.Thread(target=cls.receiver.serve_forever)
+        cls.thread.start()
+        cls.author = User.objects.create_user(username='author')
+        cls.other = User.objects.create_user(username='other')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.receiver.shutdown()
+        cls.receiver.server_close()
+        cls.thread.join()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.receiver.requests.clear()
+        self.receiver.statuses.clear()
+        WebhookConsumer().run()
+
+    def deliver(self):
+        WebhookConsumer().run()
+        Worker().run(burst=True)
+        return [
+            json.loads(body)['events'] for body, _ in self.receiver.requests
+        ]
+
+    def test_group_posts_batched(self):
+        """Новые публикации сообщества приходят одной пачкой."""
+        Webhook.objects.create(url=self.receiver.url, group=self.group)
+        first = Post.objects.create(
+            author=self.author, group=self.group, text='Первая'
+        )
+        second = Post.objects.create(
+            author=self.other, group=self.group, text='Вторая'
+        )
+        Post.objects.create(author=self.author, text='Без сообщества')
+        Comment.objects.create(post=first, author=self.other, text='Ответ')
+        batches = self.deliver()
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(
+            [(event['type'], event['id']) for event in batches[0]],
+            [('post.created', first.pk), ('post.created', second.pk)],
+        )
+        self.assertEqual(batches[0][0]['group'], 'test-slug')
+        self.assertEqual(batches[0][0]['author'], 'author')
+        self.assertEqual(batches[0][0]['text'], 'Первая')
+
+    def test_author_posts_and_comments(self):
+        """Подписка на автора с комментариями и подписью."""
+        Webhook.objects.create(
+            url=self.receiver.url,
+            author=self.author,
+            comments=True,
+            secret='секрет',
+        )
+        post = Post.objects.create(author=self.author, text='Публикация')
+        Post.objects.create(author=self.other, text='Чужая публикация')
+        comment = Comment.objects.create(
+            post=post, author=self.other, text='Комментарий'
+        )
+        batches = self.deliver()
+        self.assertEqual(
+            [(event['type'], event['id']) for event in batches[0]],
+            [('post.created', post.pk), ('comment.created', comment.pk)],
+        )
+        body, headers = self.receiver.requests[0]
+        self.assertEqual(headers[SIGNATURE_HEADER], sign('секрет', body))
+
+    @override_settings(WEBHOOK_BATCH_SIZE=2)
+    def test_batch_size(self):
+        """Большая пачка делится на запросы по WEBHOOK_BATCH_SIZE."""
+        Webhook.objects.create(url=self.receiver.url, group=self.group)
+        for number in range(5):
+            Post.objects.create(
+                author=self.author, group=self.group, text=f'Пост {number}'
+            )
+        batches = self.deliver()
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+
+    def test_failed_delivery_retried(self):
+        """Ошибка получателя - задача доставки повторяется."""
+        Webhook.objects.create(url=self.receiver.url, group=self.group)
+        Post.objects.create(author=self.author, group=self.group, text='Пост')
+        self.receiver.statuses.append(503)
+        self.assertEqual(len(self.deliver()), 1)
+        self.assertFalse(Task.objects.exists())
+
+    def test_write_path_untouched(self):
+        """Создание публикации не обращается к получателю."""
+        Webhook.objects.create(url=self.receiver.url, group=self.group)
+        Post.objects.create(author=self.author, group=self.group, text='Пост')
+        self.assertEqual(self.receiver.requests, [])
+        self.assertFalse(Task.objects.exists())
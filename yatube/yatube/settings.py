@@ -37,9 +37,11 @@ ALLOWED_HOSTS = [
 
 INSTALLED_APPS = [
     'about.apps.AboutConfig',
+    'api.apps.ApiConfig',
     'core.apps.CoreConfig',
     'posts.apps.PostsConfig',
     'users.apps.UsersConfig',
+    'webhooks.apps.WebhooksConfig',
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
@@ -51,24 +53,39 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'posts.middleware.AnonymousPageCacheMiddleware',
 ]
 
 ROOT_URLCONF = 'yatube.urls'
 
 TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
 
+# Скомпилированные шаблоны хранятся в памяти процесса. При разработке
+# кэш выключен, чтобы правки шаблонов применялись без перезапуска.
+CACHED_TEMPLATES = not DEBUG
+
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+if CACHED_TEMPLATES:
+    TEMPLATE_LOADERS = [
+        ('django.template.loaders.cached.Loader', TEMPLATE_LOADERS),
+    ]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': TEMPLATE_LOADERS,
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -88,11 +105,42 @@ WSGI_APPLICATION = 'yatube.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'core.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'CONN_MAX_AGE': 60,
     }
 }
 
+# Реплики только для чтения, например локальная копия SQLite:
+# DATABASES['replica'] = {
+#     'ENGINE': 'core.backends.sqlite3',
+#     'NAME': os.path.join(BASE_DIR, 'db_replica.sqlite3'),
+#     'TEST': {'MIRROR': 'default'},
+# }
+# DATABASE_REPLICAS = ['replica']
+DATABASE_REPLICAS = []
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+# Сколько секунд после записи клиент читает из основной базы.
+REPLICA_PIN_SECONDS = 5
+
+# Применяются к каждому новому соединению с SQLite (core.db).
+# WAL позволяет читателям не ждать писателей, busy_timeout - в мс.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+    'temp_store': 'MEMORY',
+    'busy_timeout': 5000,
+}
+
+# Повтор записей при блокировке базы (core.db.atomic_write), задержка в с.
+DB_WRITE_RETRIES = 5
+DB_WRITE_RETRY_DELAY = 0.05
+# Объединять записи процесса в общие транзакции одного писателя.
+DB_WRITE_QUEUE = False
+DB_WRITE_QUEUE_BATCH = 50
+
 
 # Password validation
 # https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
@@ -132,9 +180,42 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
+# collectstatic пишет сюда файлы с хэшем в имени и копии .gz/.br;
+# их раздаёт core.fileserver из yatube/wsgi.py.
+STATIC_ROOT = os.path.join(BASE_DIR, 'collected_static')
+STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+STATIC_CACHE_MAX_AGE = 60 * 60
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+MEDIA_CACHE_MAX_AGE = 60 * 60 * 24
+# Медиа отдаёт core.views.serve_media. С 'x-accel-redirect' (nginx) или
+# 'x-sendfile' (Apache, lighttpd) сами байты передаёт веб-сервер;
+# для nginx MEDIA_ACCEL_PREFIX - internal location с alias на MEDIA_ROOT.
+MEDIA_ACCEL_REDIRECT = None
+MEDIA_ACCEL_PREFIX = '/protected-media/'
+# Готовые страницы для анонимных посетителей, см. manage.py prerender.
+PRERENDER_ROOT = os.path.join(BASE_DIR, 'prerendered')
+
+# Сессии и пользователь сессии читаются из кэша, база - при промахе.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+AUTHENTICATION_BACKENDS = ['users.backends.CachedModelBackend']
+USER_CACHE_TIMEOUT = 60 * 15
+# Ведро токенов для POST входа, регистрации и смены пароля по IP
+# и по имени: capacity попыток подряд, затем rate попыток в секунду.
+AUTH_THROTTLE = {
+    'capacity': 10,
+    'rate': 1 / 30,
+}
+# Число доверенных прокси перед сайтом (за nginx - 1): IP клиента для
+# ограничений берётся из X-Forwarded-For, который они дописывают.
+NUM_PROXIES = 0
+# Записи одного пользователя: не больше limit за period секунд.
+WRITE_RATE_LIMITS = {
+    'post_create': {'limit': 10, 'period': 60},
+    'add_comment': {'limit': 20, 'period': 60},
+    'follow': {'limit': 30, 'period': 60},
+}
 
 LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'posts:index'
@@ -145,11 +226,65 @@ EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
 CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
 
+# LocMemCache годится для одного процесса (runserver). При нескольких
+# процессах сервера нужен общий кэш, например memcached: иначе смена
+# версий страниц (ETag и AnonymousPageCacheMiddleware) и сброс кэша
+# пользователя после смены пароля не дойдут до других процессов.
+# manage.py check --deploy сообщает о такой настройке.
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     }
 }
 
+# Журнал изменений: обработчики (пути к классам core.changelog.Consumer),
+# размер порции и пауза между проверками журнала в секундах.
+CHANGELOG_CONSUMERS = [
+    'webhooks.consumers.WebhookConsumer',
+]
+CHANGELOG_BATCH_SIZE = 100
+CHANGELOG_POLL = 1
+
+# Фоновые задачи: пауза между проверками очереди, первая пауза перед
+# повтором упавшей задачи (удваивается с каждой попыткой) и время,
+# после которого задача считается брошенной, в секундах.
+TASK_POLL = 1
+TASK_RETRY_DELAY = 10
+TASK_TIMEOUT = 60 * 10
+
+# Вебхуки: событий в одном запросе, таймаут запроса в секундах, повторы
+# временных ошибок внутри задачи доставки и их начальная пауза.
+WEBHOOK_BATCH_SIZE = 50
+WEBHOOK_TIMEOUT = 5
+WEBHOOK_RETRIES = 3
+WEBHOOK_BACKOFF = 0.5
+
+# Просмотры публикаций копятся в памяти процесса и передаются фоновой
+# задаче записи не чаще раза в столько секунд.
+VIEW_COUNTS_FLUSH_INTERVAL = 15
+
+# Реакции: число строк-шардов счётчика на вид реакции публикации
+# и время жизни суммы в кэше.
+REACTION_SHARDS = 8
+REACTION_CACHE_TIMEOUT = 60 * 60
+
 POSTS_PER_PAGE = 10
+# Поток живых комментариев: время жизни соединения, интервал пульса
+# и опроса базы в секундах, пауза перед переподключением в мс.
+LIVE_COMMENTS_DURATION = 60
+LIVE_COMMENTS_HEARTBEAT = 15
+LIVE_COMMENTS_POLL = 2
+LIVE_COMMENTS_RETRY = 3000
+# Каждый поток держит поток WSGI-сервера: процесс открывает не больше
+# стольких потоков (меньше числа его потоков), остальным клиентам
+# предлагается переподключиться через LIVE_COMMENTS_BUSY_RETRY мс.
+LIVE_COMMENTS_MAX_STREAMS = 2
+LIVE_COMMENTS_BUSY_RETRY = 30000
+# Готовые карточки публикаций; ключ меняется при правке публикации.
+POST_CARD_CACHE_TIMEOUT = 60 * 60
+# Страницы для анонимных посетителей; устаревают со сменой версий.
+PAGE_CACHE_TIMEOUT = 60 * 10
+# RSS и Atom: число публикаций и время жизни готовой ленты в кэше.
+FEED_ITEMS = 20
+FEED_CACHE_TIMEOUT = 60 * 60
 POSTS_UPLOAD_TO = 'posts/'
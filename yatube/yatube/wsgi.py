@@ -14,3 +14,15 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
 
 application = get_wsgi_application()
+
+from django.conf import settings  # noqa: E402
+
+from core.fileserver import PrecompressedFileServer  # noqa: E402
+
+application = PrecompressedFileServer(
+    application,
+    settings.STATIC_URL,
+    settings.STATIC_ROOT,
+    max_age=settings.STATIC_CACHE_MAX_AGE,
+    immutable=True,
+)